@@ -0,0 +1,3 @@
+"""
+Benchmarks for OpenEvolve (airspeed velocity suites, also runnable as scripts)
+"""
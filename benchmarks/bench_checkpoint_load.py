@@ -0,0 +1,178 @@
+"""
+Checkpoint loading benchmarks
+
+Generates a synthetic checkpoint of configurable size and measures how fast
+its programs are read (storage.iter_programs, as used by the visualizer) and
+how long ProgramDatabase.load takes to resume from it. Reading is compared
+with the stdlib json decoder on a single thread, the original loader.
+
+Run with airspeed velocity (``asv run``) or directly:
+
+    python -m benchmarks.bench_checkpoint_load --programs 50000 --backend json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import openevolve.storage as storage_module
+from openevolve.config import DatabaseConfig
+from openevolve.database import Program, ProgramDatabase
+from openevolve.storage import JSON_DECODER, open_storage
+
+SIZES = [1_000, 10_000]
+
+
+def write_checkpoint(path: str, num_programs: int, backend: str = "json", seed: int = 0) -> None:
+    """
+    Write a synthetic checkpoint of num_programs programs of about 3 KB each
+
+    Args:
+        path: Checkpoint directory to create
+        num_programs: Number of programs
+        backend: Storage backend
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    num_islands = 5
+    islands = [[] for _ in range(num_islands)]
+
+    def records() -> Iterator[dict]:
+        for i in range(num_programs):
+            island = i % num_islands
+            islands[island].append(f"p{i}")
+            lines = [f"    v{n} = v{n - 1} * {rng.randint(0, 99)}\n" for n in range(1, 120)]
+            program = Program(
+                id=f"p{i}",
+                code="def evolve(v0):\n" + "".join(lines),
+                parent_id=f"p{rng.randrange(i)}" if i else None,
+                generation=i // 100,
+                iteration_found=i,
+                metrics={"score": rng.random(), "speed": rng.random(), "complexity": 120.0},
+                metadata={"island": island, "changes": "Change 1: tweak constants"},
+                artifacts_json=json.dumps({"stdout": "ok"}) if i % 3 == 0 else None,
+            )
+            yield program.to_dict()
+
+    with open_storage(path, backend) as storage:
+        storage.write_programs(records())
+        storage.write_metadata(
+            {
+                "islands": islands,
+                "archive": [f"p{i}" for i in range(min(num_programs, 100))],
+                "best_program_id": "p0",
+                "last_iteration": num_programs,
+                "current_island": 0,
+                "island_generations": [0] * num_islands,
+                "last_migration_generation": 0,
+                "feature_map": {},
+            }
+        )
+
+
+@contextmanager
+def stdlib_json() -> Iterator[None]:
+    """Decode with the json module, as before fast decoders were supported"""
+    original = storage_module.json_loads
+    storage_module.json_loads = json.loads
+    try:
+        yield
+    finally:
+        storage_module.json_loads = original
+
+
+def read_all(path: str, load_workers: Optional[int] = None) -> int:
+    with open_storage(path, load_workers=load_workers) as storage:
+        return sum(1 for _ in storage.iter_programs())
+
+
+def load_database(path: str, num_programs: int, load_workers: Optional[int] = None) -> None:
+    config = DatabaseConfig(
+        population_size=num_programs,
+        archive_size=num_programs,
+        num_islands=5,
+        load_workers=load_workers,
+    )
+    ProgramDatabase(config).load(path)
+
+
+class CheckpointLoadSuite:
+    """Reading and resuming from a synthetic JSON checkpoint"""
+
+    params = SIZES
+    param_names = ["programs"]
+    timeout = 600
+
+    def setup_cache(self):
+        root = tempfile.mkdtemp(prefix="openevolve-bench-")
+        for size in SIZES:
+            write_checkpoint(os.path.join(root, str(size)), size)
+        return root
+
+    def setup(self, root, programs):
+        self.path = os.path.join(root, str(programs))
+
+    def time_read_stdlib_sequential(self, root, programs):
+        with stdlib_json():
+            read_all(self.path, load_workers=1)
+
+    def time_read(self, root, programs):
+        read_all(self.path)
+
+    def time_load_database(self, root, programs):
+        load_database(self.path, programs)
+
+
+def _time(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark checkpoint loading")
+    parser.add_argument("--programs", type=int, default=50_000, help="Programs in the checkpoint")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--workers", type=int, default=None, help="Load threads (default: auto)")
+    parser.add_argument("--path", default=None, help="Keep the checkpoint in this directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    root = args.path or tempfile.mkdtemp(prefix="openevolve-bench-")
+    path = os.path.join(root, f"checkpoint_{args.programs}_{args.backend}")
+    try:
+        if not os.path.exists(path):
+            print(f"Writing {args.programs} programs ({args.backend}) to {path}")
+            write_checkpoint(path, args.programs, args.backend)
+
+        n = args.programs
+        with stdlib_json():
+            baseline = _time(read_all, path, load_workers=1)
+        sequential = _time(read_all, path, load_workers=1)
+        parallel = _time(read_all, path, load_workers=args.workers)
+        resume = _time(load_database, path, n, load_workers=args.workers)
+
+        print(f"{'read, json, 1 thread':<36} {baseline:7.2f}s {n / baseline:10.0f} programs/s")
+        print(
+            f"{f'read, {JSON_DECODER}, 1 thread':<36} {sequential:7.2f}s "
+            f"{n / sequential:10.0f} programs/s"
+        )
+        print(
+            f"{f'read, {JSON_DECODER}, parallel':<36} {parallel:7.2f}s "
+            f"{n / parallel:10.0f} programs/s"
+        )
+        print(f"{'ProgramDatabase.load':<36} {resume:7.2f}s {n / resume:10.0f} programs/s")
+    finally:
+        if args.path is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Parent-delta code storage benchmarks
+
+Simulates an evolution run of 10k programs of about 100 lines, each derived
+from a recent program by rewriting, inserting or deleting a few lines, and
+compares plain code storage with code_delta_compression: memory held by the
+code, checkpoint size on disk for both storage backends, and decoding time.
+
+Run with airspeed velocity (``asv run``) or directly:
+
+    python -m benchmarks.bench_code_store
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Optional, Tuple
+
+from openevolve.code_store import DeltaCodeStore
+from openevolve.config import DatabaseConfig
+from openevolve.database import Program, ProgramDatabase
+
+NUM_PROGRAMS = 10_000
+PROGRAM_LINES = 100
+
+# Parents are drawn from this many most recent programs
+PARENT_WINDOW = 200
+
+
+def make_lineage(
+    num_programs: int = NUM_PROGRAMS, seed: int = 0
+) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Generate (program ID, code, parent ID) for a synthetic evolution run
+
+    Args:
+        num_programs: Number of programs
+        seed: Random seed
+
+    Returns:
+        Programs in creation order
+    """
+    rng = random.Random(seed)
+    names = ["x", "y", "total", "values", "result", "index", "weight", "best"]
+
+    def random_line() -> str:
+        a, b = rng.sample(names, 2)
+        return f"    {a} = {b} {rng.choice('+-*/')} {rng.randint(0, 999)}\n"
+
+    root = ["def evolve(values):\n"] + [random_line() for _ in range(PROGRAM_LINES - 1)]
+    programs = [("p0", "".join(root), None)]
+    lines_by_id = {"p0": root}
+    for i in range(1, num_programs):
+        parent_id = programs[rng.randrange(max(0, i - PARENT_WINDOW), i)][0]
+        lines = list(lines_by_id[parent_id])
+        for _ in range(rng.randint(1, 5)):
+            position = rng.randrange(1, len(lines))
+            action = rng.random()
+            if action < 0.6:
+                lines[position] = random_line()
+            elif action < 0.8 or len(lines) < PROGRAM_LINES // 2:
+                lines.insert(position, random_line())
+            else:
+                del lines[position]
+        lines_by_id[f"p{i}"] = lines
+        programs.append((f"p{i}", "".join(lines), parent_id))
+    return programs
+
+
+def make_database(compression: bool, backend: str = "json") -> ProgramDatabase:
+    config = DatabaseConfig(
+        in_memory=True,
+        population_size=NUM_PROGRAMS,
+        archive_size=NUM_PROGRAMS,
+        storage_backend=backend,
+        code_delta_compression=compression,
+    )
+    return ProgramDatabase(config)
+
+
+def populate(db: ProgramDatabase, programs: List[Tuple[str, str, Optional[str]]]) -> None:
+    for generation, (program_id, code, parent_id) in enumerate(programs):
+        db.add(
+            Program(
+                id=program_id,
+                code=code,
+                parent_id=parent_id,
+                generation=generation,
+                metrics={"score": generation / len(programs)},
+            )
+        )
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def code_memory(programs: List[Tuple[str, str, Optional[str]]], compression: bool) -> int:
+    """Bytes held by the code of all programs"""
+    if not compression:
+        # One string per Program
+        return sum(sys.getsizeof(code) for _, code, _ in programs)
+    tracemalloc.start()
+    store = DeltaCodeStore(cache_size=0)
+    for program_id, code, parent_id in programs:
+        store.put(program_id, code, parent_id)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del store
+    return size
+
+
+class CodeStoreSuite:
+    """Memory, disk and decoding cost of plain and parent-delta code storage"""
+
+    params = [False, True]
+    param_names = ["compression"]
+    timeout = 600
+
+    def setup_cache(self):
+        return make_lineage()
+
+    def setup(self, programs, compression):
+        self.store = DeltaCodeStore(cache_size=256 if compression else len(programs))
+        for program_id, code, parent_id in programs:
+            self.store.put(program_id, code, parent_id if compression else None)
+        self.ids = [program_id for program_id, _, _ in programs]
+
+    def track_code_memory(self, programs, compression):
+        return code_memory(programs, compression)
+
+    track_code_memory.unit = "bytes"
+
+    def track_checkpoint_size(self, programs, compression):
+        db = make_database(compression)
+        populate(db, programs)
+        with tempfile.TemporaryDirectory() as path:
+            db.save(path)
+            return directory_size(path)
+
+    track_checkpoint_size.unit = "bytes"
+
+    def time_put(self, programs, compression):
+        store = DeltaCodeStore()
+        for program_id, code, parent_id in programs:
+            store.put(program_id, code, parent_id if compression else None)
+
+    def time_get_cold(self, programs, compression):
+        self.store._cache.clear()
+        for program_id in self.ids[::10]:
+            self.store.get(program_id)
+
+
+def main() -> None:
+    programs = make_lineage()
+    raw = sum(len(code) for _, code, _ in programs)
+    print(f"{len(programs)} programs, {raw / 1e6:.1f} MB of code\n")
+
+    plain_memory = code_memory(programs, compression=False)
+    delta_memory = code_memory(programs, compression=True)
+    print(f"{'memory':<24} {plain_memory / 1e6:10.1f} MB plain {delta_memory / 1e6:10.1f} MB delta")
+
+    store = DeltaCodeStore()
+    start = time.perf_counter()
+    for program_id, code, parent_id in programs:
+        store.put(program_id, code, parent_id)
+    put_time = time.perf_counter() - start
+    stats = store.stats()
+    print(
+        f"{'stored':<24} {stats['keyframes']} keyframes, {stats['deltas']} deltas, "
+        f"{stats['stored_size'] / stats['code_size']:.1%} of the code size"
+    )
+
+    ids = [program_id for program_id, _, _ in programs]
+    store._cache.clear()
+    start = time.perf_counter()
+    for program_id in ids:
+        store.get(program_id)
+    cold = (time.perf_counter() - start) / len(ids)
+    start = time.perf_counter()
+    for program_id in ids[-200:]:
+        store.get(program_id)
+    hot = (time.perf_counter() - start) / 200
+    print(
+        f"{'put / get':<24} {put_time / len(ids) * 1e6:8.1f} us put "
+        f"{cold * 1e6:8.1f} us cold get {hot * 1e6:8.2f} us cached get"
+    )
+
+    for backend in ("json", "sqlite"):
+        sizes = []
+        for compression in (False, True):
+            db = make_database(compression, backend)
+            populate(db, programs)
+            with tempfile.TemporaryDirectory() as path:
+                start = time.perf_counter()
+                db.save(path)
+                save_time = time.perf_counter() - start
+                sizes.append((directory_size(path), save_time))
+        (plain, plain_time), (delta, delta_time) = sizes
+        print(
+            f"{backend + ' checkpoint':<24} {plain / 1e6:10.1f} MB plain {delta / 1e6:10.1f} MB delta"
+            f"   (save {plain_time:.2f}s / {delta_time:.2f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
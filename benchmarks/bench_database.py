@@ -0,0 +1,289 @@
+"""
+ProgramDatabase operation benchmarks at scale
+
+Fills databases with 1k, 10k and 100k synthetic programs for several
+feature-dimension configurations and times each operation: add (with and
+without eviction), sample, get_top_programs, _enforce_population_limit,
+migrate_programs, get_island_stats, save and load. With --check, the growth
+of each operation's time with the population size is compared with its
+expected complexity, so scaling regressions fail loudly.
+
+Run with airspeed velocity (``asv run``) or directly:
+
+    python -m benchmarks.bench_database --sizes 1000 10000 100000 --check
+"""
+
+import argparse
+import logging
+import math
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from openevolve.config import DatabaseConfig
+from openevolve.database import Program, ProgramDatabase
+
+SIZES = [1_000, 10_000, 100_000]
+
+# Feature-dimension configurations of the MAP-Elites grid
+FEATURE_CONFIGS: Dict[str, Dict] = {
+    "score-complexity": {"feature_dimensions": ["score", "complexity"]},
+    "metrics": {"feature_dimensions": ["score", "speed"]},
+    "diversity-minhash": {
+        "feature_dimensions": ["complexity", "diversity"],
+        "diversity_metric": "minhash",
+    },
+}
+
+# Largest exponent k of t(N) ~ N^k allowed for each operation, measured between
+# the smallest and largest size. Per-call operations must stay sublinear and
+# whole-population ones at most N log N; the margins absorb timing noise and
+# cache effects at 100k programs, but not a jump to the next complexity class.
+SUBLINEAR = 0.5
+LINEAR = 1.4
+COMPLEXITY_BOUNDS = {
+    "add": SUBLINEAR,
+    "add_evicting": SUBLINEAR,
+    # Random inspirations are drawn from a set of all program IDs built per call
+    "sample": LINEAR,
+    "get_top_programs": SUBLINEAR,
+    "enforce_population_limit": LINEAR,  # Removes N/10 programs
+    "migrate_programs": LINEAR,
+    "get_island_stats": LINEAR,
+    "save": LINEAR,
+    "load": LINEAR,
+}
+
+# Bounds that differ for a feature configuration
+BOUND_OVERRIDES: Dict[str, Dict[str, float]] = {}
+
+# Timings below this are dominated by noise, so their growth is not checked
+MIN_CHECKED_TIME = 20e-6
+
+
+def make_program(i: int, rng: random.Random) -> Program:
+    """A synthetic program of about 500 characters with random metrics"""
+    lines = [
+        f"    v{n} = v{n - 1} * {rng.randint(1, 99)} % {rng.randint(2, 97)}" for n in range(1, 16)
+    ]
+    return Program(
+        id=f"p{i}",
+        code="def evolve(v0):\n" + "\n".join(lines) + "\n    return v15\n",
+        generation=i // 100,
+        iteration_found=i,
+        metrics={"score": rng.random(), "speed": rng.random()},
+    )
+
+
+def make_config(size: int, features: str = "score-complexity", **overrides) -> DatabaseConfig:
+    params = dict(
+        population_size=size,
+        archive_size=100,
+        num_islands=5,
+        feature_bins=10,
+        random_seed=0,
+        log_prompts=False,
+    )
+    params.update(FEATURE_CONFIGS[features])
+    params.update(overrides)
+    return DatabaseConfig(**params)
+
+
+def build_database(size: int, features: str = "score-complexity", **overrides) -> ProgramDatabase:
+    """A database holding `size` synthetic programs spread over its islands"""
+    db = ProgramDatabase(make_config(size, features, **overrides))
+    rng = random.Random(0)
+    for i in range(size):
+        db.add(make_program(i, rng), iteration=i, target_island=i % db.config.num_islands)
+    return db
+
+
+def _time(func: Callable[[], object], number: int = 1, repeat: int = 3) -> float:
+    """Best time per call over `repeat` runs of `number` calls"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def time_operations(size: int, features: str = "score-complexity") -> Dict[str, float]:
+    """
+    Time every database operation at one population size
+
+    Args:
+        size: Number of programs
+        features: Key of FEATURE_CONFIGS
+
+    Returns:
+        Seconds per call of each operation
+    """
+    results = {}
+    rng = random.Random(1)
+    next_id = [size]
+
+    def new_program() -> Program:
+        next_id[0] += 1
+        return make_program(next_id[0], rng)
+
+    # Adding below the population limit, then at the limit (every add evicts)
+    db = build_database(size, features, population_size=size * 2)
+    batch = [new_program() for _ in range(200)]
+    start = time.perf_counter()
+    for program in batch:
+        db.add(program)
+    results["add"] = (time.perf_counter() - start) / len(batch)
+
+    db.config.population_size = len(db.programs)
+    batch = [new_program() for _ in range(200)]
+    start = time.perf_counter()
+    for program in batch:
+        db.add(program)
+    results["add_evicting"] = (time.perf_counter() - start) / len(batch)
+
+    results["sample"] = _time(db.sample, number=200)
+    results["get_top_programs"] = _time(lambda: db.get_top_programs(5), number=200)
+    results["get_island_stats"] = _time(db.get_island_stats, repeat=2)
+
+    with tempfile.TemporaryDirectory() as path:
+        results["save"] = _time(lambda: db.save(path), repeat=1)
+        loaded = ProgramDatabase(make_config(size, features))
+        results["load"] = _time(lambda: loaded.load(path), repeat=1)
+
+    # Evicting a tenth of the population in one pass
+    db.config.population_size = len(db.programs) * 9 // 10
+    results["enforce_population_limit"] = _time(db._enforce_population_limit, repeat=1)
+
+    db.config.migration_rate = 0.1
+    results["migrate_programs"] = _time(db.migrate_programs, repeat=1)
+    return results
+
+
+def growth_exponents(timings: Dict[int, Dict[str, float]]) -> Dict[str, float]:
+    """
+    Empirical exponent k of t(N) ~ N^k for each operation
+
+    Args:
+        timings: Seconds per call of each operation, by population size
+
+    Returns:
+        Exponent between the smallest and largest size, for operations that
+        take long enough at the largest size to be measured reliably
+    """
+    sizes = sorted(timings)
+    if len(sizes) < 2:
+        return {}
+    small, large = sizes[0], sizes[-1]
+    exponents = {}
+    for operation, large_time in timings[large].items():
+        small_time = timings[small].get(operation)
+        if not small_time or large_time < MIN_CHECKED_TIME:
+            continue
+        exponents[operation] = math.log(large_time / small_time) / math.log(large / small)
+    return exponents
+
+
+def check_complexity(
+    timings: Dict[int, Dict[str, float]], features: str = "score-complexity"
+) -> List[str]:
+    """
+    Compare the growth of each operation with its complexity bound
+
+    Args:
+        timings: Seconds per call of each operation, by population size
+        features: Key of FEATURE_CONFIGS the timings were measured with
+
+    Returns:
+        Descriptions of the operations exceeding their bound
+    """
+    bounds = {**COMPLEXITY_BOUNDS, **BOUND_OVERRIDES.get(features, {})}
+    failures = []
+    for operation, exponent in growth_exponents(timings).items():
+        bound = bounds.get(operation)
+        if bound is not None and exponent > bound:
+            failures.append(
+                f"{operation} grows as N^{exponent:.2f}, more than the allowed N^{bound:.2f}"
+            )
+    return failures
+
+
+class DatabaseSuite:
+    """Per-operation time at increasing population sizes"""
+
+    params = ([1_000, 10_000], list(FEATURE_CONFIGS))
+    param_names = ["programs", "features"]
+    timeout = 600
+
+    def setup(self, programs, features):
+        logging.disable(logging.INFO)
+        self.db = build_database(programs, features)
+        self.rng = random.Random(1)
+        self.next_id = programs
+
+    def teardown(self, programs, features):
+        logging.disable(logging.NOTSET)
+
+    def time_add_evicting(self, programs, features):
+        self.next_id += 1
+        self.db.add(make_program(self.next_id, self.rng))
+
+    def time_sample(self, programs, features):
+        self.db.sample()
+
+    def time_get_top_programs(self, programs, features):
+        self.db.get_top_programs(5)
+
+    def time_get_island_stats(self, programs, features):
+        self.db.get_island_stats()
+
+    def time_save(self, programs, features):
+        with tempfile.TemporaryDirectory() as path:
+            self.db.save(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ProgramDatabase operations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument(
+        "--features", choices=list(FEATURE_CONFIGS), nargs="+", default=list(FEATURE_CONFIGS)
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Fail if an operation exceeds its complexity bound"
+    )
+    args = parser.parse_args()
+
+    # The database logs every eviction and migration
+    logging.basicConfig(level=logging.WARNING)
+    failed = False
+    for features in args.features:
+        timings = {}
+        for size in sorted(args.sizes):
+            start = time.perf_counter()
+            timings[size] = time_operations(size, features)
+            print(f"[{features}] {size} programs timed in {time.perf_counter() - start:.1f}s")
+
+        operations = list(timings[min(timings)])
+        exponents = growth_exponents(timings)
+        print(
+            f"\n{features:<26}" + "".join(f"{size:>12}" for size in sorted(timings)) + "    growth"
+        )
+        for operation in operations:
+            row = "".join(f"{timings[size][operation] * 1000:>10.3f}ms" for size in sorted(timings))
+            growth = f"N^{exponents[operation]:.2f}" if operation in exponents else "-"
+            print(f"  {operation:<24}{row}    {growth}")
+        print()
+
+        if args.check:
+            for failure in check_complexity(timings, features):
+                print(f"FAIL [{features}] {failure}")
+                failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
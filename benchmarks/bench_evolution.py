@@ -0,0 +1,83 @@
+"""
+End-to-end evolution loop benchmarks
+
+Runs short evolutions against the mock OpenAI server through
+openevolve.bench, which is also available as `openevolve-run bench` with
+more options and JSON results for comparing commits.
+
+Run with airspeed velocity (``asv run``) or directly:
+
+    python -m benchmarks.bench_evolution
+"""
+
+import asyncio
+import itertools
+import logging
+
+from openevolve.bench import BenchmarkCase, format_results, run_benchmarks, run_case
+
+ITERATIONS = 100
+
+
+class EvolutionSuite:
+    """Iterations per second and per-stage latency of the evolution loop"""
+
+    params = (["threaded", "async"], ["trivial", "cpu"], [1, 4, 16])
+    param_names = ["controller", "evaluator", "parallel_evaluations"]
+    timeout = 1800
+
+    def setup_cache(self):
+        # Each case is a whole evolution run, so every case runs once and all
+        # metrics are tracked from that run
+        logging.disable(logging.WARNING)
+        results = {}
+        for controller, evaluator, parallel_evaluations in itertools.product(*self.params):
+            case = BenchmarkCase(
+                iterations=ITERATIONS,
+                parallel_evaluations=parallel_evaluations,
+                evaluator=evaluator,
+                controller=controller,
+            )
+            results[case.name] = asyncio.run(run_case(case))
+        logging.disable(logging.NOTSET)
+        return results
+
+    def _result(self, results, controller, evaluator, parallel_evaluations):
+        case = BenchmarkCase(
+            parallel_evaluations=parallel_evaluations, evaluator=evaluator, controller=controller
+        )
+        return results[case.name]
+
+    def track_iterations_per_second(self, results, *params):
+        return self._result(results, *params)["iterations_per_second"]
+
+    track_iterations_per_second.unit = "iterations/s"
+
+    def track_total_p95(self, results, *params):
+        return self._result(results, *params)["stages"]["total"]["p95"]
+
+    track_total_p95.unit = "seconds"
+
+    def track_controller_cpu(self, results, *params):
+        return self._result(results, *params)["controller_cpu"]
+
+    track_controller_cpu.unit = "seconds"
+
+    def track_peak_rss(self, results, *params):
+        return self._result(results, *params)["peak_rss"]
+
+    track_peak_rss.unit = "bytes"
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    cases = [
+        BenchmarkCase(iterations=ITERATIONS, parallel_evaluations=p, controller=controller)
+        for controller in ("threaded", "async")
+        for p in (1, 4, 16)
+    ]
+    print(format_results(run_benchmarks(cases)))
+
+
+if __name__ == "__main__":
+    main()
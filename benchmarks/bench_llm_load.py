@@ -0,0 +1,147 @@
+"""
+LLM client load benchmarks against the mock OpenAI server
+
+Sends requests through OpenAILLM (pooled async client, retries, timeouts) to
+a local MockOpenAIServer with a fixed latency, at increasing concurrency, and
+reports throughput and how far it falls short of the ideal
+concurrency / latency requests per second.
+
+Run with airspeed velocity (``asv run``) or directly:
+
+    python -m benchmarks.bench_llm_load --concurrency 10 100 1000 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from openevolve.config import LLMModelConfig
+from openevolve.llm.mock_server import MockOpenAIServer
+from openevolve.llm.openai import OpenAILLM, close_async_clients
+
+PROMPT = """# Current Program
+```python
+# EVOLVE-BLOCK-START
+def evolve(x):
+    return x * 0.5
+# EVOLVE-BLOCK-END
+```
+
+You MUST use the exact SEARCH/REPLACE diff format shown below to indicate changes:
+
+<<<<<<< SEARCH
+"""
+
+
+async def run_load(
+    concurrency: int,
+    requests: int,
+    latency: float = 0.1,
+    max_connections: int = 1000,
+    **server_options: Any,
+) -> Dict[str, Any]:
+    """
+    Send requests to a mock server with at most `concurrency` in flight
+
+    Args:
+        concurrency: Concurrent requests
+        requests: Total requests
+        latency: Server latency in seconds
+        max_connections: Connection pool size of the client
+        **server_options: Further MockOpenAIServer options (error_rate, ...)
+
+    Returns:
+        Throughput, failures and server stats
+    """
+    server = MockOpenAIServer(latency=f"constant:{latency}", seed=0, **server_options)
+    llm = OpenAILLM(
+        LLMModelConfig(
+            name="mock",
+            api_base=await server.start(),
+            api_key="mock",
+            system_message="system",
+            temperature=0.7,
+            top_p=0.95,
+            max_tokens=256,
+            timeout=60,
+            retries=3,
+            retry_delay=0,
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=30.0,
+        )
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def request() -> None:
+        nonlocal failures
+        async with semaphore:
+            try:
+                await llm.generate(PROMPT)
+            except Exception:
+                failures += 1
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[request() for _ in range(requests)])
+    finally:
+        elapsed = time.perf_counter() - start
+        await close_async_clients()
+        await server.stop()
+    return {
+        "throughput": requests / elapsed,
+        "ideal_throughput": concurrency / latency if latency > 0 else float("inf"),
+        "failures": failures,
+        "server": server.stats.summary(),
+    }
+
+
+class LLMLoadSuite:
+    """OpenAILLM throughput against the mock server at increasing concurrency"""
+
+    params = [10, 100, 500]
+    param_names = ["concurrency"]
+    timeout = 300
+
+    def track_throughput(self, concurrency):
+        logging.disable(logging.WARNING)
+        return asyncio.run(run_load(concurrency, requests=concurrency * 4))["throughput"]
+
+    track_throughput.unit = "requests/s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark LLM client load handling")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--requests", type=int, default=None, help="Default: 4x concurrency")
+    parser.add_argument("--latency", type=float, default=0.2, help="Server latency in seconds")
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    # Retried requests log a warning each
+    logging.basicConfig(level=logging.ERROR)
+    print(f"{'concurrency':>12} {'requests/s':>12} {'ideal':>10} {'failures':>9} {'in flight':>10}")
+    for concurrency in args.concurrency:
+        result = asyncio.run(
+            run_load(
+                concurrency,
+                args.requests or concurrency * 4,
+                latency=args.latency,
+                max_connections=args.max_connections,
+                error_rate=args.error_rate,
+                rate_limit_rate=args.rate_limit_rate,
+            )
+        )
+        print(
+            f"{concurrency:>12} {result['throughput']:>12.0f} {result['ideal_throughput']:>10.0f} "
+            f"{result['failures']:>9} {result['server']['max_in_flight']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Asyncio-native parallel processing as a staged generation/evaluation pipeline
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from openevolve.config import Config
+from openevolve.database import ProgramDatabase
+from openevolve.evaluation_cache import EvaluationCache
+from openevolve.evaluator import Evaluator
+from openevolve.iteration import evaluate_candidate, generate_candidates
+from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.prompt.sampler import PromptSampler
+from openevolve.threaded_parallel import ImprovedParallelController
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageMetrics:
+    """Throughput, utilisation and input queue depth of a pipeline stage"""
+
+    name: str
+    workers: int
+    processed: int = 0
+    busy_time: float = 0.0  # Time workers spent doing work
+    blocked_time: float = 0.0  # Time workers waited for room in the next queue
+    queue_depth_sum: int = 0
+    queue_samples: int = 0
+    max_queue_depth: int = 0
+    start_time: float = field(default_factory=time.time)
+
+    def sample_queue(self, depth: int) -> None:
+        """Record the depth of the stage's input queue"""
+        self.queue_depth_sum += depth
+        self.queue_samples += 1
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def summary(self) -> Dict[str, Any]:
+        """Metrics summary since the stage started"""
+        capacity = self.workers * max(time.time() - self.start_time, 1e-9)
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "utilisation": self.busy_time / capacity,
+            "blocked": self.blocked_time / capacity,
+            "mean_queue_depth": (
+                self.queue_depth_sum / self.queue_samples if self.queue_samples else 0.0
+            ),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class AsyncParallelController(ImprovedParallelController):
+    """
+    Controller running evolution as a two-stage pipeline on a single event loop
+
+    Generator workers (llm.max_concurrency of them) sample a parent, build the
+    prompt, query the LLM and push the candidates into a bounded queue
+    (candidate_queue_size). Evaluation workers (evaluator.parallel_evaluations)
+    drain that queue, so the children of one prompt (samples_per_prompt) are
+    evaluated concurrently. When evaluation falls behind, the full queue blocks
+    the generators; when generation falls behind, evaluators wait on an empty
+    queue, so neither budget is tied to the other. All workers are coroutines on the
+    controller's event loop, so database reads and writes never race.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        evaluation_file: str,
+        database: ProgramDatabase,
+        evaluation_cache: Optional[EvaluationCache] = None,
+    ):
+        super().__init__(config, evaluation_file, database, evaluation_cache)
+
+        self.llm_ensemble = None
+        self.prompt_sampler = None
+        self.evaluator = None
+
+        # Created in run_evolution, since they belong to the running event loop
+        self._iteration_queue: Optional[asyncio.Queue] = None
+        self._candidate_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        self.generation_metrics: Optional[StageMetrics] = None
+        self.evaluation_metrics: Optional[StageMetrics] = None
+
+    def start(self) -> None:
+        """Start the asyncio parallel system"""
+        self.llm_ensemble = LLMEnsemble(self.config.llm.models)
+        llm_evaluator_ensemble = LLMEnsemble(self.config.llm.evaluator_models)
+
+        self.prompt_sampler = PromptSampler(self.config.prompt)
+        evaluator_prompt_sampler = PromptSampler(self.config.prompt)
+        evaluator_prompt_sampler.set_templates("evaluator_system_message")
+
+        self.evaluator = Evaluator(
+            self.config.evaluator,
+            self.evaluation_file,
+            llm_evaluator_ensemble,
+            evaluator_prompt_sampler,
+            database=self.database,
+            cache=self.evaluation_cache,
+        )
+
+        logger.info(
+            f"Started asyncio pipeline controller (generators: "
+            f"{self.config.llm.max_concurrency}, evaluators: "
+            f"{self.config.evaluator.parallel_evaluations}, candidate queue: "
+            f"{self.config.candidate_queue_size})"
+        )
+
+    def stop(self) -> None:
+        """Stop the asyncio parallel system"""
+        self.shutdown_flag.set()
+        logger.info("Stopped asyncio pipeline controller")
+
+    async def run_evolution(
+        self,
+        start_iteration: int,
+        max_iterations: int,
+        target_score: Optional[float] = None,
+        checkpoint_callback=None,
+    ):
+        """
+        Run evolution through the generation/evaluation pipeline
+
+        Args:
+            start_iteration: Starting iteration number
+            max_iterations: Maximum number of iterations
+            target_score: Target score to achieve
+        """
+        num_generators = self.config.llm.max_concurrency
+        num_evaluators = self.config.evaluator.parallel_evaluations
+
+        self._iteration_queue = asyncio.Queue()
+        self._candidate_queue = asyncio.Queue(maxsize=self.config.candidate_queue_size)
+        self.generation_metrics = StageMetrics("generation", num_generators)
+        self.evaluation_metrics = StageMetrics("evaluation", num_evaluators)
+
+        self._workers = [
+            asyncio.ensure_future(self._generation_worker()) for _ in range(num_generators)
+        ] + [asyncio.ensure_future(self._evaluation_worker()) for _ in range(num_evaluators)]
+
+        def on_checkpoint(iteration: int) -> None:
+            self.log_pipeline_metrics()
+            if checkpoint_callback:
+                checkpoint_callback(iteration)
+
+        try:
+            await super().run_evolution(
+                start_iteration, max_iterations, target_score, on_checkpoint
+            )
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            self.log_pipeline_metrics()
+
+    def get_pipeline_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage metrics of the current (or last) run"""
+        if self.generation_metrics is None:
+            return {}
+        return {
+            "generation": self.generation_metrics.summary(),
+            "evaluation": self.evaluation_metrics.summary(),
+        }
+
+    def log_pipeline_metrics(self) -> None:
+        """Log per-stage throughput, utilisation and queue depth"""
+        for name, stats in self.get_pipeline_metrics().items():
+            logger.info(
+                f"Pipeline {name}: {stats['processed']} processed by {stats['workers']} workers, "
+                f"utilisation {stats['utilisation']:.1%}, blocked {stats['blocked']:.1%}, "
+                f"queue depth {stats['mean_queue_depth']:.1f} (max {stats['max_queue_depth']})"
+            )
+
+    def _submit(self, iteration: int) -> asyncio.Future:
+        """Queue an iteration for the generation stage"""
+        future = asyncio.get_running_loop().create_future()
+        self._iteration_queue.put_nowait((iteration, future))
+        self.generation_metrics.sample_queue(self._iteration_queue.qsize())
+        return future
+
+    def _max_in_flight(self) -> int:
+        """Enough iterations to keep every worker busy and the candidate queue full"""
+        return (
+            self.config.llm.max_concurrency
+            + self.config.candidate_queue_size
+            + self.config.evaluator.parallel_evaluations
+        )
+
+    async def _generation_worker(self) -> None:
+        """Turn queued iterations into candidates for the evaluation stage"""
+        metrics = self.generation_metrics
+        while True:
+            iteration, future = await self._iteration_queue.get()
+            if future.done():
+                # Cancelled while waiting in the queue
+                continue
+
+            start_time = time.time()
+            try:
+                candidates = await generate_candidates(
+                    iteration, self.config, self.database, self.llm_ensemble, self.prompt_sampler
+                )
+            except Exception as e:
+                logger.exception(f"Error generating iteration {iteration}: {e}")
+                candidates = []
+            metrics.busy_time += time.time() - start_time
+            metrics.processed += 1
+
+            if not candidates:
+                if not future.done():
+                    future.set_result([])
+                continue
+
+            futures = self._split_future(future, len(candidates))
+
+            # Blocks while the evaluation stage is saturated
+            start_time = time.time()
+            for candidate, candidate_future in zip(candidates, futures):
+                await self._candidate_queue.put((candidate, candidate_future))
+                self.evaluation_metrics.sample_queue(self._candidate_queue.qsize())
+            metrics.blocked_time += time.time() - start_time
+
+    @staticmethod
+    def _split_future(future: asyncio.Future, count: int) -> List[asyncio.Future]:
+        """
+        Futures for the children of an iteration, resolving the iteration's future
+        with the list of their results once all are done
+
+        Args:
+            future: Future of the iteration
+            count: Number of children
+
+        Returns:
+            One future per child; all are cancelled if the iteration is
+        """
+        loop = future.get_loop()
+        futures = [loop.create_future() for _ in range(count)]
+
+        def on_child_done(_: asyncio.Future) -> None:
+            if future.done() or not all(f.done() for f in futures):
+                return
+            results = [f.result() for f in futures if not f.cancelled()]
+            future.set_result([r for r in results if r is not None])
+
+        def on_iteration_done(_: asyncio.Future) -> None:
+            if future.cancelled():
+                for f in futures:
+                    f.cancel()
+
+        for f in futures:
+            f.add_done_callback(on_child_done)
+        future.add_done_callback(on_iteration_done)
+        return futures
+
+    async def _evaluation_worker(self) -> None:
+        """Evaluate candidates produced by the generation stage"""
+        metrics = self.evaluation_metrics
+        while True:
+            candidate, future = await self._candidate_queue.get()
+            self.evaluation_metrics.sample_queue(self._candidate_queue.qsize())
+            if future.done():
+                continue
+
+            start_time = time.time()
+            try:
+                result = await evaluate_candidate(candidate, self.config, self.evaluator)
+            except Exception as e:
+                logger.exception(f"Error evaluating iteration {candidate.iteration}: {e}")
+                result = None
+            metrics.busy_time += time.time() - start_time
+            metrics.processed += 1
+
+            if not future.done():
+                future.set_result(result)
+
+    async def _finish_pending(self, pending_futures: Dict[int, asyncio.Future]) -> None:
+        """Cancel iterations that are still in the pipeline when evolution stops"""
+        if not pending_futures:
+            return
+
+        if self.shutdown_flag.is_set():
+            logger.info("Shutdown requested, canceling remaining evaluations...")
+
+        # Results of remaining iterations would be discarded, so don't wait for them
+        for future in pending_futures.values():
+            future.cancel()
@@ -0,0 +1,375 @@
+"""
+End-to-end throughput benchmark of the evolution loop
+
+Runs OpenEvolve for a number of iterations against the mock OpenAI server
+with a trivial or CPU-heavy evaluator, for every combination of the given
+parallel_evaluations, population sizes and island counts, and reports
+iterations per second, per-stage latency percentiles, CPU time and peak
+memory. Results are saved as JSON so runs on different commits can be
+compared:
+
+    openevolve-run bench --iterations 200 --parallel-evaluations 1 4 16
+    openevolve-run bench --samples-per-prompt 1 4 --llm-latency 0.5
+    openevolve-run bench --compare .bench/<earlier result>.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from openevolve.config import Config, LLMConfig, LLMModelConfig
+from openevolve.llm.mock_server import MockOpenAIServer
+
+logger = logging.getLogger(__name__)
+
+INITIAL_PROGRAM = """# Benchmark program evolved by openevolve-run bench
+import math
+
+# EVOLVE-BLOCK-START
+def evolve(x):
+    a = 1.5
+    b = 0.25
+    c = 3
+    for _ in range(c):
+        x = math.sin(a * x) + b
+    return x
+# EVOLVE-BLOCK-END
+
+
+def run():
+    return evolve(0.5)
+"""
+
+EVALUATOR = """import hashlib
+
+# Iterations of busy work per evaluation, 0 for a trivial evaluator
+WORK = {work}
+
+
+def evaluate(program_path):
+    with open(program_path) as f:
+        code = f.read()
+    total = 0
+    for i in range(WORK):
+        total += i * i % 7
+    digest = hashlib.sha256(code.encode("utf-8")).digest()
+    return {{"score": digest[0] / 255, "speed": digest[1] / 255}}
+"""
+
+# Busy-loop iterations of the "cpu" evaluator, about 0.1 s of CPU time
+CPU_EVALUATOR_WORK = 1_000_000
+EVALUATORS = {"trivial": 0, "cpu": CPU_EVALUATOR_WORK}
+
+
+@dataclass
+class BenchmarkCase:
+    """Parameters of one benchmark run"""
+
+    iterations: int = 100
+    parallel_evaluations: int = 4
+    population_size: int = 1000
+    num_islands: int = 5
+    evaluator: str = "trivial"
+    controller: str = "threaded"
+    llm_latency: float = 0.0
+    checkpoint_interval: int = 50
+    samples_per_prompt: int = 1
+
+    @property
+    def name(self) -> str:
+        name = (
+            f"{self.controller}-{self.evaluator}-p{self.parallel_evaluations}"
+            f"-pop{self.population_size}-isl{self.num_islands}"
+        )
+        if self.samples_per_prompt > 1:
+            name += f"-k{self.samples_per_prompt}"
+        return name
+
+
+def _rusage() -> Dict[str, float]:
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "cpu": self_usage.ru_utime + self_usage.ru_stime,
+        "children_cpu": children.ru_utime + children.ru_stime,
+        "peak_rss": self_usage.ru_maxrss * rss_unit,
+    }
+
+
+def benchmark_config(case: BenchmarkCase, api_base: str, output_dir: str) -> Config:
+    """
+    Configuration for a benchmark run against the mock server
+
+    Args:
+        case: Benchmark parameters
+        api_base: URL of the mock server
+        output_dir: Output directory of the run
+
+    Returns:
+        Config for OpenEvolve
+    """
+    config = Config()
+    config.max_iterations = case.iterations
+    config.checkpoint_interval = case.checkpoint_interval
+    config.controller = case.controller
+    config.samples_per_prompt = case.samples_per_prompt
+    config.log_level = "WARNING"
+    config.log_dir = os.path.join(output_dir, "logs")
+    config.llm = LLMConfig(
+        api_base=api_base,
+        api_key="mock",
+        models=[LLMModelConfig(name="mock", weight=1.0)],
+        timeout=60,
+        retries=3,
+        retry_delay=0,
+        max_concurrency=max(case.parallel_evaluations * 2, 4),
+    )
+    config.database.population_size = case.population_size
+    config.database.archive_size = min(100, case.population_size)
+    config.database.num_islands = case.num_islands
+    config.evaluator.parallel_evaluations = case.parallel_evaluations
+    config.evaluator.cascade_evaluation = False
+    config.evaluator.use_llm_feedback = False
+    config.evaluator.timeout = 60
+    return config
+
+
+async def run_case(case: BenchmarkCase, work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run one benchmark case
+
+    Args:
+        case: Benchmark parameters
+        work_dir: Directory for the program, evaluator and output (default: temporary)
+
+    Returns:
+        Throughput, per-stage percentiles, resource usage and mock server stats
+    """
+    # Imported here so `openevolve-run bench --help` stays fast
+    from openevolve.controller import OpenEvolve
+
+    if case.evaluator not in EVALUATORS:
+        raise ValueError(
+            f"Unknown evaluator {case.evaluator!r}, expected one of {list(EVALUATORS)}"
+        )
+
+    with tempfile.TemporaryDirectory(prefix="openevolve-bench-", dir=work_dir) as root:
+        program_path = os.path.join(root, "program.py")
+        evaluator_path = os.path.join(root, "evaluator.py")
+        with open(program_path, "w") as f:
+            f.write(INITIAL_PROGRAM)
+        with open(evaluator_path, "w") as f:
+            f.write(EVALUATOR.format(work=EVALUATORS[case.evaluator]))
+
+        server = MockOpenAIServer(latency=f"constant:{case.llm_latency}", seed=0)
+        api_base = server.start_in_thread()
+        root_logger = logging.getLogger()
+        handlers, level = list(root_logger.handlers), root_logger.level
+        try:
+            config = benchmark_config(case, api_base, root)
+            openevolve = OpenEvolve(
+                program_path, evaluator_path, config=config, output_dir=os.path.join(root, "out")
+            )
+            before = _rusage()
+            start = time.perf_counter()
+            await openevolve.run(iterations=case.iterations)
+            elapsed = time.perf_counter() - start
+            after = _rusage()
+        finally:
+            server.stop_thread()
+            # OpenEvolve adds log handlers to the root logger on every run
+            for handler in root_logger.handlers[:]:
+                if handler not in handlers:
+                    root_logger.removeHandler(handler)
+                    handler.close()
+            root_logger.setLevel(level)
+
+    timings = openevolve.stage_timings
+    cpu = after["cpu"] - before["cpu"]
+    # Stage timings are recorded per child program
+    return {
+        "iterations": case.iterations,
+        "completed": timings.count,
+        "elapsed": elapsed,
+        "iterations_per_second": case.iterations / elapsed,
+        "children_per_second": timings.count / elapsed,
+        "stages": timings.percentiles(),
+        "controller_cpu": cpu,
+        "controller_cpu_utilisation": cpu / elapsed,
+        "children_cpu": after["children_cpu"] - before["children_cpu"],
+        "peak_rss": after["peak_rss"],
+        "llm_requests": server.stats.summary(),
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(cases: List[BenchmarkCase]) -> Dict[str, Any]:
+    """
+    Run benchmark cases one after the other
+
+    Args:
+        cases: Benchmark parameters
+
+    Returns:
+        Environment and per-case results, as saved to JSON
+    """
+    from openevolve import __version__
+
+    results = []
+    for case in cases:
+        logger.info(f"Running benchmark {case.name}")
+        results.append({"name": case.name, "params": asdict(case), **asyncio.run(run_case(case))})
+    return {
+        "version": __version__,
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "cases": results,
+    }
+
+
+def format_results(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Human-readable table of benchmark results
+
+    Args:
+        report: Results of run_benchmarks
+        baseline: Earlier results to compare iterations per second with
+
+    Returns:
+        The table
+    """
+    baseline_cases = {case["name"]: case for case in (baseline or {}).get("cases", [])}
+    lines = [
+        f"{'case':<44} {'it/s':>8} {'change':>8} {'cpu':>6} {'rss MB':>8}  stage p50/p95/p99 ms"
+    ]
+    for case in report["cases"]:
+        change = ""
+        previous = baseline_cases.get(case["name"])
+        if previous:
+            ratio = case["iterations_per_second"] / previous["iterations_per_second"] - 1
+            change = f"{ratio:+.1%}"
+        lines.append(
+            f"{case['name']:<44} {case['iterations_per_second']:>8.1f} {change:>8} "
+            f"{case['controller_cpu_utilisation']:>6.0%} {case['peak_rss'] / 2**20:>8.0f}"
+        )
+        for stage, stats in case["stages"].items():
+            lines.append(
+                f"{'':<4}{stage:<12} {stats['p50'] * 1000:8.2f} {stats['p95'] * 1000:8.2f} "
+                f"{stats['p99'] * 1000:8.2f}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point of `openevolve-run bench`
+
+    Args:
+        argv: Command-line arguments after the subcommand
+
+    Returns:
+        Exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="openevolve-run bench",
+        description="Benchmark evolution loop throughput against a mock LLM",
+    )
+    parser.add_argument("--iterations", type=int, default=100, help="Iterations per case")
+    parser.add_argument(
+        "--parallel-evaluations", type=int, nargs="+", default=[4], help="Values to benchmark"
+    )
+    parser.add_argument("--population-size", type=int, nargs="+", default=[1000])
+    parser.add_argument("--islands", type=int, nargs="+", default=[5])
+    parser.add_argument("--evaluator", choices=list(EVALUATORS), nargs="+", default=["trivial"])
+    parser.add_argument(
+        "--controller", choices=["threaded", "async"], nargs="+", default=["threaded"]
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.0, help="Seconds the mock LLM takes per response"
+    )
+    parser.add_argument("--checkpoint-interval", type=int, default=50)
+    parser.add_argument(
+        "--samples-per-prompt",
+        type=int,
+        nargs="+",
+        default=[1],
+        help="Completions requested per prompt, each evaluated as its own child",
+    )
+    parser.add_argument(
+        "--output",
+        default=".bench",
+        help="Directory to save the JSON results in (empty to not save them)",
+    )
+    parser.add_argument("--compare", default=None, help="Earlier JSON results to compare with")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    cases = [
+        BenchmarkCase(
+            iterations=args.iterations,
+            parallel_evaluations=parallel,
+            population_size=population,
+            num_islands=islands,
+            evaluator=evaluator,
+            controller=controller,
+            llm_latency=args.llm_latency,
+            checkpoint_interval=args.checkpoint_interval,
+            samples_per_prompt=samples,
+        )
+        for controller, evaluator, parallel, population, islands, samples in itertools.product(
+            args.controller,
+            args.evaluator,
+            args.parallel_evaluations,
+            args.population_size,
+            args.islands,
+            args.samples_per_prompt,
+        )
+    ]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = run_benchmarks(cases)
+    print(format_results(report, baseline))
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        path = os.path.join(
+            args.output,
+            f"bench_{report['commit'] or 'unknown'}_{time.strftime('%Y%m%d_%H%M%S')}.json",
+        )
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {path}")
+    return 0
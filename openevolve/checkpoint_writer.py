@@ -0,0 +1,152 @@
+"""
+Background writing of database checkpoints
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from openevolve.database import DatabaseSnapshot, ProgramDatabase
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CheckpointMetrics:
+    """How long checkpoints took to snapshot (stalling evolution) and to write"""
+
+    written: int = 0
+    failed: int = 0
+    programs_written: int = 0
+    total_snapshot_time: float = 0.0
+    max_snapshot_time: float = 0.0
+    total_write_time: float = 0.0
+    max_write_time: float = 0.0
+    last_snapshot_time: float = 0.0
+    last_write_time: float = 0.0
+
+    def record(self, snapshot: DatabaseSnapshot) -> None:
+        """Record the durations of a written snapshot"""
+        self.written += 1
+        self.programs_written += len(snapshot.programs)
+        self.total_snapshot_time += snapshot.snapshot_time
+        self.max_snapshot_time = max(self.max_snapshot_time, snapshot.snapshot_time)
+        self.total_write_time += snapshot.write_time
+        self.max_write_time = max(self.max_write_time, snapshot.write_time)
+        self.last_snapshot_time = snapshot.snapshot_time
+        self.last_write_time = snapshot.write_time
+
+    def summary(self) -> Dict[str, Any]:
+        """Metrics summary, durations in seconds"""
+        count = max(self.written, 1)
+        return {
+            "written": self.written,
+            "failed": self.failed,
+            "programs_written": self.programs_written,
+            "mean_snapshot_time": self.total_snapshot_time / count,
+            "max_snapshot_time": self.max_snapshot_time,
+            "mean_write_time": self.total_write_time / count,
+            "max_write_time": self.max_write_time,
+            "last_snapshot_time": self.last_snapshot_time,
+            "last_write_time": self.last_write_time,
+        }
+
+
+class CheckpointWriter:
+    """
+    Writes database snapshots to disk, optionally on a background thread
+
+    The evolution loop only pays for ProgramDatabase.snapshot; serializing the
+    programs happens on a writer thread. Snapshots are written one at a time
+    in submission order (a delta checkpoint builds on the one before it), and
+    submit blocks once max_pending snapshots are waiting so a slow disk cannot
+    make them pile up in memory.
+    """
+
+    def __init__(self, database: ProgramDatabase, background: bool = True, max_pending: int = 2):
+        self.database = database
+        self.background = background
+        self.max_pending = max(max_pending, 1)
+        self.metrics = CheckpointMetrics()
+        self._queue: "queue.Queue[Optional[DatabaseSnapshot]]" = queue.Queue(self.max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, snapshot: DatabaseSnapshot) -> None:
+        """
+        Write a snapshot, in the background if enabled
+
+        Args:
+            snapshot: Snapshot taken with ProgramDatabase.snapshot
+        """
+        if not self.background:
+            self._write(snapshot)
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="checkpoint-writer", daemon=True
+                )
+                self._thread.start()
+        if self._queue.full():
+            logger.warning(
+                f"{self._queue.qsize()} checkpoints still being written, waiting for room"
+            )
+        self._queue.put(snapshot)
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted snapshots not yet written"""
+        return self._queue.unfinished_tasks
+
+    def wait(self) -> None:
+        """Block until all submitted snapshots are written"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining snapshots and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join()
+
+    def log_metrics(self) -> None:
+        """Log how long checkpoints took"""
+        stats = self.metrics.summary()
+        if not stats["written"] and not stats["failed"]:
+            return
+        logger.info(
+            f"Checkpoints: {stats['written']} written ({stats['failed']} failed), "
+            f"snapshot {stats['mean_snapshot_time'] * 1000:.1f} ms mean / "
+            f"{stats['max_snapshot_time'] * 1000:.1f} ms max, "
+            f"write {stats['mean_write_time']:.2f}s mean / {stats['max_write_time']:.2f}s max"
+        )
+
+    def _run(self) -> None:
+        """Writer thread: write snapshots until the stop marker"""
+        while True:
+            snapshot = self._queue.get()
+            try:
+                if snapshot is None:
+                    return
+                self._write(snapshot)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, snapshot: DatabaseSnapshot) -> None:
+        try:
+            self.database.write_snapshot(snapshot)
+        except Exception as e:
+            self.metrics.failed += 1
+            logger.exception(f"Failed to write checkpoint {snapshot.path}: {e}")
+            return
+        self.metrics.record(snapshot)
+        logger.info(
+            f"Wrote checkpoint {snapshot.path} in {snapshot.write_time:.2f}s "
+            f"(evolution paused {snapshot.snapshot_time * 1000:.1f} ms for the snapshot)"
+        )
@@ -166,6 +166,108 @@ async def main_async() -> int:
         return 1
 
 
+def import_checkpoint_main(argv: List[str]) -> int:
+    """
+    Convert a database or checkpoint directory to another storage backend
+
+    Args:
+        argv: Command-line arguments after the subcommand
+
+    Returns:
+        Exit code
+    """
+    from openevolve.storage import STORAGE_BACKENDS, import_checkpoint
+
+    parser = argparse.ArgumentParser(
+        prog="openevolve-run import-checkpoint",
+        description="Convert a database or checkpoint directory to another storage backend",
+    )
+    parser.add_argument("source", help="Existing database or checkpoint directory")
+    parser.add_argument("destination", help="Directory to write the converted database to")
+    parser.add_argument(
+        "--backend", choices=STORAGE_BACKENDS, default="sqlite", help="Storage backend to write"
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.source):
+        print(f"Error: Source directory '{args.source}' not found")
+        return 1
+
+    try:
+        count = import_checkpoint(args.source, args.destination, args.backend)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    print(f"Imported {count} programs into {args.destination} ({args.backend} storage)")
+    return 0
+
+
+def compact_checkpoint_main(argv: List[str]) -> int:
+    """
+    Merge an incremental checkpoint with the checkpoints it builds on
+
+    Args:
+        argv: Command-line arguments after the subcommand
+
+    Returns:
+        Exit code
+    """
+    from openevolve.storage import STORAGE_BACKENDS, compact_checkpoint
+
+    parser = argparse.ArgumentParser(
+        prog="openevolve-run compact-checkpoint",
+        description="Turn an incremental checkpoint into a standalone full checkpoint",
+    )
+    parser.add_argument("checkpoint", help="Checkpoint directory to compact")
+    parser.add_argument(
+        "--output", help="Write the full checkpoint here instead of in place", default=None
+    )
+    parser.add_argument(
+        "--backend",
+        choices=STORAGE_BACKENDS,
+        default=None,
+        help="Storage backend to write (default: same as the checkpoint)",
+    )
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.checkpoint):
+        print(f"Error: Checkpoint directory '{args.checkpoint}' not found")
+        return 1
+
+    try:
+        count = compact_checkpoint(args.checkpoint, args.output, args.backend)
+    except FileNotFoundError as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    print(f"Compacted {count} programs into {args.output or args.checkpoint}")
+    return 0
+
+
+def bench_main(argv: List[str]) -> int:
+    """
+    Benchmark the throughput of the evolution loop against a mock LLM
+
+    Args:
+        argv: Command-line arguments after the subcommand
+
+    Returns:
+        Exit code
+    """
+    from openevolve.bench import main as run_bench
+
+    return run_bench(argv)
+
+
+# Subcommands, dispatched on the first argument
+COMMANDS = {
+    "import-checkpoint": import_checkpoint_main,
+    "compact-checkpoint": compact_checkpoint_main,
+    "bench": bench_main,
+}
+
+
 def main() -> int:
     """
     Main entry point
@@ -173,6 +275,8 @@ def main() -> int:
     Returns:
         Exit code
     """
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
     return asyncio.run(main_async())
 
 
@@ -0,0 +1,310 @@
+"""
+Parent-delta compressed storage of program code
+"""
+
+import difflib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A delta is a list of [start, end, lines]: replace base lines [start, end) with lines
+Delta = List[Tuple[int, int, List[str]]]
+
+
+def encode_delta(base: str, code: str) -> Delta:
+    """
+    Line-level delta turning base into code
+
+    Args:
+        base: Code the delta applies to
+        code: Code the delta produces
+
+    Returns:
+        Replacement operations, in order of position in base
+    """
+    base_lines = base.splitlines(keepends=True)
+    code_lines = code.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, code_lines, autojunk=False)
+    return [
+        (i1, i2, code_lines[j1:j2])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_delta(base: str, delta: Delta) -> str:
+    """
+    Reconstruct code from its base and a delta produced by encode_delta
+
+    Args:
+        base: Code the delta applies to
+        delta: Replacement operations
+
+    Returns:
+        Reconstructed code
+    """
+    base_lines = base.splitlines(keepends=True)
+    result: List[str] = []
+    position = 0
+    for start, end, lines in delta:
+        result.extend(base_lines[position:start])
+        result.extend(lines)
+        position = end
+    result.extend(base_lines[position:])
+    return "".join(result)
+
+
+def delta_size(delta: Delta) -> int:
+    """Approximate size of a delta in characters"""
+    return sum(8 + sum(len(line) for line in lines) for _, _, lines in delta)
+
+
+def resolve_code_deltas(
+    deltas: Dict[str, Dict[str, Any]], get_code: Callable[[str], Optional[str]]
+) -> Dict[str, str]:
+    """
+    Reconstruct the code of programs stored as deltas in a checkpoint
+
+    Args:
+        deltas: Program ID to {"base": base program ID, "ops": delta}
+        get_code: Code of a program stored in full (None if unknown)
+
+    Returns:
+        Program ID to reconstructed code, for every ID in deltas that could be resolved
+    """
+    resolved: Dict[str, str] = {}
+
+    def resolve(program_id: str) -> Optional[str]:
+        # Walk up to a program with full code, then apply deltas back down
+        chain = []
+        current = program_id
+        while current in deltas and current not in resolved:
+            chain.append(current)
+            current = deltas[current]["base"]
+            if len(chain) > len(deltas):
+                logger.warning(f"Cyclic code deltas for program {program_id}")
+                return None
+        code = resolved.get(current) if current in resolved else get_code(current)
+        if code is None:
+            logger.warning(f"Base program {current} of {chain[-1]} not found, cannot decode")
+            return None
+        for link in reversed(chain):
+            code = apply_delta(code, deltas[link]["ops"])
+            resolved[link] = code
+        return code
+
+    for program_id in deltas:
+        if program_id not in resolved:
+            resolve(program_id)
+    return resolved
+
+
+@dataclass
+class _Entry:
+    """Stored code of one program"""
+
+    size: int  # Length of the decoded code
+    depth: int = 0  # Deltas between this entry and its keyframe
+    code: Optional[str] = None  # Full code (keyframes)
+    base: Optional[str] = None  # Program the delta applies to
+    delta: Optional[Delta] = None
+    children: Set[str] = field(default_factory=set)  # Entries stored as deltas on this one
+    removed: bool = False  # Kept only because children depend on it
+
+    @property
+    def stored_size(self) -> int:
+        return len(self.code) if self.code is not None else delta_size(self.delta)
+
+
+class DeltaCodeStore:
+    """
+    Code of a program lineage, stored as deltas against each program's parent
+
+    A child's code is kept as a line-level delta against its parent unless the
+    parent is not stored, the delta is not smaller than half the code, or the
+    chain from the last keyframe (a program stored in full) would reach
+    keyframe_interval deltas. Decoding walks at most keyframe_interval deltas;
+    the cache_size most recently decoded programs are kept in full.
+
+    Programs that other entries depend on stay stored after removal until
+    their last dependent is removed.
+    """
+
+    def __init__(self, keyframe_interval: int = 8, cache_size: int = 256):
+        self.keyframe_interval = max(keyframe_interval, 1)
+        self.cache_size = cache_size
+        self._entries: Dict[str, _Entry] = {}
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, program_id: str) -> bool:
+        entry = self._entries.get(program_id)
+        return entry is not None and not entry.removed
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries.values() if not entry.removed)
+
+    def put(self, program_id: str, code: str, base_id: Optional[str] = None) -> bool:
+        """
+        Store the code of a program
+
+        Args:
+            program_id: Program ID
+            code: Program code
+            base_id: Program to store the code as a delta against (usually the parent)
+
+        Returns:
+            True if the code was stored as a delta, False if in full
+        """
+        with self._lock:
+            existing = self._entries.get(program_id)
+            if existing is not None:
+                if not existing.removed and self.get(program_id) == code:
+                    return existing.code is None
+                self._replace(program_id)
+
+            entry = _Entry(size=len(code))
+            base = self._entries.get(base_id) if base_id is not None else None
+            if base is not None and base_id != program_id:
+                depth = base.depth + 1
+                if depth < self.keyframe_interval:
+                    delta = encode_delta(self.get(base_id), code)
+                    if delta_size(delta) * 2 < len(code):
+                        entry.depth, entry.base, entry.delta = depth, base_id, delta
+                        base.children.add(program_id)
+            if entry.delta is None:
+                entry.code = code
+
+            self._entries[program_id] = entry
+            self._remember(program_id, code)
+            return entry.delta is not None
+
+    def get(self, program_id: str) -> str:
+        """
+        Code of a stored program
+
+        Args:
+            program_id: Program ID
+
+        Returns:
+            Decoded code
+        """
+        with self._lock:
+            code = self._cache.get(program_id)
+            if code is not None:
+                self._cache.move_to_end(program_id)
+                return code
+
+            entry = self._entries.get(program_id)
+            if entry is None:
+                raise KeyError(f"Code of program {program_id} is not stored")
+
+            chain = []
+            while entry.code is None:
+                chain.append(entry)
+                cached = self._cache.get(entry.base)
+                if cached is not None:
+                    code = cached
+                    break
+                entry = self._entries[entry.base]
+            else:
+                code = entry.code
+
+            for link in reversed(chain):
+                code = apply_delta(code, link.delta)
+            self._remember(program_id, code)
+            return code
+
+    def get_content(self, program_id: str, name: str) -> Any:
+        """Content field of a program (lazy Program field protocol)"""
+        if name != "code":
+            raise KeyError(name)
+        return self.get(program_id)
+
+    def delta(self, program_id: str) -> Optional[Tuple[str, Delta]]:
+        """
+        How a program's code is stored
+
+        Args:
+            program_id: Program ID
+
+        Returns:
+            (base program ID, delta) for delta entries, None for keyframes
+        """
+        entry = self._entries.get(program_id)
+        if entry is None or entry.delta is None:
+            return None
+        return entry.base, entry.delta
+
+    def discard(self, program_id: str) -> None:
+        """Remove a program, keeping its code while other entries depend on it"""
+        with self._lock:
+            entry = self._entries.get(program_id)
+            if entry is None:
+                return
+            entry.removed = True
+            self._cache.pop(program_id, None)
+            self._release(program_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of keyframes and deltas, and stored versus decoded size in characters"""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            "programs": sum(1 for e in entries if not e.removed),
+            "retained": sum(1 for e in entries if e.removed),
+            "keyframes": sum(1 for e in entries if e.code is not None),
+            "deltas": sum(1 for e in entries if e.delta is not None),
+            "stored_size": sum(e.stored_size for e in entries),
+            "code_size": sum(e.size for e in entries if not e.removed),
+            "cached": len(self._cache),
+        }
+
+    def _remember(self, program_id: str, code: str) -> None:
+        """Add decoded code to the LRU cache"""
+        if self.cache_size <= 0:
+            return
+        self._cache[program_id] = code
+        self._cache.move_to_end(program_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _release(self, program_id: str) -> None:
+        """Delete removed entries that nothing depends on, walking up the chain"""
+        while program_id is not None:
+            entry = self._entries.get(program_id)
+            if entry is None or not entry.removed or entry.children:
+                return
+            del self._entries[program_id]
+            base_id = entry.base
+            if base_id is not None and base_id in self._entries:
+                self._entries[base_id].children.discard(program_id)
+            program_id = base_id
+
+    def _replace(self, program_id: str) -> None:
+        """Drop an entry about to be overwritten, turning its dependents into keyframes"""
+        entry = self._entries[program_id]
+        for child_id in list(entry.children):
+            child = self._entries[child_id]
+            child.code = self.get(child_id)
+            child.delta, child.base = None, None
+            self._rebase_depths(child_id, 0)
+        entry.children.clear()
+        del self._entries[program_id]
+        self._cache.pop(program_id, None)
+        if entry.base is not None and entry.base in self._entries:
+            self._entries[entry.base].children.discard(program_id)
+            self._release(entry.base)
+
+    def _rebase_depths(self, program_id: str, depth: int) -> None:
+        """Update delta depths below an entry that became a keyframe"""
+        stack = [(program_id, depth)]
+        while stack:
+            current, current_depth = stack.pop()
+            entry = self._entries[current]
+            entry.depth = current_depth
+            stack.extend((child, current_depth + 1) for child in entry.children)
@@ -32,10 +32,26 @@ class LLMModelConfig:
     timeout: int = None
     retries: int = None
     retry_delay: int = None
+
+    # Connection pool parameters
+    max_connections: Optional[int] = None
+    max_keepalive_connections: Optional[int] = None
+    keepalive_expiry: Optional[float] = None
     
     # Reproducibility
     random_seed: Optional[int] = None
 
+    # Whether the API accepts the `n` parameter for several completions per
+    # request; if not, multiple samples are requested as concurrent calls
+    supports_n: Optional[bool] = None
+
+    # Record/replay of responses: "record" saves the responses of the API to
+    # replay_path, "replay" answers from that file without calling the API
+    replay_mode: Optional[str] = None
+    replay_path: Optional[str] = None
+    replay_match: Optional[str] = None
+    replay_latency: Optional[str] = None
+
 
 @dataclass
 class LLMConfig(LLMModelConfig):
@@ -55,6 +71,20 @@ class LLMConfig(LLMModelConfig):
     retries: int = 3
     retry_delay: int = 5
 
+    # Connection pool parameters
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 30.0
+
+    # Maximum number of concurrent LLM requests (used by the "async" controller)
+    max_concurrency: int = 32
+
+    # Request multiple completions in one call with the `n` parameter
+    supports_n: bool = True
+
+    # Record/replay: match replayed responses by prompt "hash" or in "sequence"
+    replay_match: str = "hash"
+
     # n-model configuration for evolution LLM ensemble
     models: List[LLMModelConfig] = field(default_factory=lambda: [
         LLMModelConfig(name="gpt-4o-mini", weight=0.8),
@@ -103,7 +133,15 @@ class LLMConfig(LLMModelConfig):
             "timeout": self.timeout,
             "retries": self.retries,
             "retry_delay": self.retry_delay,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
             "random_seed": self.random_seed,
+            "supports_n": self.supports_n,
+            "replay_mode": self.replay_mode,
+            "replay_path": self.replay_path,
+            "replay_match": self.replay_match,
+            "replay_latency": self.replay_latency,
         }
         self.update_model_params(shared_config)
 
@@ -148,12 +186,36 @@ class DatabaseConfig:
     # General settings
     db_path: Optional[str] = None  # Path to store database on disk
     in_memory: bool = True
+    # Storage backend for db_path and checkpoints: "json" (one file per program) or
+    # "sqlite" (single WAL-mode database). Loading detects the backend automatically.
+    storage_backend: str = "json"
+    # Write only programs changed since the previous checkpoint, plus a manifest
+    # referencing earlier checkpoints; every full_checkpoint_interval-th is full
+    incremental_checkpoints: bool = False
+    full_checkpoint_interval: int = 10
+    # Load only program summaries; code and artifacts are read from storage on
+    # first access and cached for the lazy_cache_size most recently used programs
+    lazy_load: bool = False
+    lazy_cache_size: int = 1000
+    # Writes a worker's read view of the database may lag behind before it is
+    # copied again (0 = views are always current)
+    read_view_max_staleness: int = 10
+    # Threads reading program files when loading a checkpoint (None = automatic)
+    load_workers: Optional[int] = None
+    # Keep each program's code as a line delta against its parent, in memory and
+    # in checkpoints; a full copy at least every code_keyframe_interval generations
+    code_delta_compression: bool = False
+    code_keyframe_interval: int = 8
+    code_cache_size: int = 256  # Decoded programs kept in memory
 
     # Prompt and response logging to programs/<id>.json
     log_prompts: bool = True
 
     # Evolutionary parameters
     population_size: int = 1000
+    # Evict down to population_size once the population exceeds this size
+    # (None = evict on every add beyond population_size)
+    population_high_watermark: Optional[int] = None
     archive_size: int = 100
     num_islands: int = 5
 
@@ -161,7 +223,9 @@ class DatabaseConfig:
     elite_selection_ratio: float = 0.1
     exploration_ratio: float = 0.2
     exploitation_ratio: float = 0.7
-    diversity_metric: str = "edit_distance"  # Options: "edit_distance", "feature_based"
+    diversity_metric: str = "edit_distance"  # Options: "edit_distance", "minhash"
+    diversity_sketch_size: int = 64  # MinHash permutations per program ("minhash" only)
+    diversity_neighbors: int = 5  # Nearest programs averaged for diversity ("minhash" only)
 
     # Feature map dimensions for MAP-Elites
     feature_dimensions: List[str] = field(default_factory=lambda: ["score", "complexity"])
@@ -189,9 +253,9 @@ class EvaluatorConfig:
     timeout: int = 300  # Maximum evaluation time in seconds
     max_retries: int = 3
 
-    # Resource limits for evaluation
-    memory_limit_mb: Optional[int] = None
-    cpu_limit: Optional[float] = None
+    # Resource limits for evaluation (enforced in worker processes, see backend)
+    memory_limit_mb: Optional[int] = None  # Memory an evaluation may allocate
+    cpu_limit: Optional[float] = None  # CPU seconds a single evaluation may use
 
     # Evaluation strategies
     cascade_evaluation: bool = True
@@ -201,6 +265,19 @@ class EvaluatorConfig:
     parallel_evaluations: int = 1
     distributed: bool = False
 
+    # Execution backend: "thread" runs evaluation functions on a thread pool inside
+    # the controller process, "process" uses a pool of warm worker processes.
+    # Setting a resource limit always selects the "process" backend.
+    backend: str = "thread"
+    process_workers: Optional[int] = None  # Defaults to the number of CPU cores
+
+    # Evaluation result cache keyed by program code hash, so byte-identical
+    # children are not evaluated again
+    cache_evaluations: bool = False
+    cache_max_entries: int = 1000  # Entries kept in memory (LRU)
+    cache_dir: Optional[str] = None  # Persist entries to disk (None = memory only)
+    cache_max_disk_entries: int = 100000
+
     # LLM-based feedback
     use_llm_feedback: bool = False
     llm_feedback_weight: float = 0.1
@@ -217,6 +294,8 @@ class Config:
     # General settings
     max_iterations: int = 10000
     checkpoint_interval: int = 100
+    # Write checkpoints on a background thread; evolution pauses only to snapshot
+    async_checkpoints: bool = True
     log_level: str = "INFO"
     log_dir: Optional[str] = None
     random_seed: Optional[int] = 42
@@ -231,6 +310,13 @@ class Config:
     # Evolution settings
     diff_based_evolution: bool = True
     max_code_length: int = 10000
+    # Completions requested per prompt; each becomes its own child program
+    samples_per_prompt: int = 1
+
+    # Parallel controller: "threaded" runs each iteration on a worker thread,
+    # "async" runs a generation/evaluation pipeline on a single event loop
+    controller: str = "threaded"
+    candidate_queue_size: int = 16  # Generated programs waiting for evaluation ("async" only)
 
     @classmethod
     def from_yaml(cls, path: Union[str, Path]) -> "Config":
@@ -279,6 +365,7 @@ class Config:
             # General settings
             "max_iterations": self.max_iterations,
             "checkpoint_interval": self.checkpoint_interval,
+            "async_checkpoints": self.async_checkpoints,
             "log_level": self.log_level,
             "log_dir": self.log_dir,
             "random_seed": self.random_seed,
@@ -293,6 +380,15 @@ class Config:
                 "timeout": self.llm.timeout,
                 "retries": self.llm.retries,
                 "retry_delay": self.llm.retry_delay,
+                "max_connections": self.llm.max_connections,
+                "max_keepalive_connections": self.llm.max_keepalive_connections,
+                "keepalive_expiry": self.llm.keepalive_expiry,
+                "max_concurrency": self.llm.max_concurrency,
+                "supports_n": self.llm.supports_n,
+                "replay_mode": self.llm.replay_mode,
+                "replay_path": self.llm.replay_path,
+                "replay_match": self.llm.replay_match,
+                "replay_latency": self.llm.replay_latency,
             },
             "prompt": {
                 "template_dir": self.prompt.template_dir,
@@ -309,14 +405,26 @@ class Config:
             "database": {
                 "db_path": self.database.db_path,
                 "in_memory": self.database.in_memory,
+                "storage_backend": self.database.storage_backend,
+                "incremental_checkpoints": self.database.incremental_checkpoints,
+                "full_checkpoint_interval": self.database.full_checkpoint_interval,
+                "lazy_load": self.database.lazy_load,
+                "lazy_cache_size": self.database.lazy_cache_size,
+                "load_workers": self.database.load_workers,
+                "read_view_max_staleness": self.database.read_view_max_staleness,
+                "code_delta_compression": self.database.code_delta_compression,
+                "code_keyframe_interval": self.database.code_keyframe_interval,
+                "code_cache_size": self.database.code_cache_size,
                 "population_size": self.database.population_size,
+                "population_high_watermark": self.database.population_high_watermark,
                 "archive_size": self.database.archive_size,
                 "num_islands": self.database.num_islands,
                 "elite_selection_ratio": self.database.elite_selection_ratio,
                 "exploration_ratio": self.database.exploration_ratio,
                 "exploitation_ratio": self.database.exploitation_ratio,
-                # Note: diversity_metric fixed to "edit_distance"
-                # "diversity_metric": self.database.diversity_metric,
+                "diversity_metric": self.database.diversity_metric,
+                "diversity_sketch_size": self.database.diversity_sketch_size,
+                "diversity_neighbors": self.database.diversity_neighbors,
                 "feature_dimensions": self.database.feature_dimensions,
                 "feature_bins": self.database.feature_bins,
                 "migration_interval": self.database.migration_interval,
@@ -327,20 +435,28 @@ class Config:
             "evaluator": {
                 "timeout": self.evaluator.timeout,
                 "max_retries": self.evaluator.max_retries,
-                # Note: resource limits not implemented
-                # "memory_limit_mb": self.evaluator.memory_limit_mb,
-                # "cpu_limit": self.evaluator.cpu_limit,
+                "memory_limit_mb": self.evaluator.memory_limit_mb,
+                "cpu_limit": self.evaluator.cpu_limit,
                 "cascade_evaluation": self.evaluator.cascade_evaluation,
                 "cascade_thresholds": self.evaluator.cascade_thresholds,
                 "parallel_evaluations": self.evaluator.parallel_evaluations,
+                "backend": self.evaluator.backend,
+                "process_workers": self.evaluator.process_workers,
                 # Note: distributed evaluation not implemented
                 # "distributed": self.evaluator.distributed,
+                "cache_evaluations": self.evaluator.cache_evaluations,
+                "cache_max_entries": self.evaluator.cache_max_entries,
+                "cache_dir": self.evaluator.cache_dir,
+                "cache_max_disk_entries": self.evaluator.cache_max_disk_entries,
                 "use_llm_feedback": self.evaluator.use_llm_feedback,
                 "llm_feedback_weight": self.evaluator.llm_feedback_weight,
             },
             # Evolution settings
             "diff_based_evolution": self.diff_based_evolution,
             "max_code_length": self.max_code_length,
+            "samples_per_prompt": self.samples_per_prompt,
+            "controller": self.controller,
+            "candidate_queue_size": self.candidate_queue_size,
         }
 
     def to_yaml(self, path: Union[str, Path]) -> None:
@@ -3,6 +3,7 @@ Main controller for OpenEvolve
 """
 
 import asyncio
+import json
 import logging
 import os
 import signal
@@ -11,11 +12,18 @@ import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+from openevolve.checkpoint_writer import CheckpointWriter
 from openevolve.config import Config, load_config
 from openevolve.database import Program, ProgramDatabase
+from openevolve.evaluation_cache import EvaluationCache
 from openevolve.evaluator import Evaluator
+from openevolve.iteration import StageTimings
 from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.llm.openai import close_async_clients
+from openevolve.llm.replay import close_replay_stores
+from openevolve.process_pool import shutdown_shared_pools
 from openevolve.prompt.sampler import PromptSampler
+from openevolve.async_parallel import AsyncParallelController
 from openevolve.threaded_parallel import ImprovedParallelController
 from openevolve.utils.code_utils import (
     extract_code_language,
@@ -150,6 +158,16 @@ class OpenEvolve:
             self.config.database.random_seed = self.config.random_seed
 
         self.database = ProgramDatabase(self.config.database)
+        self.checkpoint_writer = CheckpointWriter(
+            self.database, background=self.config.async_checkpoints
+        )
+
+        # Evaluation cache shared by all evaluators of this run
+        self.evaluation_cache = None
+        if self.config.evaluator.cache_evaluations:
+            self.evaluation_cache = EvaluationCache.from_config(
+                self.config.evaluator, evaluation_file
+            )
 
         self.evaluator = Evaluator(
             self.config.evaluator,
@@ -157,6 +175,7 @@ class OpenEvolve:
             self.llm_evaluator_ensemble,
             self.evaluator_prompt_sampler,
             database=self.database,
+            cache=self.evaluation_cache,
         )
         self.evaluation_file = evaluation_file
 
@@ -165,6 +184,9 @@ class OpenEvolve:
         # Initialize improved parallel processing components
         self.parallel_controller = None
 
+        # Per-stage durations of the iterations of the last run
+        self.stage_timings = StageTimings()
+
     def _setup_logging(self) -> None:
         """Set up logging"""
         log_dir = self.config.log_dir or os.path.join(self.output_dir, "logs")
@@ -257,9 +279,22 @@ class OpenEvolve:
 
         # Initialize improved parallel processing
         try:
-            self.parallel_controller = ImprovedParallelController(
-                self.config, self.evaluation_file, self.database
+            if self.config.controller == "async":
+                controller_class = AsyncParallelController
+            elif self.config.controller == "threaded":
+                controller_class = ImprovedParallelController
+            else:
+                raise ValueError(
+                    f"Unknown controller '{self.config.controller}', "
+                    f"expected 'threaded' or 'async'"
+                )
+            self.parallel_controller = controller_class(
+                self.config,
+                self.evaluation_file,
+                self.database,
+                evaluation_cache=self.evaluation_cache,
             )
+            self.stage_timings = self.parallel_controller.stage_timings
             
             # Set up signal handlers for graceful shutdown
             def signal_handler(signum, frame):
@@ -281,6 +316,20 @@ class OpenEvolve:
             if self.parallel_controller:
                 self.parallel_controller.stop()
                 self.parallel_controller = None
+            await close_async_clients()
+            close_replay_stores()
+            shutdown_shared_pools()
+            # Finish writing checkpoints still in flight
+            await asyncio.get_running_loop().run_in_executor(None, self.checkpoint_writer.close)
+            self.checkpoint_writer.log_metrics()
+
+        if self.evaluation_cache:
+            stats = self.evaluation_cache.stats()
+            logger.info(
+                f"Evaluation cache: {stats['hits']} hits ({stats['disk_hits']} from disk), "
+                f"{stats['misses']} misses, hit rate {stats['hit_rate']:.1%}"
+            )
+        self.stage_timings.log_summary(logger)
 
         # Get the best program
         best_program = None
@@ -355,6 +404,9 @@ class OpenEvolve:
         """
         Save a checkpoint
 
+        Captures a snapshot of the database and hands it to the checkpoint
+        writer, which writes it in the background if async_checkpoints is set.
+
         Args:
             iteration: Current iteration number
         """
@@ -363,10 +415,6 @@ class OpenEvolve:
 
         # Create specific checkpoint directory
         checkpoint_path = os.path.join(checkpoint_dir, f"checkpoint_{iteration}")
-        os.makedirs(checkpoint_path, exist_ok=True)
-
-        # Save the database
-        self.database.save(checkpoint_path, iteration)
 
         # Save the best program found so far
         best_program = None
@@ -375,38 +423,37 @@ class OpenEvolve:
         else:
             best_program = self.database.get_best_program()
 
+        files = {}
         if best_program:
-            # Save the best program at this checkpoint
-            best_program_path = os.path.join(checkpoint_path, f"best_program{self.file_extension}")
-            with open(best_program_path, "w") as f:
-                f.write(best_program.code)
-
-            # Save metrics
-            best_program_info_path = os.path.join(checkpoint_path, "best_program_info.json")
-            with open(best_program_info_path, "w") as f:
-                import json
-
-                json.dump(
-                    {
-                        "id": best_program.id,
-                        "generation": best_program.generation,
-                        "iteration": best_program.iteration_found,
-                        "current_iteration": iteration,
-                        "metrics": best_program.metrics,
-                        "language": best_program.language,
-                        "timestamp": best_program.timestamp,
-                        "saved_at": time.time(),
-                    },
-                    f,
-                    indent=2,
-                )
+            # Save the best program and its metrics at this checkpoint
+            files[f"best_program{self.file_extension}"] = best_program.code
+            files["best_program_info.json"] = json.dumps(
+                {
+                    "id": best_program.id,
+                    "generation": best_program.generation,
+                    "iteration": best_program.iteration_found,
+                    "current_iteration": iteration,
+                    "metrics": best_program.metrics,
+                    "language": best_program.language,
+                    "timestamp": best_program.timestamp,
+                    "saved_at": time.time(),
+                },
+                indent=2,
+            )
+
+        snapshot = self.database.snapshot(checkpoint_path, iteration, files)
+        self.checkpoint_writer.submit(snapshot)
 
+        if best_program:
             logger.info(
                 f"Saved best program at checkpoint {iteration} with metrics: "
                 f"{format_metrics_safe(best_program.metrics)}"
             )
 
-        logger.info(f"Saved checkpoint at iteration {iteration} to {checkpoint_path}")
+        logger.info(
+            f"Saved checkpoint at iteration {iteration} to {checkpoint_path} "
+            f"(snapshot took {snapshot.snapshot_time * 1000:.1f} ms)"
+        )
 
     def _load_checkpoint(self, checkpoint_path: str) -> None:
         """Load state from a checkpoint directory"""
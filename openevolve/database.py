@@ -3,20 +3,37 @@ Program database for OpenEvolve
 """
 
 import base64
+import bisect
+import functools
 import json
 import logging
+import math
 import os
 import random
+import threading
 import time
-from dataclasses import asdict, dataclass, field, fields
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import MISSING, asdict, dataclass, field, fields
 # FileLock removed - no longer needed with threaded parallel processing
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
 import numpy as np
 
+from openevolve.code_store import DeltaCodeStore, apply_delta, resolve_code_deltas
 from openevolve.config import DatabaseConfig
+from openevolve.storage import (
+    JSON_DECODER,
+    ProgramStorage,
+    checkpoint_segments,
+    open_storage,
+    staging_directory,
+    write_manifest,
+)
 from openevolve.utils.code_utils import calculate_edit_distance
 from openevolve.utils.metrics_utils import safe_numeric_average
+from openevolve.utils.sketch_utils import MinHasher, SketchIndex, sketch_distance
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +83,34 @@ class Program:
     artifacts_json: Optional[str] = None  # JSON-serialized small artifacts
     artifact_dir: Optional[str] = None  # Path to large artifact files
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Assigning new metrics invalidates the cached fitness
+        if name == "metrics":
+            self.__dict__.pop("_fitness", None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the program's code is held by the program itself"""
+        return "code" in self.__dict__
+
+    @property
+    def fitness(self) -> float:
+        """
+        Average of the numeric metrics, computed once and cached
+
+        The cache is cleared when metrics is reassigned; call invalidate_fitness()
+        after modifying the metrics dict in place.
+        """
+        fitness = self.__dict__.get("_fitness")
+        if fitness is None:
+            fitness = self.__dict__["_fitness"] = safe_numeric_average(self.metrics)
+        return fitness
+
+    def invalidate_fitness(self) -> None:
+        """Clear the cached fitness after in-place changes to metrics"""
+        self.__dict__.pop("_fitness", None)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation"""
         return asdict(self)
@@ -73,18 +118,333 @@ class Program:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Program":
         """Create from dictionary representation"""
-        # Get the valid field names for the Program dataclass
-        valid_fields = {f.name for f in fields(cls)}
-
         # Filter the data to only include valid fields
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
-
-        # Log if we're filtering out any fields
-        if len(filtered_data) != len(data):
+        if data.keys() <= _PROGRAM_FIELDS:
+            filtered_data = data
+        else:
+            filtered_data = {k: v for k, v in data.items() if k in _PROGRAM_FIELDS}
             filtered_out = set(data.keys()) - set(filtered_data.keys())
             logger.debug(f"Filtered out unsupported fields when loading Program: {filtered_out}")
 
-        return cls(**filtered_data)
+        if cls is not Program or not _REQUIRED_FIELDS <= filtered_data.keys():
+            return cls(**filtered_data)
+
+        # Equivalent to cls(**filtered_data), without a __setattr__ call per field,
+        # which dominates the time to load large checkpoints
+        program = cls.__new__(cls)
+        state = program.__dict__
+        state.update(_FIELD_DEFAULTS)
+        for name, factory in _FIELD_FACTORIES:
+            if name not in filtered_data:
+                state[name] = factory()
+        state.update(filtered_data)
+        return program
+
+
+# Valid field names for the Program dataclass, and how Program.from_dict fills
+# in the ones missing from a record
+_PROGRAM_FIELDS = frozenset(f.name for f in fields(Program))
+_REQUIRED_FIELDS = frozenset(
+    f.name for f in fields(Program) if f.default is MISSING and f.default_factory is MISSING
+)
+_FIELD_DEFAULTS = {f.name: f.default for f in fields(Program) if f.default is not MISSING}
+_FIELD_FACTORIES = [
+    (f.name, f.default_factory) for f in fields(Program) if f.default_factory is not MISSING
+]
+
+
+class _LazyField:
+    """
+    Program field that lazily loaded programs fetch from storage on access
+
+    A non-data descriptor: values set on the instance (by __init__ or
+    assignment) take precedence, so it is only consulted for programs whose
+    content was left in storage.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, name: str, default: Any = _MISSING):
+        self.name = name
+        self.default = default
+
+    def __get__(self, program: Optional["Program"], owner: type) -> Any:
+        if program is None:
+            if self.default is self._MISSING:
+                raise AttributeError(self.name)
+            return self.default
+        loader = program.__dict__.get("_loader")
+        if loader is not None:
+            return loader.get_content(program.__dict__["id"], self.name)
+        if self.default is self._MISSING:
+            raise AttributeError(f"'Program' object has no attribute {self.name!r}")
+        return self.default
+
+
+# Program fields that lazily loaded programs fetch on access. Programs whose
+# content is not in __dict__ have a "_loader" providing get_content(id, field).
+LAZY_FIELDS = ("code", "artifacts_json")
+Program.code = _LazyField("code")
+Program.artifacts_json = _LazyField("artifacts_json", None)
+
+
+class LazyContentLoader:
+    """
+    Fetches code and artifacts of lazily loaded programs from storage
+
+    Only the most recently used max_entries programs keep their content in
+    memory, so memory use no longer grows with the size of the population's
+    code. Storages stay open for as long as programs refer to them.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sources: Dict[str, ProgramStorage] = {}
+        self._code_deltas: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def attach(
+        self,
+        program: Program,
+        storage: ProgramStorage,
+        code_delta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Make a program fetch its content from storage
+
+        Args:
+            program: Program whose content is not loaded
+            storage: Storage holding the program's content
+            code_delta: How the code is stored if as a delta ({"base": ..., "ops": ...})
+        """
+        for name in LAZY_FIELDS:
+            program.__dict__.pop(name, None)
+        program.__dict__["_loader"] = self
+        with self._lock:
+            self._sources[program.id] = storage
+            self._cache.pop(program.id, None)
+            if code_delta is not None:
+                self._code_deltas[program.id] = code_delta
+            else:
+                self._code_deltas.pop(program.id, None)
+
+    def get_content(self, program_id: str, name: str) -> Any:
+        """Content field of a program"""
+        return self.get(program_id)[name]
+
+    def get(self, program_id: str) -> Dict[str, Any]:
+        """
+        Content of a program
+
+        Args:
+            program_id: Program ID
+
+        Returns:
+            Dictionary of LAZY_FIELDS values
+        """
+        with self._lock:
+            content = self._cache.get(program_id)
+            if content is not None:
+                self._cache.move_to_end(program_id)
+                self.hits += 1
+                return content
+            storage = self._sources.get(program_id)
+
+        content = storage.read_content(program_id) if storage is not None else None
+        if content is None:
+            raise KeyError(f"Content of program {program_id} not found in storage")
+        code_delta = self._code_deltas.get(program_id)
+        if code_delta is not None:
+            base_code = self.get(code_delta["base"])["code"]
+            content = {**content, "code": apply_delta(base_code, code_delta["ops"])}
+
+        with self._lock:
+            self.misses += 1
+            self._cache[program_id] = content
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return content
+
+    def __len__(self) -> int:
+        """Number of programs whose content is cached"""
+        return len(self._cache)
+
+
+@dataclass
+class DatabaseSnapshot:
+    """
+    Database state captured by ProgramDatabase.snapshot, ready to be written
+
+    Holds shallow copies of the programs to write (with their own metrics and
+    metadata dicts), so the database can keep changing while the snapshot is
+    written on another thread.
+    """
+
+    path: str
+    iteration: int
+    metadata: Dict[str, Any]
+    is_checkpoint: bool = True
+    programs: List[Program] = field(default_factory=list)
+    prompts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    code_deltas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    removed: Optional[Set[str]] = None  # Set for incremental checkpoints
+    segments: List[str] = field(default_factory=list)  # Checkpoints a delta builds on
+    files: Dict[str, str] = field(default_factory=dict)  # Extra files in the checkpoint
+    snapshot_time: float = 0.0  # Seconds taken to capture the snapshot
+    write_time: float = 0.0  # Seconds taken to write it
+
+
+def _write_operation(method: Callable) -> Callable:
+    """
+    Run a ProgramDatabase method that changes the population under the write lock
+
+    Writes are serialized, and each one moves the database to a new version so
+    that read views (ProgramDatabase.read_view) know when they are stale.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "ProgramDatabase", *args: Any, **kwargs: Any) -> Any:
+        with self._index_lock:
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._version += 1
+
+    return wrapper
+
+
+def _locked_operation(method: Callable) -> Callable:
+    """
+    Run a ProgramDatabase method under the write lock without a new version
+
+    For writes that change nothing a read view holds (artifacts, prompts and
+    island generation counters), so they do not make the current view stale.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "ProgramDatabase", *args: Any, **kwargs: Any) -> Any:
+        with self._index_lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def selection_score(program: Program) -> float:
+    """Score used to compare programs: combined_score if present, else fitness"""
+    return program.metrics.get("combined_score", program.fitness)
+
+
+def fitness_array(
+    programs: List[Program], key: Optional[Callable[[Program], float]] = None
+) -> np.ndarray:
+    """
+    Fitness of many programs as a NumPy array
+
+    Args:
+        programs: Programs to score
+        key: Score of a program (default: its fitness)
+
+    Returns:
+        Array with the score of each program, in order
+    """
+    scores = (key(p) for p in programs) if key else (p.fitness for p in programs)
+    return np.fromiter(scores, dtype=float, count=len(programs))
+
+
+def rank_programs(
+    programs: List[Program], reverse: bool = True, key: Optional[Callable[[Program], float]] = None
+) -> List[Program]:
+    """
+    Rank programs by fitness in bulk
+
+    Equivalent to sorted(programs, key=key, reverse=reverse), ties included,
+    but sorts with a single NumPy argsort.
+
+    Args:
+        programs: Programs to rank
+        reverse: Best first if True, worst first otherwise
+        key: Score of a program (default: its fitness)
+
+    Returns:
+        Ranked list of programs
+    """
+    scores = fitness_array(programs, key)
+    order = np.argsort(-scores if reverse else scores, kind="stable")
+    return [programs[i] for i in order]
+
+
+class FitnessIndex:
+    """
+    Program IDs ordered by descending score, maintained incrementally
+
+    Entries are kept in a sorted list keyed by (-score, sequence number), so
+    programs with equal scores stay in insertion order, matching a stable sort
+    over the programs dict. Insertion and removal cost O(log N) comparisons and
+    top-k queries are O(k).
+    """
+
+    def __init__(self, score_fn: Callable[[Program], Optional[float]]):
+        """
+        Args:
+            score_fn: Returns the score of a program, or None to leave it out of the index
+        """
+        self.score_fn = score_fn
+        self._entries: List[Tuple[float, int, str]] = []
+        self._keys: Dict[str, Tuple[float, int, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, program_id: str) -> bool:
+        return program_id in self._keys
+
+    def add(self, program: Program, seq: int) -> None:
+        """Insert or re-score a program"""
+        self.remove(program.id)
+        score = self.score_fn(program)
+        if score is None:
+            return
+        key = (-score, seq, program.id)
+        bisect.insort(self._entries, key)
+        self._keys[program.id] = key
+
+    def remove(self, program_id: str) -> None:
+        """Remove a program if it is indexed"""
+        key = self._keys.pop(program_id, None)
+        if key is not None:
+            del self._entries[bisect.bisect_left(self._entries, key)]
+
+    def top(self, n: int) -> List[str]:
+        """IDs of the n best programs, best first"""
+        return [entry[2] for entry in self._entries[:n]]
+
+    def bottom(self, n: int) -> List[str]:
+        """IDs of the n worst programs, worst first (ties in insertion order)"""
+        result: List[str] = []
+        end = len(self._entries)
+        while end > 0 and len(result) < n:
+            # Collect the run of entries sharing the lowest remaining score
+            start = end - 1
+            while start > 0 and self._entries[start - 1][0] == self._entries[end - 1][0]:
+                start -= 1
+            result.extend(entry[2] for entry in self._entries[start:end])
+            end = start
+        return result[:n]
+
+
+def _metric_score_fn(metric: str) -> Callable[[Program], Optional[float]]:
+    """Score function indexing programs by a single numeric metric"""
+
+    def score(program: Program) -> Optional[float]:
+        value = program.metrics.get(metric)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or math.isnan(value):
+            return None
+        return value
+
+    return score
 
 
 class ProgramDatabase:
@@ -125,6 +485,53 @@ class ProgramDatabase:
         # Track the last iteration number (for resuming)
         self.last_iteration: int = 0
 
+        # Fitness indexes for top-k queries, kept in sync with self.programs. The
+        # lock also serializes writes (see _write_operation)
+        self._index_lock = threading.RLock()
+        self._program_seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._fitness_index = FitnessIndex(lambda p: p.fitness)
+        self._metric_indexes: Dict[str, FitnessIndex] = {}
+
+        # Reverse indexes from program ID to its feature cell and islands
+        self._feature_keys: Dict[str, str] = {}
+        self._program_islands: Dict[str, Set[int]] = {}
+
+        # MinHash sketches for the "diversity" feature dimension
+        self._min_hasher: Optional[MinHasher] = None
+        self._sketch_index: Optional[SketchIndex] = None
+        self._sketch_distances: Dict[str, float] = {}  # Last measured, for read views
+        if config.diversity_metric == "minhash":
+            self._min_hasher = MinHasher(num_perm=config.diversity_sketch_size)
+            self._sketch_index = SketchIndex(config.diversity_sketch_size)
+
+        # Parent-delta compressed code of programs in the population
+        self._code_store: Optional[DeltaCodeStore] = None
+        if config.code_delta_compression:
+            self._code_store = DeltaCodeStore(
+                keyframe_interval=config.code_keyframe_interval,
+                cache_size=config.code_cache_size,
+            )
+
+        # Storage for config.db_path, opened on first write
+        self._db_storage: Optional[ProgramStorage] = None
+
+        # Changes since the last save, written by incremental checkpoints
+        self._dirty_ids: Set[str] = set()
+        self._removed_ids: Set[str] = set()
+        # Checkpoint directories the next incremental checkpoint builds on
+        # (the last full checkpoint followed by its deltas)
+        self._checkpoint_segments: List[str] = []
+        # Checkpoints snapshotted but not yet written, and those whose write failed
+        self._pending_checkpoints: Set[str] = set()
+        self._failed_checkpoints: Set[str] = set()
+
+        # Incremented by every write; read views record the version they copy
+        self._version = 0
+        self._read_view: Optional["DatabaseView"] = None
+        # Serializes building read views, which happens outside the write lock
+        self._view_lock = threading.Lock()
+
         # Load database from disk if path is provided
         if config.db_path and os.path.exists(config.db_path):
             self.load(config.db_path)
@@ -141,6 +548,7 @@ class ProgramDatabase:
 
         logger.info(f"Initialized program database with {len(self.programs)} programs")
 
+    @_write_operation
     def add(
         self, program: Program, iteration: int = None, target_island: Optional[int] = None
     ) -> str:
@@ -162,7 +570,12 @@ class ProgramDatabase:
             # Update last_iteration if needed
             self.last_iteration = max(self.last_iteration, iteration)
 
-        self.programs[program.id] = program
+        with self._index_lock:
+            self.programs[program.id] = program
+            self._index_program(program)
+            if self._sketch_index is not None:
+                # Sketched once per inserted program (or new code under the same ID)
+                self._sketch_index.add(program.id, self._min_hasher.sketch(program.code))
 
         # Calculate feature coordinates for MAP-Elites
         feature_coords = self._calculate_feature_coords(program)
@@ -185,12 +598,12 @@ class ProgramDatabase:
                 should_replace = self._is_better(program, self.programs[existing_program_id])
 
         if should_replace:
-            self.feature_map[feature_key] = program.id
+            self._set_feature_cell(feature_key, program.id)
 
         # Add to specific island (not random!)
         island_idx = target_island if target_island is not None else self.current_island
         island_idx = island_idx % len(self.islands)  # Ensure valid island
-        self.islands[island_idx].add(program.id)
+        self._add_to_island(island_idx, program.id)
 
         # Track which island this program belongs to
         program.metadata["island"] = island_idx
@@ -224,6 +637,35 @@ class ProgramDatabase:
         """
         return self.programs.get(program_id)
 
+    @property
+    def version(self) -> int:
+        """Number of writes so far"""
+        return self._version
+
+    def read_view(self) -> "DatabaseView":
+        """
+        Immutable snapshot of the population for reading without locks
+
+        Worker threads sample from the view while the controller keeps writing to
+        the database. The view is shared between readers and copied again once it
+        is more than read_view_max_staleness writes behind the database. Writers
+        are only held up while the view copies the index structures, not while it
+        filters them and builds its rankings.
+
+        Returns:
+            Read view at most read_view_max_staleness versions old
+        """
+        view = self._read_view
+        if view is None or self._version - view.version > self.config.read_view_max_staleness:
+            with self._view_lock:
+                view = self._read_view
+                if (
+                    view is None
+                    or self._version - view.version > self.config.read_view_max_staleness
+                ):
+                    view = self._read_view = DatabaseView(self)
+        return view
+
     def sample(self) -> Tuple[Program, List[Program]]:
         """
         Sample a program and inspirations for the next evolution step
@@ -259,28 +701,18 @@ class ProgramDatabase:
             return self.programs[self.best_program_id]
 
         if metric:
-            # Sort by specific metric
-            sorted_programs = sorted(
-                [p for p in self.programs.values() if metric in p.metrics],
-                key=lambda p: p.metrics[metric],
-                reverse=True,
-            )
+            # Best by specific metric
+            sorted_programs = self.get_top_programs(1, metric=metric)
             if sorted_programs:
                 logger.debug(f"Found best program by metric '{metric}': {sorted_programs[0].id}")
-        elif self.programs and all("combined_score" in p.metrics for p in self.programs.values()):
-            # Sort by combined_score if it exists (preferred method)
-            sorted_programs = sorted(
-                self.programs.values(), key=lambda p: p.metrics["combined_score"], reverse=True
-            )
+        elif len(self._get_fitness_index("combined_score")) == len(self.programs):
+            # Best by combined_score if every program has it (preferred method)
+            sorted_programs = self.get_top_programs(1, metric="combined_score")
             if sorted_programs:
                 logger.debug(f"Found best program by combined_score: {sorted_programs[0].id}")
         else:
-            # Sort by average of all numeric metrics as fallback
-            sorted_programs = sorted(
-                self.programs.values(),
-                key=lambda p: safe_numeric_average(p.metrics),
-                reverse=True,
-            )
+            # Best by average of all numeric metrics as fallback
+            sorted_programs = self.get_top_programs(1)
             if sorted_programs:
                 logger.debug(f"Found best program by average metrics: {sorted_programs[0].id}")
 
@@ -321,85 +753,436 @@ class ProgramDatabase:
         if not self.programs:
             return []
 
-        if metric:
-            # Sort by specific metric
-            sorted_programs = sorted(
-                [p for p in self.programs.values() if metric in p.metrics],
-                key=lambda p: p.metrics[metric],
-                reverse=True,
-            )
-        else:
-            # Sort by average of all numeric metrics
-            sorted_programs = sorted(
-                self.programs.values(),
-                key=lambda p: safe_numeric_average(p.metrics),
-                reverse=True,
-            )
+        with self._index_lock:
+            index = self._get_fitness_index(metric)
+            return [self.programs[program_id] for program_id in index.top(n)]
+
+    def _get_fitness_index(self, metric: Optional[str] = None) -> FitnessIndex:
+        """
+        Get the fitness index for a metric, building it on first use
 
-        return sorted_programs[:n]
+        Args:
+            metric: Metric to rank by (average of numeric metrics if None)
+
+        Returns:
+            Fitness index in sync with self.programs
+        """
+        with self._index_lock:
+            # Programs added or removed without going through the database
+            if len(self._program_seq) != len(self.programs):
+                self._rebuild_fitness_indexes()
+
+            if metric is None:
+                return self._fitness_index
+
+            index = self._metric_indexes.get(metric)
+            if index is None:
+                index = FitnessIndex(_metric_score_fn(metric))
+                for program in self.programs.values():
+                    index.add(program, self._program_seq[program.id])
+                self._metric_indexes[metric] = index
+            return index
+
+    def _index_program(self, program: Program) -> None:
+        """Add a program (or update its score) in all fitness indexes"""
+        with self._index_lock:
+            seq = self._program_seq.get(program.id)
+            if seq is None:
+                seq = self._program_seq[program.id] = self._next_seq
+                self._next_seq += 1
+            self._fitness_index.add(program, seq)
+            for index in self._metric_indexes.values():
+                index.add(program, seq)
+            self._compress_code(program)
+            self._dirty_ids.add(program.id)
+            self._removed_ids.discard(program.id)
+
+    def _compress_code(self, program: Program) -> None:
+        """Move a program's code into the delta code store, if enabled"""
+        if self._code_store is None or "code" not in program.__dict__:
+            return
+        self._code_store.put(program.id, program.__dict__.pop("code"), program.parent_id)
+        program.__dict__["_loader"] = self._code_store
+
+    def _unindex_program(self, program_id: str) -> None:
+        """Remove a program from all fitness indexes"""
+        with self._index_lock:
+            self._program_seq.pop(program_id, None)
+            self._fitness_index.remove(program_id)
+            for index in self._metric_indexes.values():
+                index.remove(program_id)
+            if self._sketch_index is not None:
+                self._sketch_index.remove(program_id)
+                self._sketch_distances.pop(program_id, None)
+            self._dirty_ids.discard(program_id)
+            self._removed_ids.add(program_id)
+
+    def _rebuild_fitness_indexes(self) -> None:
+        """Rebuild the fitness indexes from self.programs"""
+        with self._index_lock:
+            self._program_seq = {}
+            self._next_seq = 0
+            self._fitness_index = FitnessIndex(self._fitness_index.score_fn)
+            self._metric_indexes = {}
+            if self._sketch_index is not None:
+                self._sketch_index = SketchIndex(self._sketch_index.num_perm)
+                self._sketch_distances = {}
+            for program in self.programs.values():
+                self._index_program(program)
 
     def save(self, path: Optional[str] = None, iteration: int = 0) -> None:
         """
         Save the database to disk
 
+        With incremental_checkpoints enabled, saving to a new checkpoint directory
+        writes only the programs added or changed since the previous checkpoint,
+        plus a manifest listing the earlier checkpoints it builds on. Every
+        full_checkpoint_interval-th checkpoint is written in full.
+
+        Args:
+            path: Path to save to (uses config.db_path if None)
+            iteration: Current iteration number
+        """
+        snapshot = self.snapshot(path, iteration)
+        if snapshot is not None:
+            self.write_snapshot(snapshot)
+
+    def snapshot(
+        self,
+        path: Optional[str] = None,
+        iteration: int = 0,
+        files: Optional[Dict[str, str]] = None,
+    ) -> Optional["DatabaseSnapshot"]:
+        """
+        Capture the state to save, for writing later with write_snapshot
+
+        Copies every program to write (all of them for a full checkpoint, the
+        changed ones for a delta) and the index metadata while holding the write
+        lock, so evolution pauses for O(N) work per full checkpoint. With
+        code_delta_compression, each copied program's code is also resolved
+        under the lock. Serializing and writing are left to write_snapshot,
+        which may run on another thread.
+
         Args:
             path: Path to save to (uses config.db_path if None)
             iteration: Current iteration number
+            files: Extra files to write into a checkpoint directory (name to content)
+
+        Returns:
+            Snapshot, or None if there is no path to save to
         """
         save_path = path or self.config.db_path
         if not save_path:
             logger.warning("No database path specified, skipping save")
-            return
+            return None
 
-        # create directory if it doesn't exist
-        os.makedirs(save_path, exist_ok=True)
+        start_time = time.perf_counter()
+        # db_path is kept up to date on every add and is not part of the checkpoint chain
+        is_checkpoint = save_path != self.config.db_path
 
-        # Save each program
-        for program in self.programs.values():
-            prompts = None
-            if (
-                self.config.log_prompts
-                and self.prompts_by_program
-                and program.id in self.prompts_by_program
-            ):
-                prompts = self.prompts_by_program[program.id]
-            self._save_program(program, save_path, prompts=prompts)
+        with self._index_lock:
+            incremental = is_checkpoint and self._can_save_delta(save_path)
+            snapshot = self._capture_snapshot(
+                save_path, iteration, files, is_checkpoint, incremental
+            )
+
+            if is_checkpoint:
+                checkpoint_path = os.path.abspath(save_path)
+                if incremental:
+                    snapshot.removed = set(self._removed_ids)
+                    snapshot.segments = list(self._checkpoint_segments)
+                    self._checkpoint_segments.append(checkpoint_path)
+                else:
+                    self._checkpoint_segments = [checkpoint_path]
+                self._pending_checkpoints.add(checkpoint_path)
+                self._dirty_ids.clear()
+                self._removed_ids.clear()
+
+        snapshot.snapshot_time = time.perf_counter() - start_time
+        return snapshot
+
+    def _capture_snapshot(
+        self,
+        save_path: str,
+        iteration: int,
+        files: Optional[Dict[str, str]],
+        is_checkpoint: bool,
+        incremental: bool,
+    ) -> "DatabaseSnapshot":
+        """
+        Copy the metadata and the programs to write; the caller holds the write lock
+
+        Args:
+            save_path: Path to save to
+            iteration: Current iteration number
+            files: Extra files to write into a checkpoint directory
+            is_checkpoint: Whether the snapshot is a checkpoint (not db_path)
+            incremental: Copy only the programs changed since the last checkpoint
 
-        # Save metadata
+        Returns:
+            Snapshot without checkpoint chain information
+        """
         metadata = {
-            "feature_map": self.feature_map,
+            "feature_map": dict(self.feature_map),
             "islands": [list(island) for island in self.islands],
             "archive": list(self.archive),
             "best_program_id": self.best_program_id,
             "last_iteration": iteration or self.last_iteration,
             "current_island": self.current_island,
-            "island_generations": self.island_generations,
+            "island_generations": list(self.island_generations),
             "last_migration_generation": self.last_migration_generation,
         }
 
-        with open(os.path.join(save_path, "metadata.json"), "w") as f:
-            json.dump(metadata, f)
+        if incremental:
+            programs = [self.programs[pid] for pid in self._dirty_ids if pid in self.programs]
+        else:
+            programs = list(self.programs.values())
+
+        snapshot = DatabaseSnapshot(
+            path=save_path,
+            iteration=iteration or self.last_iteration,
+            metadata=metadata,
+            is_checkpoint=is_checkpoint,
+            files=dict(files or {}),
+        )
+        for program in programs:
+            copy, code_delta = self._snapshot_program(program)
+            snapshot.programs.append(copy)
+            if code_delta is not None:
+                snapshot.code_deltas[program.id] = code_delta
+            if self.config.log_prompts and self.prompts_by_program:
+                prompts = self.prompts_by_program.get(program.id)
+                if prompts:
+                    snapshot.prompts[program.id] = dict(prompts)
+        return snapshot
+
+    def _rebase_failed_delta(self, snapshot: "DatabaseSnapshot") -> None:
+        """
+        Turn a delta snapshot into a full one if a checkpoint it builds on failed
+
+        A delta snapshotted while an earlier checkpoint was still queued names
+        that checkpoint as a segment; if writing it failed, the delta could never
+        be loaded. It is replaced by a full snapshot of the current population,
+        without changing what later checkpoints build on.
+
+        Args:
+            snapshot: Snapshot about to be written, updated in place
+        """
+        with self._index_lock:
+            failed = [
+                segment for segment in snapshot.segments if segment in self._failed_checkpoints
+            ]
+            if not failed:
+                return
+            logger.warning(
+                f"Checkpoint {snapshot.path} builds on {failed[-1]}, which failed to write; "
+                "writing it in full instead"
+            )
+            start_time = time.perf_counter()
+            full = self._capture_snapshot(
+                snapshot.path, snapshot.iteration, snapshot.files, True, incremental=False
+            )
+            full.snapshot_time = snapshot.snapshot_time + time.perf_counter() - start_time
+        for f in fields(DatabaseSnapshot):
+            setattr(snapshot, f.name, getattr(full, f.name))
+
+    def write_snapshot(self, snapshot: "DatabaseSnapshot") -> None:
+        """
+        Write a snapshot taken by snapshot() to disk
+
+        Checkpoints are written into a staging directory that atomically
+        replaces the checkpoint directory once complete. Needs no locks, so it
+        can run on a background thread while evolution continues.
+
+        Args:
+            snapshot: Snapshot to write
+        """
+        if snapshot.removed is not None:
+            self._rebase_failed_delta(snapshot)
+
+        start_time = time.perf_counter()
+        records = (
+            self._program_record(
+                program,
+                snapshot.prompts.get(program.id),
+                snapshot.code_deltas.get(program.id),
+            )
+            for program in snapshot.programs
+        )
+
+        if not snapshot.is_checkpoint:
+            with self._storage(snapshot.path) as storage:
+                storage.write_programs(records)
+                storage.write_metadata(snapshot.metadata)
+            snapshot.write_time = time.perf_counter() - start_time
+            logger.info(f"Saved database with {len(snapshot.programs)} programs to {snapshot.path}")
+            return
+
+        checkpoint_path = os.path.abspath(snapshot.path)
+        try:
+            with staging_directory(snapshot.path) as staging:
+                with open_storage(staging, self.config.storage_backend) as storage:
+                    storage.write_programs(records)
+                    storage.write_metadata(snapshot.metadata)
+                if snapshot.removed is not None:
+                    write_manifest(staging, snapshot.segments, snapshot.removed, snapshot.iteration)
+                for name, content in snapshot.files.items():
+                    with open(os.path.join(staging, name), "w") as f:
+                        f.write(content)
+        except BaseException:
+            # The snapshot's programs are no longer marked as changed, so the next
+            # checkpoint cannot be a delta on top of this one, and queued deltas
+            # that already build on it are written in full
+            with self._index_lock:
+                self._checkpoint_segments = []
+                self._failed_checkpoints.add(checkpoint_path)
+            raise
+        finally:
+            with self._index_lock:
+                self._pending_checkpoints.discard(checkpoint_path)
+        with self._index_lock:
+            self._failed_checkpoints.discard(checkpoint_path)
+
+        snapshot.write_time = time.perf_counter() - start_time
+        if snapshot.removed is not None:
+            logger.info(
+                f"Saved incremental checkpoint with {len(snapshot.programs)} changed and "
+                f"{len(snapshot.removed)} removed programs to {snapshot.path}"
+            )
+        else:
+            logger.info(f"Saved database with {len(snapshot.programs)} programs to {snapshot.path}")
+
+    def _snapshot_program(self, program: Program) -> Tuple[Program, Optional[Dict[str, Any]]]:
+        """
+        Copy of a program that later changes to the program do not affect
+
+        Args:
+            program: Program in the database
+
+        Returns:
+            (copy, code delta to store instead of the code, if any)
+        """
+        copy = Program.__new__(Program)
+        copy.__dict__.update(program.__dict__)
+        copy.__dict__["metrics"] = dict(program.metrics)
+        copy.__dict__["metadata"] = dict(program.metadata)
+
+        code_delta = None
+        if self._code_store is not None and copy.__dict__.get("_loader") is self._code_store:
+            # Resolve now: the store may drop the program before the copy is written
+            del copy.__dict__["_loader"]
+            code_delta = self._code_delta(program.id)
+            if code_delta is not None:
+                copy.__dict__["code"] = ""
+            else:
+                copy.__dict__["code"] = self._code_store.get(program.id)
+        return copy, code_delta
+
+    def _code_delta(self, program_id: str) -> Optional[Dict[str, Any]]:
+        """How to store a program's code as a delta, if its base is in the population"""
+        if self._code_store is None:
+            return None
+        delta = self._code_store.delta(program_id)
+        if delta is None or delta[0] not in self.programs:
+            return None
+        return {"base": delta[0], "ops": delta[1]}
 
-        logger.info(f"Saved database with {len(self.programs)} programs to {save_path}")
+    def _can_save_delta(self, path: str) -> bool:
+        """Whether a checkpoint at path can be written as a delta of the previous one"""
+        if not self.config.incremental_checkpoints or not self._checkpoint_segments:
+            return False
+        if len(self._checkpoint_segments) >= max(self.config.full_checkpoint_interval, 1):
+            return False
+        if os.path.abspath(path) in self._checkpoint_segments:
+            return False
+        return all(
+            segment in self._pending_checkpoints or os.path.isdir(segment)
+            for segment in self._checkpoint_segments
+        )
 
+    @_write_operation
     def load(self, path: str) -> None:
         """
         Load the database from disk
 
         Args:
-            path: Path to load from
+            path: Path to load from (a full or incremental checkpoint)
         """
         if not os.path.exists(path):
             logger.warning(f"Database path {path} does not exist, skipping load")
             return
 
-        # Load metadata first
-        metadata_path = os.path.join(path, "metadata.json")
-        saved_islands = []
-        if os.path.exists(metadata_path):
-            with open(metadata_path, "r") as f:
-                metadata = json.load(f)
+        start_time = time.perf_counter()
+
+        # Lazily loaded programs keep reading content from the storages they came from
+        loader = LazyContentLoader(self.config.lazy_cache_size) if self.config.lazy_load else None
+
+        # Code stored as deltas against other programs, and removed programs that
+        # may still be the base of such a delta
+        code_deltas: Dict[str, Dict[str, Any]] = {}
+        retired: Dict[str, Program] = {}
+
+        segments = checkpoint_segments(path)
+        for segment, removed in segments:
+            for program_id in list(self.programs) if removed is None else removed:
+                if program_id in self.programs:
+                    retired[program_id] = self.programs.pop(program_id)
+            storage = open_storage(segment, load_workers=self.config.load_workers)
+            try:
+                if segment == path:
+                    saved_islands = self._load_metadata(storage)
+                self._load_programs(storage, loader, code_deltas)
+            finally:
+                if loader is None:
+                    storage.close()
 
+        if code_deltas and loader is None:
+            self._decode_code_deltas(code_deltas, retired)
+
+        # Keep lineages together in the code store: parents before children
+        if self._code_store is not None:
+            for program in sorted(self.programs.values(), key=lambda p: p.generation):
+                self._compress_code(program)
+
+        # Reconstruct island assignments from metadata
+        self._reconstruct_islands(saved_islands)
+        self._rebuild_fitness_indexes()
+        self._rebuild_reverse_indexes()
+
+        # Ensure island_generations list has correct length
+        if len(self.island_generations) != len(self.islands):
+            self.island_generations = [0] * len(self.islands)
+
+        # Later incremental checkpoints build on the loaded one
+        self._dirty_ids.clear()
+        self._removed_ids.clear()
+        if path != self.config.db_path:
+            self._checkpoint_segments = [os.path.abspath(segment) for segment, _ in segments]
+
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            f"Loaded database with {len(self.programs)} programs from {path} "
+            f"({storage.backend} storage, {len(segments)} segment(s)) in {elapsed:.2f}s "
+            f"({len(self.programs) / max(elapsed, 1e-9):.0f} programs/s, "
+            f"{JSON_DECODER} decoder)"
+        )
+
+        # Log the reconstructed island status
+        self.log_island_status()
+
+    def _load_metadata(self, storage: ProgramStorage) -> List[List[str]]:
+        """
+        Load database metadata from storage
+
+        Args:
+            storage: Storage to read from
+
+        Returns:
+            Saved island assignments (program IDs per island)
+        """
+        saved_islands = []
+        metadata = storage.read_metadata()
+        if metadata is not None:
             self.feature_map = metadata.get("feature_map", {})
             saved_islands = metadata.get("islands", [])
             self.archive = set(metadata.get("archive", []))
@@ -411,32 +1194,63 @@ class ProgramDatabase:
 
             logger.info(f"Loaded database metadata with last_iteration={self.last_iteration}")
 
-        # Load programs
-        programs_dir = os.path.join(path, "programs")
-        if os.path.exists(programs_dir):
-            for program_file in os.listdir(programs_dir):
-                if program_file.endswith(".json"):
-                    program_path = os.path.join(programs_dir, program_file)
-                    try:
-                        with open(program_path, "r") as f:
-                            program_data = json.load(f)
+        return saved_islands
 
-                        program = Program.from_dict(program_data)
-                        self.programs[program.id] = program
-                    except Exception as e:
-                        logger.warning(f"Error loading program {program_file}: {str(e)}")
+    def _load_programs(
+        self,
+        storage: ProgramStorage,
+        loader: Optional[LazyContentLoader] = None,
+        code_deltas: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Load all programs from storage, replacing programs with the same ID
 
-        # Reconstruct island assignments from metadata
-        self._reconstruct_islands(saved_islands)
+        Args:
+            storage: Storage to read from
+            loader: If given, load only program summaries and fetch code on demand
+            code_deltas: Collects the code deltas of programs stored as deltas
+        """
+        if loader is not None:
+            records = storage.iter_program_summaries()
+        else:
+            records = storage.iter_programs()
+        for program_data in records:
+            try:
+                code_delta = program_data.get("code_delta")
+                if code_deltas is not None:
+                    if code_delta is not None:
+                        code_deltas[program_data["id"]] = code_delta
+                    else:
+                        code_deltas.pop(program_data["id"], None)
+
+                if loader is not None:
+                    program = Program.from_dict({**program_data, "code": ""})
+                    loader.attach(program, storage, code_delta)
+                else:
+                    program = Program.from_dict(program_data)
+                self.programs[program.id] = program
+            except Exception as e:
+                logger.warning(f"Error loading program {program_data.get('id')}: {str(e)}")
 
-        # Ensure island_generations list has correct length
-        if len(self.island_generations) != len(self.islands):
-            self.island_generations = [0] * len(self.islands)
+    def _decode_code_deltas(
+        self, code_deltas: Dict[str, Dict[str, Any]], retired: Dict[str, Program]
+    ) -> None:
+        """
+        Restore the code of programs that were saved as deltas
 
-        logger.info(f"Loaded database with {len(self.programs)} programs from {path}")
+        Args:
+            code_deltas: Program ID to {"base": ..., "ops": ...}
+            retired: Programs removed while loading, which may be delta bases
+        """
 
-        # Log the reconstructed island status
-        self.log_island_status()
+        def get_code(program_id: str) -> Optional[str]:
+            program = self.programs.get(program_id) or retired.get(program_id)
+            return program.code if program is not None else None
+
+        decoded = resolve_code_deltas(code_deltas, get_code)
+        for program_id, code in decoded.items():
+            if program_id in self.programs:
+                self.programs[program_id].code = code
 
     def _reconstruct_islands(self, saved_islands: List[List[str]]) -> None:
         """
@@ -542,18 +1356,61 @@ class ProgramDatabase:
         if not save_path:
             return
 
-        # Create programs directory if it doesn't exist
-        programs_dir = os.path.join(save_path, "programs")
-        os.makedirs(programs_dir, exist_ok=True)
+        if prompts is None and self.config.log_prompts and self.prompts_by_program:
+            prompts = self.prompts_by_program.get(program.id)
+        with self._storage(save_path) as storage:
+            storage.write_programs(
+                [self._program_record(program, prompts, self._code_delta(program.id))]
+            )
 
-        # Save program
+    def _program_record(
+        self,
+        program: Program,
+        prompts: Optional[Dict[str, Dict[str, str]]] = None,
+        code_delta: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the storage record of a program
+
+        Args:
+            program: Program to store
+            prompts: Prompts to store with the program
+            code_delta: Delta to store instead of the program's code
+
+        Returns:
+            Program dictionary, with prompts if any are available
+        """
         program_dict = program.to_dict()
+        if code_delta is not None:
+            program_dict["code"] = ""
+            program_dict["code_delta"] = code_delta
         if prompts:
             program_dict["prompts"] = prompts
-        program_path = os.path.join(programs_dir, f"{program.id}.json")
+        return program_dict
+
+    @contextmanager
+    def _storage(self, path: str) -> Iterator[ProgramStorage]:
+        """
+        Storage for writing to a directory with the configured backend
 
-        with open(program_path, "w") as f:
-            json.dump(program_dict, f)
+        The storage for config.db_path stays open between writes; storage for
+        other paths (checkpoints) is closed on exit.
+
+        Args:
+            path: Database or checkpoint directory
+        """
+        if path == self.config.db_path:
+            if self._db_storage is None:
+                os.makedirs(path, exist_ok=True)
+                self._db_storage = open_storage(path, self.config.storage_backend)
+            yield self._db_storage
+        else:
+            os.makedirs(path, exist_ok=True)
+            storage = open_storage(path, self.config.storage_backend)
+            try:
+                yield storage
+            finally:
+                storage.close()
 
     def _calculate_feature_coords(self, program: Program) -> List[int]:
         """
@@ -574,10 +1431,14 @@ class ProgramDatabase:
                 bin_idx = min(int(complexity / 1000 * self.feature_bins), self.feature_bins - 1)
                 coords.append(bin_idx)
             elif dim == "diversity":
-                # Use average edit distance to other programs
                 if len(self.programs) < 5:
                     bin_idx = 0
+                elif self._sketch_index is not None:
+                    # Use estimated distance to the nearest programs (0.0 - 1.0)
+                    distance = self._sketch_distance(program)
+                    bin_idx = min(int(distance * self.feature_bins), self.feature_bins - 1)
                 else:
+                    # Use average edit distance to other programs
                     sample_programs = random.sample(
                         list(self.programs.values()), min(5, len(self.programs))
                     )
@@ -594,7 +1455,7 @@ class ProgramDatabase:
                 if not program.metrics:
                     bin_idx = 0
                 else:
-                    avg_score = safe_numeric_average(program.metrics)
+                    avg_score = program.fitness
                     bin_idx = min(int(avg_score * self.feature_bins), self.feature_bins - 1)
                 coords.append(bin_idx)
             elif dim in program.metrics:
@@ -611,6 +1472,48 @@ class ProgramDatabase:
         )
         return coords
 
+    def _sketch_distance(self, program: Program) -> float:
+        """
+        Estimated distance from a program to its nearest neighbours in the population
+
+        Args:
+            program: Program to measure
+
+        Returns:
+            Average MinHash distance to the diversity_neighbors most similar programs
+        """
+        with self._index_lock:
+            # Make sure the sketch index matches the population
+            self._get_fitness_index()
+            if len(self._sketch_index) < len(self.programs):
+                self._sketch_missing_programs()
+            sketch = self._sketch_index.get(program.id)
+            if sketch is None:
+                sketch = self._min_hasher.sketch(program.code)
+            distance = self._sketch_index.nearest_distance(
+                sketch, k=self.config.diversity_neighbors, exclude=program.id
+            )
+            self._sketch_distances[program.id] = distance
+            return distance
+
+    def _sketch_missing_programs(self) -> None:
+        """
+        Sketch the programs the sketch index does not hold yet
+
+        Loading a checkpoint does not sketch programs, so lazily loaded code is
+        only read (and delta-compressed code only decoded) once diversity is
+        first measured.
+        """
+        start_time = time.perf_counter()
+        missing = [pid for pid in self.programs if pid not in self._sketch_index]
+        for program_id in missing:
+            self._sketch_index.add(
+                program_id, self._min_hasher.sketch(self.programs[program_id].code)
+            )
+        logger.debug(
+            f"Sketched {len(missing)} programs in {time.perf_counter() - start_time:.2f}s"
+        )
+
     def _feature_coords_to_key(self, coords: List[int]) -> str:
         """
         Convert feature coordinates to a string key
@@ -649,10 +1552,7 @@ class ProgramDatabase:
             return program1.metrics["combined_score"] > program2.metrics["combined_score"]
 
         # Fallback to average of all numeric metrics
-        avg1 = safe_numeric_average(program1.metrics)
-        avg2 = safe_numeric_average(program2.metrics)
-
-        return avg1 > avg2
+        return program1.fitness > program2.fitness
 
     def _update_archive(self, program: Program) -> None:
         """
@@ -688,9 +1588,7 @@ class ProgramDatabase:
 
         # Find worst program among valid programs
         if valid_archive_programs:
-            worst_program = min(
-                valid_archive_programs, key=lambda p: safe_numeric_average(p.metrics)
-            )
+            worst_program = min(valid_archive_programs, key=lambda p: p.fitness)
 
             # Replace if new program is better
             if self._is_better(program, worst_program):
@@ -760,16 +1658,7 @@ class ProgramDatabase:
 
         if not current_island_programs:
             # If current island is empty, initialize with best program or random program
-            if self.best_program_id and self.best_program_id in self.programs:
-                # Clone best program to current island
-                best_program = self.programs[self.best_program_id]
-                self.islands[self.current_island].add(self.best_program_id)
-                best_program.metadata["island"] = self.current_island
-                logger.debug(f"Initialized empty island {self.current_island} with best program")
-                return best_program
-            else:
-                # Use any available program
-                return next(iter(self.programs.values()))
+            return self._seed_empty_island()
 
         # Clean up stale references and sample from current island
         valid_programs = [pid for pid in current_island_programs if pid in self.programs]
@@ -788,18 +1677,29 @@ class ProgramDatabase:
             logger.warning(
                 f"Island {self.current_island} has no valid programs after cleanup, reinitializing"
             )
-            if self.best_program_id and self.best_program_id in self.programs:
-                best_program = self.programs[self.best_program_id]
-                self.islands[self.current_island].add(self.best_program_id)
-                best_program.metadata["island"] = self.current_island
-                return best_program
-            else:
-                return next(iter(self.programs.values()))
+            return self._seed_empty_island()
 
         # Sample from valid programs
         parent_id = random.choice(valid_programs)
         return self.programs[parent_id]
 
+    def _seed_empty_island(self) -> Program:
+        """
+        Parent for an empty current island: the best program, which joins the island
+
+        Returns:
+            Best program, or any program if there is no best program
+        """
+        if self.best_program_id and self.best_program_id in self.programs:
+            # Clone best program to current island
+            best_program = self.programs[self.best_program_id]
+            self._add_to_island(self.current_island, self.best_program_id)
+            best_program.metadata["island"] = self.current_island
+            logger.debug(f"Initialized empty island {self.current_island} with best program")
+            return best_program
+        # Use any available program
+        return next(iter(self.programs.values()))
+
     def _sample_exploitation_parent(self) -> Program:
         """
         Sample a parent for exploitation (from archive/elite programs)
@@ -944,84 +1844,98 @@ class ProgramDatabase:
         """
         Enforce the population size limit by removing worst programs if needed
         """
-        if len(self.programs) <= self.config.population_size:
+        high_watermark = self.config.population_high_watermark or self.config.population_size
+        if len(self.programs) <= max(high_watermark, self.config.population_size):
             return
 
-        # Calculate how many programs to remove
+        # Evict down to population_size in one pass
         num_to_remove = len(self.programs) - self.config.population_size
 
         logger.info(
-            f"Population size ({len(self.programs)}) exceeds limit ({self.config.population_size}), removing {num_to_remove} programs"
+            f"Population size ({len(self.programs)}) exceeds limit ({high_watermark}), removing {num_to_remove} programs"
         )
 
-        # Get programs sorted by fitness (worst first)
-        all_programs = list(self.programs.values())
-
-        # Sort by average metric (worst first)
-        sorted_programs = sorted(
-            all_programs,
-            key=lambda p: safe_numeric_average(p.metrics),
-        )
-
-        # Remove worst programs, but never remove the best program
-        programs_to_remove = []
-        for program in sorted_programs:
-            if len(programs_to_remove) >= num_to_remove:
-                break
-            # Don't remove the best program
-            if program.id != self.best_program_id:
-                programs_to_remove.append(program)
-
-        # If we still need to remove more and only have the best program protected,
-        # remove from the remaining programs anyway (but keep the absolute best)
-        if len(programs_to_remove) < num_to_remove:
-            remaining_programs = [
-                p
-                for p in sorted_programs
-                if p not in programs_to_remove and p.id != self.best_program_id
-            ]
-            additional_removals = remaining_programs[: num_to_remove - len(programs_to_remove)]
-            programs_to_remove.extend(additional_removals)
+        # Worst programs first, but never remove the best program
+        with self._index_lock:
+            worst_ids = self._get_fitness_index().bottom(num_to_remove + 1)
+        ids_to_remove = [pid for pid in worst_ids if pid != self.best_program_id][:num_to_remove]
 
         # Remove the selected programs
-        for program in programs_to_remove:
-            program_id = program.id
-
-            # Remove from main programs dict
-            if program_id in self.programs:
-                del self.programs[program_id]
-
-            # Remove from feature map
-            keys_to_remove = []
-            for key, pid in self.feature_map.items():
-                if pid == program_id:
-                    keys_to_remove.append(key)
-            for key in keys_to_remove:
-                del self.feature_map[key]
-
-            # Remove from islands
-            for island in self.islands:
-                island.discard(program_id)
-
-            # Remove from archive
-            self.archive.discard(program_id)
-
+        for program_id in ids_to_remove:
+            self._remove_program(program_id)
             logger.debug(f"Removed program {program_id} due to population limit")
 
         logger.info(f"Population size after cleanup: {len(self.programs)}")
 
+    @_write_operation
+    def _remove_program(self, program_id: str) -> None:
+        """
+        Remove a program from the database and all of its indexes
+
+        Args:
+            program_id: ID of the program to remove
+        """
+        # Remove from main programs dict
+        with self._index_lock:
+            program = self.programs.pop(program_id, None)
+            self._unindex_program(program_id)
+
+        if self._code_store is not None:
+            # The program may still be referenced elsewhere, so give it its code back
+            if program is not None and program.__dict__.get("_loader") is self._code_store:
+                program.__dict__["code"] = self._code_store.get(program_id)
+                del program.__dict__["_loader"]
+            self._code_store.discard(program_id)
+
+        # Remove from feature map
+        feature_key = self._feature_keys.pop(program_id, None)
+        if feature_key is not None and self.feature_map.get(feature_key) == program_id:
+            del self.feature_map[feature_key]
+
+        # Remove from islands
+        for island_idx in self._program_islands.pop(program_id, ()):
+            if island_idx < len(self.islands):
+                self.islands[island_idx].discard(program_id)
+
+        # Remove from archive
+        self.archive.discard(program_id)
+
+    def _add_to_island(self, island_idx: int, program_id: str) -> None:
+        """Add a program to an island, keeping the reverse index up to date"""
+        self.islands[island_idx].add(program_id)
+        self._program_islands.setdefault(program_id, set()).add(island_idx)
+
+    def _set_feature_cell(self, feature_key: str, program_id: str) -> None:
+        """Make a program the elite of a feature cell, keeping the reverse index up to date"""
+        previous_id = self.feature_map.get(feature_key)
+        if previous_id is not None and self._feature_keys.get(previous_id) == feature_key:
+            del self._feature_keys[previous_id]
+        self.feature_map[feature_key] = program_id
+        self._feature_keys[program_id] = feature_key
+
+    def _rebuild_reverse_indexes(self) -> None:
+        """Rebuild the program-to-cell and program-to-island indexes"""
+        self._feature_keys = {pid: key for key, pid in self.feature_map.items()}
+        self._program_islands = {}
+        for island_idx, island in enumerate(self.islands):
+            for program_id in island:
+                self._program_islands.setdefault(program_id, set()).add(island_idx)
+
     # Island management methods
+    @_write_operation
     def set_current_island(self, island_idx: int) -> None:
         """Set which island is currently being evolved"""
         self.current_island = island_idx % len(self.islands)
         logger.debug(f"Switched to evolving island {self.current_island}")
 
+    @_write_operation
     def next_island(self) -> int:
         """Move to the next island in round-robin fashion"""
         self.current_island = (self.current_island + 1) % len(self.islands)
         logger.debug(f"Advanced to island {self.current_island}")
         return self.current_island
 
+    @_locked_operation
     def increment_island_generation(self, island_idx: Optional[int] = None) -> None:
         """Increment generation counter for an island"""
         idx = island_idx if island_idx is not None else self.current_island
@@ -1033,6 +1947,7 @@ class ProgramDatabase:
         max_generation = max(self.island_generations)
         return (max_generation - self.last_migration_generation) >= self.migration_interval
 
+    @_write_operation
     def migrate_programs(self) -> None:
         """
         Perform migration between islands
@@ -1053,11 +1968,8 @@ class ProgramDatabase:
             if not island_programs:
                 continue
 
-            # Sort by fitness (using combined_score or average metrics)
-            island_programs.sort(
-                key=lambda p: p.metrics.get("combined_score", safe_numeric_average(p.metrics)),
-                reverse=True,
-            )
+            # Rank by fitness (using combined_score or average metrics)
+            island_programs = rank_programs(island_programs, key=selection_score)
 
             # Select top programs for migration
             num_to_migrate = max(1, int(len(island_programs) * self.migration_rate))
@@ -1080,8 +1992,15 @@ class ProgramDatabase:
                     )
 
                     # Add to target island
-                    self.islands[target_island].add(migrant_copy.id)
-                    self.programs[migrant_copy.id] = migrant_copy
+                    self._add_to_island(target_island, migrant_copy.id)
+                    with self._index_lock:
+                        self.programs[migrant_copy.id] = migrant_copy
+                        self._index_program(migrant_copy)
+                        if self._sketch_index is not None and migrant.id in self._sketch_index:
+                            # Same code as the migrant
+                            self._sketch_index.add(
+                                migrant_copy.id, self._sketch_index.get(migrant.id)
+                            )
 
                     logger.debug(
                         f"Migrated program {migrant.id} from island {i} to island {target_island}"
@@ -1099,13 +2018,10 @@ class ProgramDatabase:
             island_programs = [self.programs[pid] for pid in island if pid in self.programs]
 
             if island_programs:
-                scores = [
-                    p.metrics.get("combined_score", safe_numeric_average(p.metrics))
-                    for p in island_programs
-                ]
+                scores = fitness_array(island_programs, key=selection_score)
 
-                best_score = max(scores) if scores else 0.0
-                avg_score = sum(scores) / len(scores) if scores else 0.0
+                best_score = float(scores.max())
+                avg_score = float(scores.mean())
                 diversity = self._calculate_island_diversity(island_programs)
             else:
                 best_score = avg_score = diversity = 0.0
@@ -1201,6 +2117,7 @@ class ProgramDatabase:
 
     # Artifact storage and retrieval methods
 
+    @_locked_operation
     def store_artifacts(self, program_id: str, artifacts: Dict[str, Union[str, bytes]]) -> None:
         """
         Store artifacts for a program
@@ -1248,6 +2165,8 @@ class ProgramDatabase:
                 self._write_artifact_file(artifact_dir, key, value)
             logger.debug(f"Stored {len(large_artifacts)} large artifacts for program {program_id}")
 
+        self._dirty_ids.add(program_id)
+
     def get_artifacts(self, program_id: str) -> Dict[str, Union[str, bytes]]:
         """
         Retrieve all artifacts for a program
@@ -1362,6 +2281,7 @@ class ProgramDatabase:
 
         return artifacts
 
+    @_locked_operation
     def log_prompt(
         self,
         program_id: str,
@@ -1393,3 +2313,147 @@ class ProgramDatabase:
         if program_id not in self.prompts_by_program:
             self.prompts_by_program[program_id] = {}
         self.prompts_by_program[program_id][template_key] = prompt
+        self._dirty_ids.add(program_id)
+
+
+# Programs a read view compares against to estimate a diversity distance the
+# database has not measured
+_VIEW_DIVERSITY_SAMPLE_SIZE = 32
+
+
+class DatabaseView:
+    """
+    Read-only, versioned snapshot of a ProgramDatabase
+
+    Copies the index structures (programs by ID, islands, archive, feature map
+    and fitness ranking) at one version of the database; Program objects are
+    shared. Stale references are dropped while copying, so sampling from a view
+    never has to modify it. Use ProgramDatabase.read_view() to get one.
+    """
+
+    def __init__(self, database: ProgramDatabase):
+        """
+        Args:
+            database: Database to copy
+        """
+        self.config = database.config
+        self.feature_bins = database.feature_bins
+        self.created_at = time.time()
+
+        # Only flat copies are taken under the write lock, so writers wait for
+        # a few C-level copies; filtering and building rankings happen after it
+        # is released
+        with database._index_lock:
+            self.version = database.version
+            programs = dict(database.programs)
+            islands = [list(island) for island in database.islands]
+            archive = list(database.archive)
+            feature_map = dict(database.feature_map)
+            best_program_id = database.best_program_id
+            self.current_island = database.current_island
+            self.last_iteration = database.last_iteration
+            entries = {None: list(database._get_fitness_index()._entries)}
+            for metric, index in database._metric_indexes.items():
+                entries[metric] = list(index._entries)
+            self._sketch_distances = dict(database._sketch_distances)
+
+        self.programs: Mapping[str, Program] = MappingProxyType(programs)
+        self.islands = [frozenset(pid for pid in island if pid in programs) for island in islands]
+        self.archive = frozenset(pid for pid in archive if pid in programs)
+        self.feature_map: Mapping[str, str] = MappingProxyType(
+            {key: pid for key, pid in feature_map.items() if pid in programs}
+        )
+        self.best_program_id = best_program_id if best_program_id in programs else None
+
+        # Rankings by fitness (None) and by each metric indexed so far
+        self._rankings: Dict[Optional[str], Tuple[str, ...]] = {
+            metric: tuple(entry[2] for entry in metric_entries)
+            for metric, metric_entries in entries.items()
+        }
+
+        # Diversity distances as last measured by the database, so reading them
+        # does not take its lock (_sketch_index is only checked for None)
+        self._sketch_index = database._sketch_index
+        self._min_hasher = database._min_hasher
+
+    # Sampling works as on the database itself
+    get = ProgramDatabase.get
+    sample = ProgramDatabase.sample
+    _sample_parent = ProgramDatabase._sample_parent
+    _sample_exploration_parent = ProgramDatabase._sample_exploration_parent
+    _sample_exploitation_parent = ProgramDatabase._sample_exploitation_parent
+    _sample_random_parent = ProgramDatabase._sample_random_parent
+    _sample_inspirations = ProgramDatabase._sample_inspirations
+    _calculate_feature_coords = ProgramDatabase._calculate_feature_coords
+    _feature_coords_to_key = ProgramDatabase._feature_coords_to_key
+    get_artifacts = ProgramDatabase.get_artifacts
+    _load_artifact_dir = ProgramDatabase._load_artifact_dir
+
+    def _seed_empty_island(self) -> Program:
+        """Parent for an empty current island, leaving the island empty"""
+        if self.best_program_id is not None:
+            return self.programs[self.best_program_id]
+        return next(iter(self.programs.values()))
+
+    def _sketch_distance(self, program: Program) -> float:
+        """
+        Estimated distance from a program to its nearest neighbours in the view
+
+        Uses the distance the database measured when the program was added. For
+        programs it has not measured (e.g. loaded from a checkpoint), the distance
+        is estimated from a sample of the view and remembered.
+        """
+        distance = self._sketch_distances.get(program.id)
+        if distance is None:
+            ranking = self._rankings[None]
+            sample = random.sample(ranking, min(_VIEW_DIVERSITY_SAMPLE_SIZE, len(ranking)))
+            sketch = self._min_hasher.sketch(program.code)
+            similarities = sorted(
+                (
+                    1.0 - sketch_distance(sketch, self._min_hasher.sketch(self.programs[pid].code))
+                    for pid in sample
+                    if pid != program.id
+                ),
+                reverse=True,
+            )[: self.config.diversity_neighbors]
+            distance = 1.0 - sum(similarities) / len(similarities) if similarities else 0.0
+            self._sketch_distances[program.id] = distance
+        return distance
+
+    def get_top_programs(self, n: int = 10, metric: Optional[str] = None) -> List[Program]:
+        """
+        Get the top N programs based on a metric
+
+        Args:
+            n: Number of programs to return
+            metric: Metric to use for ranking (uses average if None)
+
+        Returns:
+            List of top programs
+        """
+        ranking = self._rankings.get(metric)
+        if ranking is None:
+            # Same order as FitnessIndex: best first, ties in insertion order
+            score_fn = _metric_score_fn(metric)
+            scored = [(score_fn(p), p.id) for p in self.programs.values()]
+            ranked = sorted(
+                ((score, pid) for score, pid in scored if score is not None),
+                key=lambda entry: -entry[0],
+            )
+            ranking = self._rankings[metric] = tuple(pid for _, pid in ranked)
+        return [self.programs[program_id] for program_id in ranking[:n]]
+
+    def get_best_program(self, metric: Optional[str] = None) -> Optional[Program]:
+        """
+        Get the best program based on a metric
+
+        Args:
+            metric: Metric to use for ranking (tracked best program if None)
+
+        Returns:
+            Best program or None if the view is empty
+        """
+        if metric is None and self.best_program_id is not None:
+            return self.programs[self.best_program_id]
+        top = self.get_top_programs(1, metric)
+        return top[0] if top else None
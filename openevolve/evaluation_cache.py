@@ -0,0 +1,243 @@
+"""
+Content-addressed cache of evaluation results for OpenEvolve
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from openevolve.config import EvaluatorConfig
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_code(code: str) -> str:
+    """
+    Normalize program code so that trivially different copies hash identically
+
+    Line endings are unified, trailing whitespace is stripped from every line and
+    leading/trailing blank lines are dropped. Comments are kept, since evaluators
+    are free to read them.
+
+    Args:
+        code: Program code
+
+    Returns:
+        Normalized code
+    """
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def _artifact_serializer(obj: Any) -> Any:
+    """JSON serializer for artifacts that handles bytes"""
+    if isinstance(obj, bytes):
+        return {"__bytes__": base64.b64encode(obj).decode("utf-8")}
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _artifact_deserializer(dct: Dict[str, Any]) -> Any:
+    """JSON deserializer for artifacts that handles bytes"""
+    if "__bytes__" in dct:
+        return base64.b64decode(dct["__bytes__"])
+    return dct
+
+
+class EvaluationCache:
+    """
+    Cache mapping program code to evaluation metrics and artifacts
+
+    Keys are the SHA-256 of the normalized program code salted with the hash of
+    the evaluation file (and the evaluation settings that influence metrics), so
+    editing the evaluator invalidates all entries. Recently used entries are kept
+    in an in-memory LRU; when cache_dir is set, every entry is also written to
+    disk so results survive restarts and entries evicted from memory can be
+    recovered. The disk tier is bounded by max_disk_entries.
+    """
+
+    def __init__(
+        self,
+        evaluation_file: str,
+        max_entries: int = 1000,
+        cache_dir: Optional[str] = None,
+        max_disk_entries: int = 100000,
+        salt: str = "",
+    ):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+
+        with open(evaluation_file, "rb") as f:
+            evaluator_hash = hashlib.sha256(f.read()).hexdigest()
+        self.namespace = hashlib.sha256(f"{evaluator_hash}:{salt}".encode("utf-8")).hexdigest()
+
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
+        self._disk_keys: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            self._scan_disk()
+
+        logger.info(
+            f"Initialized evaluation cache (memory entries: {max_entries}, "
+            f"disk: {cache_dir or 'disabled'})"
+        )
+
+    @classmethod
+    def from_config(cls, config: EvaluatorConfig, evaluation_file: str) -> "EvaluationCache":
+        """Create a cache from the evaluator configuration"""
+        salt = json.dumps(
+            {
+                "cascade_evaluation": config.cascade_evaluation,
+                "cascade_thresholds": config.cascade_thresholds,
+            },
+            sort_keys=True,
+        )
+        return cls(
+            evaluation_file,
+            max_entries=config.cache_max_entries,
+            cache_dir=config.cache_dir,
+            max_disk_entries=config.cache_max_disk_entries,
+            salt=salt,
+        )
+
+    def key(self, code: str) -> str:
+        """Cache key for a program"""
+        digest = hashlib.sha256(self.namespace.encode("utf-8"))
+        digest.update(normalize_code(code).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, code: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Union[str, bytes]]]]:
+        """
+        Look up the evaluation result for a program
+
+        Args:
+            code: Program code
+
+        Returns:
+            Tuple of (metrics, artifacts) copies, or None on a miss
+        """
+        key = self.key(code)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            elif key in self._disk_keys:
+                entry = self._read_entry(key)
+                if entry is not None:
+                    self._remember(key, entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+        metrics, artifacts = entry
+        return dict(metrics), dict(artifacts)
+
+    def put(
+        self,
+        code: str,
+        metrics: Dict[str, Any],
+        artifacts: Optional[Dict[str, Union[str, bytes]]] = None,
+    ) -> None:
+        """
+        Store the evaluation result for a program
+
+        Args:
+            code: Program code
+            metrics: Metrics returned by the evaluation
+            artifacts: Artifacts produced by the evaluation
+        """
+        key = self.key(code)
+        entry = (dict(metrics), dict(artifacts or {}))
+        with self._lock:
+            self._remember(key, entry)
+            if self.cache_dir:
+                self._write_entry(key, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk_keys),
+            }
+
+    def _remember(self, key: str, entry: Tuple[Dict[str, Any], Dict[str, Any]]) -> None:
+        """Insert into the memory tier, evicting the least recently used entry"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _scan_disk(self) -> None:
+        """Index existing disk entries, oldest first"""
+        entries = []
+        if os.path.isdir(self.cache_dir):
+            for shard in os.listdir(self.cache_dir):
+                shard_dir = os.path.join(self.cache_dir, shard)
+                if not os.path.isdir(shard_dir):
+                    continue
+                for filename in os.listdir(shard_dir):
+                    if filename.endswith(".json"):
+                        path = os.path.join(shard_dir, filename)
+                        entries.append((os.path.getmtime(path), filename[: -len(".json")]))
+
+        for _, key in sorted(entries):
+            self._disk_keys[key] = None
+        logger.debug(f"Found {len(self._disk_keys)} cached evaluations in {self.cache_dir}")
+
+    def _read_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Read an entry from the disk tier"""
+        try:
+            with open(self._entry_path(key), "r") as f:
+                data = json.load(f, object_hook=_artifact_deserializer)
+            return data["metrics"], data.get("artifacts", {})
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to read cached evaluation {key}: {e}")
+            self._disk_keys.pop(key, None)
+            return None
+
+    def _write_entry(self, key: str, entry: Tuple[Dict[str, Any], Dict[str, Any]]) -> None:
+        """Write an entry to the disk tier, evicting the oldest entries beyond the bound"""
+        path = self._entry_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(
+                    {"metrics": entry[0], "artifacts": entry[1]}, f, default=_artifact_serializer
+                )
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to write cached evaluation {key}: {e}")
+            return
+
+        self._disk_keys[key] = None
+        self._disk_keys.move_to_end(key)
+        while len(self._disk_keys) > self.max_disk_entries:
+            old_key, _ = self._disk_keys.popitem(last=False)
+            try:
+                os.remove(self._entry_path(old_key))
+            except OSError:
+                pass
@@ -19,10 +19,12 @@ import traceback
 
 from openevolve.config import EvaluatorConfig
 from openevolve.database import ProgramDatabase
+from openevolve.evaluation_cache import EvaluationCache
 from openevolve.evaluation_result import EvaluationResult
 from openevolve.database import ProgramDatabase
 from openevolve.llm.ensemble import LLMEnsemble
 from openevolve.utils.async_utils import TaskPool, run_in_executor
+from openevolve.process_pool import RESOURCE_USAGE_KEYS, get_shared_pool
 from openevolve.prompt.sampler import PromptSampler
 from openevolve.utils.format_utils import format_metrics_safe
 
@@ -44,6 +46,7 @@ class Evaluator:
         llm_ensemble: Optional[LLMEnsemble] = None,
         prompt_sampler: Optional[PromptSampler] = None,
         database: Optional[ProgramDatabase] = None,
+        cache: Optional[EvaluationCache] = None,
     ):
         self.config = config
         self.evaluation_file = evaluation_file
@@ -51,12 +54,37 @@ class Evaluator:
         self.prompt_sampler = prompt_sampler
         self.database = database
 
+        # Evaluation result cache (may be shared between evaluators)
+        if cache is None and config.cache_evaluations:
+            cache = EvaluationCache.from_config(config, evaluation_file)
+        self.cache = cache
+
         # Create a task pool for parallel evaluation
         self.task_pool = TaskPool(max_concurrency=config.parallel_evaluations)
 
         # Set up evaluation function if file exists
         self._load_evaluation_function()
 
+        # Set up the execution backend for evaluation functions
+        backend = config.backend
+        if backend not in ("thread", "process"):
+            raise ValueError(
+                f"Unknown evaluator backend '{config.backend}' (expected 'thread' or 'process')"
+            )
+        if backend == "thread" and (config.memory_limit_mb or config.cpu_limit):
+            # Threads cannot be limited or killed, so resource limits need worker processes
+            logger.info("Resource limits configured, using the 'process' evaluator backend")
+            backend = "process"
+
+        self.process_pool = None
+        if backend == "process":
+            self.process_pool = get_shared_pool(
+                evaluation_file,
+                config.process_workers,
+                memory_limit_mb=config.memory_limit_mb,
+                cpu_limit=config.cpu_limit,
+            )
+
         # Pending artifacts storage for programs
         self._pending_artifacts: Dict[str, Dict[str, Union[str, bytes]]] = {}
 
@@ -114,6 +142,19 @@ class Evaluator:
         # Check if artifacts are enabled
         artifacts_enabled = os.environ.get("ENABLE_ARTIFACTS", "true").lower() == "true"
 
+        # Short-circuit programs that were already evaluated
+        if self.cache is not None:
+            cached = self.cache.get(program_code)
+            if cached is not None:
+                metrics, artifacts = cached
+                if artifacts_enabled and program_id and artifacts:
+                    self._pending_artifacts[program_id] = artifacts
+                logger.info(
+                    f"Reused cached evaluation for program{program_id_str}: "
+                    f"{format_metrics_safe(metrics)}"
+                )
+                return metrics
+
         # Retry logic for evaluation
         last_exception = None
         for attempt in range(self.config.max_retries + 1):
@@ -191,6 +232,19 @@ class Evaluator:
                     f"{format_metrics_safe(eval_result.metrics)}"
                 )
 
+                # Failures may be transient (timeouts, crashed workers, flaky
+                # evaluators), so only complete evaluations are cached. Resource
+                # usage describes this run, not the program, so it is not cached.
+                if self.cache is not None and self._is_complete(eval_result):
+                    artifacts = {
+                        key: value
+                        for key, value in eval_result.artifacts.items()
+                        if key not in RESOURCE_USAGE_KEYS
+                    }
+                    if llm_eval_result and llm_eval_result.has_artifacts():
+                        artifacts.update(llm_eval_result.artifacts)
+                    self.cache.put(program_code, eval_result.metrics, artifacts)
+
                 # Return just metrics for backward compatibility
                 return eval_result.metrics
 
@@ -273,7 +327,16 @@ class Evaluator:
         """
         return self._pending_artifacts.pop(program_id, None)
 
-    async def _direct_evaluate(self, program_path: str) -> Dict[str, float]:
+    @staticmethod
+    def _is_complete(eval_result: EvaluationResult) -> bool:
+        """Whether an evaluation ran to completion, so its result can be cached"""
+        if "error" in eval_result.metrics or eval_result.metrics.get("timeout") is True:
+            return False
+        return not any(key in eval_result.artifacts for key in ("failure_stage", "stderr"))
+
+    async def _direct_evaluate(
+        self, program_path: str
+    ) -> Union[Dict[str, float], EvaluationResult]:
         """
         Directly evaluate a program using the evaluation function with timeout
 
@@ -288,21 +351,67 @@ class Evaluator:
             Exception: If evaluation function raises an exception
         """
 
-        # Create a coroutine that runs the evaluation function in an executor
-        async def run_evaluation():
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, self.evaluate_function, program_path)
-
         # Run the evaluation with timeout - let exceptions bubble up for retry handling
-        result = await asyncio.wait_for(run_evaluation(), timeout=self.config.timeout)
+        result = await self._run_evaluation_function(
+            "evaluate", self.evaluate_function, program_path
+        )
 
         # Validate result
-        if not isinstance(result, dict):
+        if not isinstance(result, (dict, EvaluationResult)):
             logger.warning(f"Evaluation returned non-dictionary result: {result}")
             return {"error": 0.0}
 
         return result
 
+    async def _run_evaluation_function(
+        self, function_name: str, function: Callable, program_path: str
+    ) -> Any:
+        """
+        Run an evaluation function on the configured backend with timeout
+
+        Args:
+            function_name: Name of the function in the evaluation module
+            function: The function itself (used by the thread backend)
+            program_path: Path to the program file
+
+        Returns:
+            Raw result of the evaluation function
+
+        Raises:
+            asyncio.TimeoutError: If evaluation exceeds timeout
+        """
+        if self.process_pool is not None:
+            # The pool enforces the timeout itself and kills the worker when it expires
+            result, usage = await self.process_pool.run_with_usage(
+                function_name, program_path, self.config.timeout
+            )
+            return self._attach_resource_usage(result, usage)
+
+        loop = asyncio.get_event_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, function, program_path), timeout=self.config.timeout
+        )
+
+    def _attach_resource_usage(self, result: Any, usage: Dict[str, float]) -> Any:
+        """
+        Report the resource usage of an evaluation as artifacts
+
+        Args:
+            result: Raw result from the evaluation function
+            usage: Resource usage measured by the worker process
+
+        Returns:
+            EvaluationResult carrying the usage artifacts, or the unchanged result
+            if it has an unexpected type
+        """
+        artifacts = {key: round(value, 4) for key, value in usage.items()}
+        if isinstance(result, EvaluationResult):
+            result.artifacts.update(artifacts)
+            return result
+        if isinstance(result, dict):
+            return EvaluationResult(metrics=result, artifacts=artifacts)
+        return result
+
     async def _cascade_evaluate(
         self, program_path: str
     ) -> Union[Dict[str, float], EvaluationResult]:
@@ -336,12 +445,9 @@ class Evaluator:
 
             # Run first stage with timeout
             try:
-
-                async def run_stage1():
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(None, module.evaluate_stage1, program_path)
-
-                stage1_result = await asyncio.wait_for(run_stage1(), timeout=self.config.timeout)
+                stage1_result = await self._run_evaluation_function(
+                    "evaluate_stage1", module.evaluate_stage1, program_path
+                )
                 stage1_eval_result = self._process_evaluation_result(stage1_result)
             except asyncio.TimeoutError:
                 logger.warning(f"Stage 1 evaluation timed out after {self.config.timeout}s")
@@ -376,12 +482,9 @@ class Evaluator:
 
             # Run second stage with timeout
             try:
-
-                async def run_stage2():
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(None, module.evaluate_stage2, program_path)
-
-                stage2_result = await asyncio.wait_for(run_stage2(), timeout=self.config.timeout)
+                stage2_result = await self._run_evaluation_function(
+                    "evaluate_stage2", module.evaluate_stage2, program_path
+                )
                 stage2_eval_result = self._process_evaluation_result(stage2_result)
             except asyncio.TimeoutError:
                 logger.warning(f"Stage 2 evaluation timed out after {self.config.timeout}s")
@@ -438,12 +541,9 @@ class Evaluator:
 
             # Run third stage with timeout
             try:
-
-                async def run_stage3():
-                    loop = asyncio.get_event_loop()
-                    return await loop.run_in_executor(None, module.evaluate_stage3, program_path)
-
-                stage3_result = await asyncio.wait_for(run_stage3(), timeout=self.config.timeout)
+                stage3_result = await self._run_evaluation_function(
+                    "evaluate_stage3", module.evaluate_stage3, program_path
+                )
                 stage3_eval_result = self._process_evaluation_result(stage3_result)
             except asyncio.TimeoutError:
                 logger.warning(f"Stage 3 evaluation timed out after {self.config.timeout}s")
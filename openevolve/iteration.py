@@ -2,8 +2,12 @@ import asyncio
 import os
 import uuid
 import logging
+import math
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 
 from openevolve.database import Program, ProgramDatabase
 from openevolve.config import Config
@@ -29,119 +33,352 @@ class Result:
     prompt: str = None
     llm_response: str = None
     artifacts: dict = None
+    stage_times: Dict[str, float] = field(default_factory=dict)  # Seconds per stage
 
 
 
 
 
+@dataclass
+class Candidate:
+    """Child program generated by the LLM that has not been evaluated yet"""
+
+    iteration: int = None
+    parent: Program = None
+    child_code: str = None
+    changes_summary: str = None
+    prompt: dict = None
+    llm_response: str = None
+    start_time: float = None
+    stage_times: Dict[str, float] = field(default_factory=dict)  # Seconds per stage
+
+
+class StageTimings:
+    """
+    Durations of the stages of recent iterations
+
+    Iterations record how long they spent sampling from the database, building
+    the prompt, waiting for the LLM, applying its changes and evaluating the
+    child, and the controller adds the time to store the result. The latest
+    max_samples durations of each stage are kept for percentiles.
+    """
+
+    STAGES = ("sample", "prompt", "llm", "apply", "evaluate", "database", "total")
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self.samples: Dict[str, Deque[float]] = {}
+        self.count = 0
+
+    def record(self, stage_times: Dict[str, float]) -> None:
+        """Record the stage durations of an iteration"""
+        self.count += 1
+        for stage, duration in stage_times.items():
+            samples = self.samples.get(stage)
+            if samples is None:
+                samples = self.samples[stage] = deque(maxlen=self.max_samples)
+            samples.append(duration)
+
+    def percentiles(
+        self, percentiles: Iterable[float] = (50, 95, 99)
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Duration percentiles of each stage
+
+        Args:
+            percentiles: Percentiles to compute
+
+        Returns:
+            Mapping of stage to {"p50": seconds, ..., "mean": seconds, "count": n},
+            in pipeline order
+        """
+        stages = [s for s in self.STAGES if s in self.samples]
+        stages += sorted(s for s in self.samples if s not in self.STAGES)
+        summary = {}
+        for stage in stages:
+            values = sorted(self.samples[stage])
+            stats = {}
+            for p in percentiles:
+                # Nearest-rank percentile
+                rank = min(max(math.ceil(p * len(values) / 100), 1), len(values))
+                stats[f"p{p:g}"] = values[rank - 1]
+            stats["mean"] = sum(values) / len(values)
+            stats["count"] = len(values)
+            summary[stage] = stats
+        return summary
+
+    def log_summary(self, log: logging.Logger) -> None:
+        """Log the median and tail duration of each stage"""
+        for stage, stats in self.percentiles().items():
+            log.info(
+                f"Stage {stage}: p50 {stats['p50'] * 1000:.1f} ms, "
+                f"p95 {stats['p95'] * 1000:.1f} ms, p99 {stats['p99'] * 1000:.1f} ms "
+                f"({stats['count']} iterations)"
+            )
+
+
+async def generate_candidates(
+    iteration: int,
+    config: Config,
+    database: ProgramDatabase,
+    llm_ensemble: LLMEnsemble,
+    prompt_sampler: PromptSampler,
+) -> List[Candidate]:
+    """
+    Generation stage of an iteration: sample a parent, build the prompt, query
+    the LLM and apply its changes
+
+    With config.samples_per_prompt > 1, that many completions are requested for
+    the one prompt, and each usable completion becomes its own candidate.
+
+    Returns:
+        The candidate child programs, empty if no response was usable
+    """
+    stage_times = {}
+    stage_start = time.perf_counter()
+
+    # Read from a snapshot, so the controller can keep adding programs meanwhile
+    view = database.read_view()
+
+    # Sample parent and inspirations from database
+    parent, inspirations = view.sample()
+
+    # Get artifacts for the parent program if available
+    parent_artifacts = view.get_artifacts(parent.id)
+
+    # Get actual top programs for prompt context (separate from inspirations)
+    actual_top_programs = view.get_top_programs(5)
+    previous_programs = view.get_top_programs(3)
+
+    now = time.perf_counter()
+    stage_times["sample"] = now - stage_start
+    stage_start = now
+
+    # Build prompt; the sampler reads the programs in place instead of copying them
+    prompt = prompt_sampler.build_prompt(
+        current_program=parent.code,
+        parent_program=parent.code,
+        program_metrics=parent.metrics,
+        previous_programs=previous_programs,
+        top_programs=actual_top_programs,
+        inspirations=inspirations,
+        language=config.language,
+        evolution_round=iteration,
+        diff_based_evolution=config.diff_based_evolution,
+        program_artifacts=parent_artifacts if parent_artifacts else None,
+    )
+
+    iteration_start = time.time()
+
+    now = time.perf_counter()
+    stage_times["prompt"] = now - stage_start
+    stage_start = now
+
+    # Generate code modifications
+    messages = [{"role": "user", "content": prompt["user"]}]
+    if config.samples_per_prompt > 1:
+        llm_responses = await llm_ensemble.generate_multiple_with_context(
+            system_message=prompt["system"],
+            messages=messages,
+            n=config.samples_per_prompt,
+        )
+    else:
+        llm_responses = [
+            await llm_ensemble.generate_with_context(
+                system_message=prompt["system"],
+                messages=messages,
+            )
+        ]
+
+    now = time.perf_counter()
+    stage_times["llm"] = now - stage_start
+
+    candidates = []
+    for llm_response in llm_responses:
+        apply_start = time.perf_counter()
+        changes = apply_response(iteration, config, parent.code, llm_response)
+        if changes is None:
+            continue
+        child_code, changes_summary = changes
+        candidates.append(
+            Candidate(
+                iteration=iteration,
+                parent=parent,
+                child_code=child_code,
+                changes_summary=changes_summary,
+                prompt=prompt,
+                llm_response=llm_response,
+                start_time=iteration_start,
+                stage_times={**stage_times, "apply": time.perf_counter() - apply_start},
+            )
+        )
+
+    return candidates
+
+
+def apply_response(
+    iteration: int, config: Config, parent_code: str, llm_response: str
+) -> Optional[Tuple[str, str]]:
+    """
+    Parse an LLM response and apply its changes to the parent program
+
+    Returns:
+        Tuple of (child code, summary of the changes), or None if the response
+        was unusable
+    """
+    logger = logging.getLogger(__name__)
+
+    # Parse the response
+    if config.diff_based_evolution:
+        diff_blocks = extract_diffs(llm_response)
+
+        if not diff_blocks:
+            logger.warning(f"Iteration {iteration+1}: No valid diffs found in response")
+            return None
+
+        # Apply the diffs
+        child_code = apply_diff(parent_code, llm_response)
+        changes_summary = format_diff_summary(diff_blocks)
+    else:
+        # Parse full rewrite
+        new_code = parse_full_rewrite(llm_response, config.language)
+
+        if not new_code:
+            logger.warning(f"Iteration {iteration+1}: No valid code found in response")
+            return None
+
+        child_code = new_code
+        changes_summary = "Full rewrite"
+
+    # Check code length
+    if len(child_code) > config.max_code_length:
+        logger.warning(
+            f"Iteration {iteration+1}: Generated code exceeds maximum length "
+            f"({len(child_code)} > {config.max_code_length})"
+        )
+        return None
+
+    return child_code, changes_summary
+
+
+async def evaluate_candidate(
+    candidate: Candidate,
+    config: Config,
+    evaluator: Evaluator,
+) -> Result:
+    """
+    Evaluation stage of an iteration: evaluate a candidate and build the child program
+
+    Returns:
+        Result holding the evaluated child program
+    """
+    parent = candidate.parent
+    result = Result(parent=parent, stage_times=dict(candidate.stage_times))
+
+    # Evaluate the child program
+    child_id = str(uuid.uuid4())
+    evaluate_start = time.perf_counter()
+    result.child_metrics = await evaluator.evaluate_program(candidate.child_code, child_id)
+    result.stage_times["evaluate"] = time.perf_counter() - evaluate_start
+
+    # Handle artifacts if they exist
+    artifacts = evaluator.get_pending_artifacts(child_id)
+
+    # Create a child program
+    result.child_program = Program(
+        id=child_id,
+        code=candidate.child_code,
+        language=config.language,
+        parent_id=parent.id,
+        generation=parent.generation + 1,
+        metrics=result.child_metrics,
+        iteration_found=candidate.iteration,
+        metadata={
+            "changes": candidate.changes_summary,
+            "parent_metrics": parent.metrics,
+        },
+    )
+
+    result.prompt = candidate.prompt
+    result.llm_response = candidate.llm_response
+    result.artifacts = artifacts
+    result.iteration_time = time.time() - candidate.start_time
+    result.iteration = candidate.iteration
+
+    return result
+
+
+async def evaluate_with_slot(
+    candidate: Candidate,
+    config: Config,
+    evaluator: Evaluator,
+    evaluation_slots: Optional[threading.Semaphore] = None,
+) -> Result:
+    """
+    Evaluate a candidate once one of the shared evaluation slots is free
+
+    Args:
+        candidate: Candidate to evaluate
+        config: Configuration
+        evaluator: Evaluator to use
+        evaluation_slots: Semaphore bounding the evaluations running at once
+            across threads (unbounded if None)
+
+    Returns:
+        Result holding the evaluated child program
+    """
+    if evaluation_slots is None:
+        return await evaluate_candidate(candidate, config, evaluator)
+
+    # Poll instead of blocking a thread: evaluations need the loop's executor threads
+    delay = 0.001
+    while not evaluation_slots.acquire(blocking=False):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.05)
+    try:
+        return await evaluate_candidate(candidate, config, evaluator)
+    finally:
+        evaluation_slots.release()
+
+
 async def run_iteration_with_shared_db(
     iteration: int, 
     config: Config, 
     database: ProgramDatabase,
     evaluator: Evaluator,
     llm_ensemble: LLMEnsemble,
-    prompt_sampler: PromptSampler
-):
+    prompt_sampler: PromptSampler,
+    evaluation_slots: Optional[threading.Semaphore] = None,
+) -> List[Result]:
     """
     Run a single iteration using shared memory database
     
     This is optimized for use with persistent worker processes.
+
+    Args:
+        evaluation_slots: Semaphore shared by all worker threads, bounding the
+            children evaluated at once when prompts are sampled several times
+
+    Returns:
+        Results of the usable samples of the prompt (one per child, up to
+        config.samples_per_prompt); empty if the iteration produced no child
     """
     logger = logging.getLogger(__name__)
     
     try:
-        # Sample parent and inspirations from database
-        parent, inspirations = database.sample()
-
-        # Get artifacts for the parent program if available
-        parent_artifacts = database.get_artifacts(parent.id)
-
-        # Get actual top programs for prompt context (separate from inspirations)
-        actual_top_programs = database.get_top_programs(5)
-
-        # Build prompt
-        prompt = prompt_sampler.build_prompt(
-            current_program=parent.code,
-            parent_program=parent.code,
-            program_metrics=parent.metrics,
-            previous_programs=[p.to_dict() for p in database.get_top_programs(3)],
-            top_programs=[p.to_dict() for p in actual_top_programs],
-            inspirations=[p.to_dict() for p in inspirations],
-            language=config.language,
-            evolution_round=iteration,
-            diff_based_evolution=config.diff_based_evolution,
-            program_artifacts=parent_artifacts if parent_artifacts else None,
+        candidates = await generate_candidates(
+            iteration, config, database, llm_ensemble, prompt_sampler
         )
+        # Children of the same prompt are evaluated concurrently, at most
+        # parallel_evaluations of them at once
+        children = asyncio.Semaphore(max(1, config.evaluator.parallel_evaluations))
 
-        result = Result(parent=parent)
-        iteration_start = time.time()
+        async def evaluate(candidate: Candidate) -> Result:
+            async with children:
+                return await evaluate_with_slot(candidate, config, evaluator, evaluation_slots)
 
-        # Generate code modification
-        llm_response = await llm_ensemble.generate_with_context(
-            system_message=prompt["system"],
-            messages=[{"role": "user", "content": prompt["user"]}],
-        )
-
-        # Parse the response
-        if config.diff_based_evolution:
-            diff_blocks = extract_diffs(llm_response)
-
-            if not diff_blocks:
-                logger.warning(f"Iteration {iteration+1}: No valid diffs found in response")
-                return None
-
-            # Apply the diffs
-            child_code = apply_diff(parent.code, llm_response)
-            changes_summary = format_diff_summary(diff_blocks)
-        else:
-            # Parse full rewrite
-            new_code = parse_full_rewrite(llm_response, config.language)
-
-            if not new_code:
-                logger.warning(f"Iteration {iteration+1}: No valid code found in response")
-                return None
-
-            child_code = new_code
-            changes_summary = "Full rewrite"
-
-        # Check code length
-        if len(child_code) > config.max_code_length:
-            logger.warning(
-                f"Iteration {iteration+1}: Generated code exceeds maximum length "
-                f"({len(child_code)} > {config.max_code_length})"
-            )
-            return None
-
-        # Evaluate the child program
-        child_id = str(uuid.uuid4())
-        result.child_metrics = await evaluator.evaluate_program(child_code, child_id)
-        
-        # Handle artifacts if they exist
-        artifacts = evaluator.get_pending_artifacts(child_id)
-        
-        # Create a child program
-        result.child_program = Program(
-            id=child_id,
-            code=child_code,
-            language=config.language,
-            parent_id=parent.id,
-            generation=parent.generation + 1,
-            metrics=result.child_metrics,
-            iteration_found=iteration,
-            metadata={
-                "changes": changes_summary,
-                "parent_metrics": parent.metrics,
-            },
-        )
-        
-        result.prompt = prompt
-        result.llm_response = llm_response
-        result.artifacts = artifacts
-        result.iteration_time = time.time() - iteration_start
-        result.iteration = iteration
-        
-        return result
+        return list(await asyncio.gather(*[evaluate(candidate) for candidate in candidates]))
 
     except Exception as e:
         logger.exception(f"Error in iteration {iteration}: {e}")
-        return None
+        return []
@@ -5,5 +5,6 @@ LLM module initialization
 from openevolve.llm.base import LLMInterface
 from openevolve.llm.ensemble import LLMEnsemble
 from openevolve.llm.openai import OpenAILLM
+from openevolve.llm.replay import RecordingLLM, ReplayLLM
 
-__all__ = ["LLMInterface", "OpenAILLM", "LLMEnsemble"]
+__all__ = ["LLMInterface", "OpenAILLM", "LLMEnsemble", "RecordingLLM", "ReplayLLM"]
@@ -2,6 +2,7 @@
 Base LLM interface
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
@@ -20,3 +21,13 @@ class LLMInterface(ABC):
     ) -> str:
         """Generate text using a system message and conversational context"""
         pass
+
+    async def generate_multiple_with_context(
+        self, system_message: str, messages: List[Dict[str, str]], n: int, **kwargs
+    ) -> List[str]:
+        """Generate n completions for the same context, as concurrent requests by default"""
+        return list(
+            await asyncio.gather(
+                *[self.generate_with_context(system_message, messages, **kwargs) for _ in range(n)]
+            )
+        )
@@ -8,7 +8,7 @@ import random
 from typing import Dict, List, Optional, Tuple
 
 from openevolve.llm.base import LLMInterface
-from openevolve.llm.openai import OpenAILLM
+from openevolve.llm.replay import create_llm
 from openevolve.config import LLMModelConfig
 
 logger = logging.getLogger(__name__)
@@ -20,8 +20,8 @@ class LLMEnsemble:
     def __init__(self, models_cfg: List[LLMModelConfig]):
         self.models_cfg = models_cfg
 
-        # Initialize models from the configuration
-        self.models = [OpenAILLM(model_cfg) for model_cfg in models_cfg]
+        # Initialize models from the configuration (recording or replaying if configured)
+        self.models = [create_llm(model_cfg) for model_cfg in models_cfg]
 
         # Extract and normalize model weights
         self.weights = [model.weight for model in models_cfg]
@@ -55,6 +55,13 @@ class LLMEnsemble:
         model = self._sample_model()
         return await model.generate_with_context(system_message, messages, **kwargs)
 
+    async def generate_multiple_with_context(
+        self, system_message: str, messages: List[Dict[str, str]], n: int, **kwargs
+    ) -> List[str]:
+        """Generate n completions for the same context from one sampled model"""
+        model = self._sample_model()
+        return await model.generate_multiple_with_context(system_message, messages, n, **kwargs)
+
     def _sample_model(self) -> LLMInterface:
         """Sample a model from the ensemble based on weights"""
         index = self.random_state.choices(range(len(self.models)), weights=self.weights, k=1)[0]
@@ -0,0 +1,501 @@
+"""
+Mock OpenAI-compatible server for load testing
+
+Answers /v1/chat/completions requests with synthetic SEARCH/REPLACE diffs (or
+full rewrites) of the EVOLVE-BLOCK regions of the program in the prompt, after
+a configurable latency, and injects server errors, 429 rate limiting and
+stalled requests. Point llm.api_base at it to load-test the controllers,
+retries and timeouts on one machine without an API key:
+
+    python -m openevolve.llm.mock_server --port 8000 --latency lognormal:0,0.5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from openevolve.llm.replay import LatencyDistribution
+
+logger = logging.getLogger(__name__)
+
+_CURRENT_PROGRAM = re.compile(r"# Current Program\n```[\w+-]*\n(.*?)\n```", re.DOTALL)
+_CODE_BLOCK = re.compile(r"```[\w+-]*\n(.*?)\n```", re.DOTALL)
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?![\w.])")
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+@dataclass
+class MockServerStats:
+    """Requests served by a MockOpenAIServer"""
+
+    requests: int = 0
+    completed: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    stalled: int = 0
+    disconnects: int = 0
+    connections: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    total_latency: float = 0.0
+    status_counts: Dict[int, int] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        """Stats summary, latency in seconds"""
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "stalled": self.stalled,
+            "disconnects": self.disconnects,
+            "connections": self.connections,
+            "max_in_flight": self.max_in_flight,
+            "mean_latency": self.total_latency / max(self.completed, 1),
+            "status_counts": dict(self.status_counts),
+        }
+
+
+def extract_program(prompt: str) -> str:
+    """
+    Find the program to evolve in a prompt
+
+    Args:
+        prompt: User message built by the PromptSampler
+
+    Returns:
+        The current program, or the last code block if the prompt has no
+        "# Current Program" section, or an empty string
+    """
+    match = _CURRENT_PROGRAM.search(prompt)
+    if match:
+        return match.group(1)
+    blocks = _CODE_BLOCK.findall(prompt)
+    return blocks[-1] if blocks else ""
+
+
+def evolve_block_lines(code: str) -> List[int]:
+    """
+    Indices of the lines that may be changed
+
+    Args:
+        code: Program code
+
+    Returns:
+        Non-blank lines between EVOLVE-BLOCK-START and EVOLVE-BLOCK-END markers,
+        or all non-blank lines if the code has no markers
+    """
+    lines = code.split("\n")
+    candidates = []
+    inside = False
+    has_markers = False
+    for i, line in enumerate(lines):
+        if "EVOLVE-BLOCK-START" in line:
+            inside = has_markers = True
+        elif "EVOLVE-BLOCK-END" in line:
+            inside = False
+        elif inside and line.strip():
+            candidates.append(i)
+    if has_markers:
+        return candidates
+    return [i for i, line in enumerate(lines) if line.strip()]
+
+
+def mutate_line(line: str, rng: random.Random) -> str:
+    """Change a line: perturb one of its numbers, or else annotate it"""
+    numbers = list(_NUMBER.finditer(line))
+    if numbers:
+        number = rng.choice(numbers)
+        text = number.group(0)
+        if "." in text:
+            value = f"{float(text) * rng.uniform(0.5, 1.5):.{len(text.split('.')[1])}f}"
+        else:
+            value = str(max(int(text) + rng.choice([-2, -1, 1, 2]), 0))
+        return line[: number.start()] + value + line[number.end() :]
+    return f"{line}  # variant {rng.randint(0, 9999)}"
+
+
+def synthetic_response(
+    prompt: str, rng: random.Random, edits: int = 1, response_size: int = 0
+) -> str:
+    """
+    Generate an LLM-like answer to an evolution prompt
+
+    Args:
+        prompt: User message
+        rng: Random number generator
+        edits: Number of lines to change
+        response_size: Pad the answer with explanation text to about this many characters
+
+    Returns:
+        SEARCH/REPLACE diffs if the prompt asks for them, else the full
+        rewritten program in a code block
+    """
+    language_match = re.search(r"# Current Program\n```([\w+-]*)", prompt)
+    language = language_match.group(1) if language_match and language_match.group(1) else "python"
+    code = extract_program(prompt)
+    lines = code.split("\n")
+    candidates = evolve_block_lines(code)
+    changed = sorted(rng.sample(candidates, min(edits, len(candidates))))
+
+    if "<<<<<<< SEARCH" in prompt:
+        blocks = []
+        for i in changed:
+            blocks.append(
+                f"<<<<<<< SEARCH\n{lines[i]}\n=======\n{mutate_line(lines[i], rng)}\n"
+                ">>>>>>> REPLACE"
+            )
+        body = "\n\n".join(blocks)
+    else:
+        for i in changed:
+            lines[i] = mutate_line(lines[i], rng)
+        body = f"```{language}\n" + "\n".join(lines) + "\n```"
+
+    explanation = f"Changed {len(changed)} line(s) to explore nearby parameter values."
+    padding = response_size - len(body) - len(explanation) - 2
+    if padding > 0:
+        sentence = "This adjustment should be evaluated against the current metrics. "
+        explanation += "\n" + (sentence * (padding // len(sentence) + 1))[:padding]
+    return f"{explanation}\n\n{body}"
+
+
+class MockOpenAIServer:
+    """
+    Minimal asyncio HTTP/1.1 server speaking the chat completions protocol
+
+    Requests are answered after a latency drawn from the configured
+    distribution. With probability error_rate a request fails with a 500,
+    with probability rate_limit_rate it gets a 429, and requests beyond
+    max_concurrency concurrent ones are rate limited too. With probability
+    stall_rate a request is only answered after stall_time seconds, to
+    exercise client timeouts.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[str] = None,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        max_concurrency: Optional[int] = None,
+        stall_rate: float = 0.0,
+        stall_time: float = 3600.0,
+        response_size: int = 0,
+        edits: int = 1,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = LatencyDistribution(latency, seed)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrency = max_concurrency
+        self.stall_rate = stall_rate
+        self.stall_time = stall_time
+        self.response_size = response_size
+        self.edits = edits
+        self.rng = random.Random(seed)
+        self.stats = MockServerStats()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_base(self) -> str:
+        """Base URL to use as llm.api_base"""
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> str:
+        """
+        Start serving on the running event loop
+
+        Returns:
+            The API base URL
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, backlog=4096
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock OpenAI server listening on {self.api_base}")
+        return self.api_base
+
+    async def stop(self) -> None:
+        """Stop serving and close open connections"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    def start_in_thread(self) -> str:
+        """
+        Serve from a background thread with its own event loop
+
+        Used when the clients run their own event loops in other threads,
+        as with the threaded controller.
+
+        Returns:
+            The API base URL
+        """
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-openai-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.api_base
+
+    def stop_thread(self) -> None:
+        """Stop a server started with start_in_thread"""
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+
+    def __enter__(self) -> "MockOpenAIServer":
+        self.start_in_thread()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop_thread()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.connections += 1
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    return
+                path, headers, body = request
+                status, payload, extra_headers = await self._respond(path, body, reader)
+                if status is None:
+                    # The client hung up while the request was pending
+                    self.stats.disconnects += 1
+                    return
+                self.stats.status_counts[status] = self.stats.status_counts.get(status, 0) + 1
+                data = json.dumps(payload).encode("utf-8")
+                head = [
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+                    "Content-Type: application/json",
+                    f"Content-Length: {len(data)}",
+                ] + [f"{name}: {value}" for name, value in extra_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.stats.disconnects += 1
+        except asyncio.CancelledError:
+            # Closed by stop(); asyncio's stream server logs handlers that end cancelled
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, Dict[str, str], bytes]]:
+        """Read one request: (path, lowercase headers, body), or None at end of stream"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                raise
+            return None
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        parts = request_line.split(" ")
+        path = parts[1] if len(parts) > 1 else "/"
+        headers = {}
+        for line in header_lines:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        return path, headers, body
+
+    async def _respond(
+        self, path: str, body: bytes, reader: asyncio.StreamReader
+    ) -> Tuple[Optional[int], Dict[str, Any], Dict[str, str]]:
+        """Status, JSON payload and extra headers for a request"""
+        if not path.rstrip("/").endswith("/chat/completions"):
+            return 404, _error(f"Unknown path {path}", "invalid_request_error"), {}
+        try:
+            request = json.loads(body)
+            messages = request["messages"]
+        except (ValueError, KeyError, TypeError):
+            return 400, _error("Invalid chat completion request", "invalid_request_error"), {}
+
+        stats = self.stats
+        stats.requests += 1
+        if self.max_concurrency is not None and stats.in_flight >= self.max_concurrency:
+            stats.rate_limited += 1
+            return (
+                429,
+                _error("Too many concurrent requests", "rate_limit_exceeded"),
+                {"Retry-After": "1"},
+            )
+        if self.rng.random() < self.rate_limit_rate:
+            stats.rate_limited += 1
+            return 429, _error("Rate limit reached", "rate_limit_exceeded"), {"Retry-After": "1"}
+
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        start = time.perf_counter()
+        try:
+            delay = self.latency.sample()
+            if self.rng.random() < self.stall_rate:
+                stats.stalled += 1
+                delay = self.stall_time
+            if delay > 0 and not await _wait_unless_disconnected(reader, delay):
+                return None, {}, {}
+
+            if self.rng.random() < self.error_rate:
+                stats.errors += 1
+                return 500, _error("Injected server error", "server_error"), {}
+
+            prompt = "\n".join(
+                str(m.get("content", "")) for m in messages if m.get("role") == "user"
+            )
+            # One choice per requested completion (the `n` parameter)
+            contents = [
+                synthetic_response(prompt, self.rng, self.edits, self.response_size)
+                for _ in range(max(1, int(request.get("n") or 1)))
+            ]
+            stats.completed += 1
+            stats.total_latency += time.perf_counter() - start
+            return 200, _completion(request.get("model", "mock"), contents), {}
+        finally:
+            stats.in_flight -= 1
+
+
+async def _wait_unless_disconnected(reader: asyncio.StreamReader, delay: float) -> bool:
+    """Sleep for delay seconds; False if the client closed the connection meanwhile"""
+    try:
+        data = await asyncio.wait_for(reader.read(1), timeout=delay)
+    except asyncio.TimeoutError:
+        return True
+    # Clients do not pipeline requests, so data here means end of stream
+    return bool(data)
+
+
+def _error(message: str, code: str) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": code, "code": code}}
+
+
+def _completion(model: str, contents: List[str]) -> Dict[str, Any]:
+    completion_tokens = sum(len(content) for content in contents) // 4
+    return {
+        "id": f"chatcmpl-mock-{random.getrandbits(32):08x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": index,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+            for index, content in enumerate(contents)
+        ],
+        "usage": {
+            "prompt_tokens": 0,
+            "completion_tokens": completion_tokens,
+            "total_tokens": completion_tokens,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency",
+        default=None,
+        help='Response latency, e.g. "constant:0.5", "uniform:0.1,2" or "lognormal:0,0.5"',
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 responses"
+    )
+    parser.add_argument(
+        "--max-concurrency", type=int, default=None, help="Concurrent requests before 429s"
+    )
+    parser.add_argument(
+        "--stall-rate", type=float, default=0.0, help="Fraction of stalled requests"
+    )
+    parser.add_argument(
+        "--stall-time", type=float, default=3600.0, help="Seconds before a stalled request answers"
+    )
+    parser.add_argument(
+        "--response-size", type=int, default=0, help="Pad responses to this many characters"
+    )
+    parser.add_argument("--edits", type=int, default=1, help="Lines changed per response")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = MockOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        max_concurrency=args.max_concurrency,
+        stall_rate=args.stall_rate,
+        stall_time=args.stall_time,
+        response_size=args.response_size,
+        edits=args.edits,
+        seed=args.seed,
+    )
+
+    async def serve() -> None:
+        await server.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info(f"Mock OpenAI server stats: {server.stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,10 @@ OpenAI API interface for LLMs
 
 import asyncio
 import logging
+import threading
 import time
-from typing import Any, Dict, List, Optional, Union
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import openai
 
@@ -14,6 +16,64 @@ from openevolve.llm.base import LLMInterface
 
 logger = logging.getLogger(__name__)
 
+# Async clients are bound to the event loop they were created on, so connection
+# pools are shared per event loop between all models using the same endpoint
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, openai.AsyncOpenAI]]"
+_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_async_client(
+    api_base: str,
+    api_key: Optional[str],
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+) -> openai.AsyncOpenAI:
+    """
+    Get the pooled async client for an endpoint on the running event loop
+
+    Args:
+        api_base: Base URL of the API
+        api_key: API key
+        max_connections: Maximum number of concurrent connections
+        max_keepalive_connections: Maximum number of idle connections kept alive
+        keepalive_expiry: Seconds an idle connection is kept alive
+
+    Returns:
+        AsyncOpenAI client reusing connections across requests
+    """
+    loop = asyncio.get_running_loop()
+    key = (api_base, api_key, max_connections, max_keepalive_connections, keepalive_expiry)
+
+    with _clients_lock:
+        loop_clients = _clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            # Same Limits type as openai's own HTTP client
+            limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=api_base,
+                http_client=openai.DefaultAsyncHttpxClient(limits=limits),
+            )
+            loop_clients[key] = client
+            logger.debug(f"Created async client for {api_base} with {limits}")
+
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close the pooled clients of the running event loop"""
+    with _clients_lock:
+        loop_clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in loop_clients.values():
+        await client.close()
+
 
 class OpenAILLM(LLMInterface):
     """LLM interface using OpenAI-compatible APIs"""
@@ -33,12 +93,12 @@ class OpenAILLM(LLMInterface):
         self.api_base = model_cfg.api_base
         self.api_key = model_cfg.api_key
         self.random_seed = getattr(model_cfg, 'random_seed', None)
+        self.supports_n = getattr(model_cfg, "supports_n", None) is not False
 
-        # Set up API client
-        self.client = openai.OpenAI(
-            api_key=self.api_key,
-            base_url=self.api_base,
-        )
+        # Connection pool settings for the async client
+        self.max_connections = getattr(model_cfg, "max_connections", None)
+        self.max_keepalive_connections = getattr(model_cfg, "max_keepalive_connections", None)
+        self.keepalive_expiry = getattr(model_cfg, "keepalive_expiry", None)
 
         logger.info(f"Initialized OpenAI LLM with model: {self.model}")
 
@@ -54,6 +114,38 @@ class OpenAILLM(LLMInterface):
         self, system_message: str, messages: List[Dict[str, str]], **kwargs
     ) -> str:
         """Generate text using a system message and conversational context"""
+        params = self._build_params(system_message, messages, **kwargs)
+        return await self._call_with_retries(lambda: self._call_api(params), **kwargs)
+
+    async def generate_multiple_with_context(
+        self, system_message: str, messages: List[Dict[str, str]], n: int, **kwargs
+    ) -> List[str]:
+        """
+        Generate n completions for the same context
+
+        With supports_n, the completions are requested in a single call with the
+        `n` parameter, so the prompt's input tokens are sent and billed once.
+        Otherwise they are requested as n concurrent calls.
+        """
+        if n <= 1 or not self.supports_n:
+            return await super().generate_multiple_with_context(
+                system_message, messages, n, **kwargs
+            )
+
+        params = self._build_params(system_message, messages, **kwargs)
+        params["n"] = n
+        responses = await self._call_with_retries(lambda: self._call_api_multiple(params), **kwargs)
+        if len(responses) < n:
+            logger.warning(
+                f"Requested {n} completions from {self.model} but got {len(responses)}; "
+                "set supports_n: false if the endpoint ignores the `n` parameter"
+            )
+        return responses
+
+    def _build_params(
+        self, system_message: str, messages: List[Dict[str, str]], **kwargs
+    ) -> Dict[str, Any]:
+        """Request parameters for a chat completion"""
         # Prepare messages with system message
         formatted_messages = [{"role": "system", "content": system_message}]
         formatted_messages.extend(messages)
@@ -87,14 +179,17 @@ class OpenAILLM(LLMInterface):
             else:
                 params["seed"] = seed
 
-        # Attempt the API call with retries
+        return params
+
+    async def _call_with_retries(self, call: Callable[[], Awaitable[Any]], **kwargs) -> Any:
+        """Attempt an API call with retries, each attempt bounded by the timeout"""
         retries = kwargs.get("retries", self.retries)
         retry_delay = kwargs.get("retry_delay", self.retry_delay)
         timeout = kwargs.get("timeout", self.timeout)
 
         for attempt in range(retries + 1):
             try:
-                response = await asyncio.wait_for(self._call_api(params), timeout=timeout)
+                response = await asyncio.wait_for(call(), timeout=timeout)
                 return response
             except asyncio.TimeoutError:
                 if attempt < retries:
@@ -113,15 +208,31 @@ class OpenAILLM(LLMInterface):
                     logger.error(f"All {retries + 1} attempts failed with error: {str(e)}")
                     raise
 
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        """Pooled async client for the running event loop"""
+        return get_async_client(
+            self.api_base,
+            self.api_key,
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
     async def _call_api(self, params: Dict[str, Any]) -> str:
         """Make the actual API call"""
-        # Use asyncio to run the blocking API call in a thread pool
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None, lambda: self.client.chat.completions.create(**params)
-        )
+        # Native async request: cancelling it (e.g. on timeout) aborts the HTTP call
+        response = await self.client.chat.completions.create(**params)
         # Logging of system prompt, user message and response content
         logger = logging.getLogger(__name__)
         logger.debug(f"API parameters: {params}")
         logger.debug(f"API response: {response.choices[0].message.content}")
         return response.choices[0].message.content
+
+    async def _call_api_multiple(self, params: Dict[str, Any]) -> List[str]:
+        """Make an API call returning all of its completions"""
+        response = await self.client.chat.completions.create(**params)
+        contents = [choice.message.content for choice in response.choices]
+        logger.debug(f"API parameters: {params}")
+        logger.debug(f"API responses: {contents}")
+        return contents
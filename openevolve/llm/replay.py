@@ -0,0 +1,341 @@
+"""
+Recording and replaying LLM responses
+
+RecordingLLM wraps a model and appends every prompt/response pair to a JSONL
+file; ReplayLLM answers from such a file without any network access, so a
+whole evolution run can be reproduced at full speed to profile the rest of
+the pipeline (database, prompts, evaluation, checkpointing).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from openevolve.llm.base import LLMInterface
+from openevolve.llm.openai import OpenAILLM
+
+logger = logging.getLogger(__name__)
+
+REPLAY_MODES = ("record", "replay")
+MATCH_MODES = ("hash", "sequence")
+
+
+def prompt_hash(model: Optional[str], system_message: str, messages: List[Dict[str, str]]) -> str:
+    """
+    Content hash identifying a request
+
+    Args:
+        model: Model name
+        system_message: System message
+        messages: Conversation messages
+
+    Returns:
+        Hex digest of the model and the full conversation
+    """
+    content = json.dumps(
+        [model, system_message, messages], sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+class LatencyDistribution:
+    """
+    Synthetic response latency for replayed requests
+
+    Specified as "name:parameters" in seconds: "constant:S", "uniform:MIN,MAX",
+    "normal:MEAN,STD", "lognormal:MU,SIGMA" or "exponential:MEAN", or
+    "recorded" for the latency measured when the response was recorded.
+    None or "none" means no delay.
+    """
+
+    _DISTRIBUTIONS: Dict[str, Callable[..., float]] = {
+        "constant": lambda rng, value: value,
+        "uniform": lambda rng, low, high: rng.uniform(low, high),
+        "normal": lambda rng, mean, std: rng.gauss(mean, std),
+        "lognormal": lambda rng, mu, sigma: rng.lognormvariate(mu, sigma),
+        "exponential": lambda rng, mean: rng.expovariate(1.0 / mean) if mean > 0 else 0.0,
+    }
+    _ARITY = {"constant": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    def __init__(self, spec: Optional[str] = None, seed: Optional[int] = None):
+        self.spec = spec or "none"
+        self.rng = random.Random(seed)
+
+        name, _, params = self.spec.partition(":")
+        self.name = name.strip().lower()
+        if self.name in ("none", "recorded"):
+            self.params: List[float] = []
+            return
+        if self.name not in self._DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution {self.name!r}, expected one of "
+                f"none, recorded, {', '.join(self._DISTRIBUTIONS)}"
+            )
+        try:
+            self.params = [float(p) for p in params.split(",") if p.strip()]
+        except ValueError:
+            raise ValueError(f"Invalid latency parameters in {self.spec!r}") from None
+        if len(self.params) != self._ARITY[self.name]:
+            raise ValueError(
+                f"Latency distribution {self.name!r} takes {self._ARITY[self.name]} "
+                f"parameter(s), got {self.spec!r}"
+            )
+
+    def sample(self, recorded: Optional[float] = None) -> float:
+        """
+        Draw a latency in seconds
+
+        Args:
+            recorded: Latency measured when the response was recorded
+
+        Returns:
+            Non-negative delay
+        """
+        if self.name == "none":
+            return 0.0
+        if self.name == "recorded":
+            return max(recorded or 0.0, 0.0)
+        return max(self._DISTRIBUTIONS[self.name](self.rng, *self.params), 0.0)
+
+
+class ReplayStore:
+    """
+    Append-only JSONL file of recorded responses
+
+    Each line holds the prompt hash, model, response and latency of one
+    request; prompts themselves are not stored, which keeps recordings small.
+    Stores are shared by all models (and threads) using the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self.records: List[Dict[str, Any]] = []
+        self._by_hash: Dict[str, Deque[int]] = defaultdict(deque)
+        self._next = 0
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        self._index(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A truncated last line from an interrupted recording
+                        logger.warning(f"Skipping invalid record on line {line_number} of {path}")
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        self._by_hash[record["hash"]].append(len(self.records))
+        self.records.append(record)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add a record and write it to the file"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self._index(record)
+
+    def lookup(self, key: Optional[str]) -> Dict[str, Any]:
+        """
+        Find the record to replay for a request
+
+        Args:
+            key: Prompt hash, or None to replay in recording order
+
+        Returns:
+            The record for the prompt if one was recorded (repeated prompts get
+            their recorded responses in turn), else the next record in
+            recording order, starting over once all were replayed
+        """
+        with self._lock:
+            if not self.records:
+                raise RuntimeError(f"No recorded responses to replay in {self.path}")
+            if key is not None:
+                indices = self._by_hash.get(key)
+                if indices:
+                    self.hits += 1
+                    indices.rotate(-1)
+                    return self.records[indices[-1]]
+                self.misses += 1
+                if self.misses == 1:
+                    logger.warning(
+                        f"Prompt not found in {self.path}, replaying responses in recording "
+                        "order for unmatched prompts"
+                    )
+            if self._next == len(self.records):
+                logger.info(f"Replayed all {len(self.records)} responses, starting over")
+                self._next = 0
+            record = self.records[self._next]
+            self._next += 1
+            return record
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_stores: Dict[str, ReplayStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_replay_store(path: str) -> ReplayStore:
+    """Get the store shared by all models recording to or replaying from a file"""
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ReplayStore(path)
+        return store
+
+
+def close_replay_stores() -> None:
+    """Close and forget all open stores"""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+
+class RecordingLLM(LLMInterface):
+    """LLM wrapper saving every response of the wrapped model for later replay"""
+
+    def __init__(self, llm: LLMInterface, path: str):
+        self.llm = llm
+        self.model = getattr(llm, "model", None)
+        self.system_message = getattr(llm, "system_message", None)
+        self.store = get_replay_store(path)
+        logger.info(f"Recording responses of {self.model} to {self.store.path}")
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt"""
+        return await self.generate_with_context(
+            system_message=self.system_message,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs,
+        )
+
+    async def generate_with_context(
+        self, system_message: str, messages: List[Dict[str, str]], **kwargs
+    ) -> str:
+        """Generate text with the wrapped model and record the response"""
+        start = time.perf_counter()
+        response = await self.llm.generate_with_context(system_message, messages, **kwargs)
+        self._record(system_message, messages, [response], time.perf_counter() - start)
+        return response
+
+    async def generate_multiple_with_context(
+        self, system_message: str, messages: List[Dict[str, str]], n: int, **kwargs
+    ) -> List[str]:
+        """Generate n completions with the wrapped model and record each of them"""
+        start = time.perf_counter()
+        responses = await self.llm.generate_multiple_with_context(
+            system_message, messages, n, **kwargs
+        )
+        self._record(system_message, messages, responses, time.perf_counter() - start)
+        return responses
+
+    def _record(
+        self,
+        system_message: str,
+        messages: List[Dict[str, str]],
+        responses: List[str],
+        latency: float,
+    ) -> None:
+        """Save responses to a prompt; replaying them in turn answers repeated prompts"""
+        key = prompt_hash(self.model, system_message, messages)
+        for response in responses:
+            self.store.append(
+                {
+                    "hash": key,
+                    "model": self.model,
+                    "response": response,
+                    "latency": round(latency, 4),
+                }
+            )
+
+
+class ReplayLLM(LLMInterface):
+    """LLM interface answering with recorded responses, without network access"""
+
+    def __init__(self, model_cfg: Any):
+        if not model_cfg.replay_path:
+            raise ValueError("replay_path must be set to replay LLM responses")
+        match = model_cfg.replay_match or "hash"
+        if match not in MATCH_MODES:
+            raise ValueError(f"Unknown replay_match {match!r}, expected one of {MATCH_MODES}")
+
+        self.model = model_cfg.name
+        self.system_message = model_cfg.system_message
+        self.match = match
+        self.latency = LatencyDistribution(
+            model_cfg.replay_latency, getattr(model_cfg, "random_seed", None)
+        )
+        self.store = get_replay_store(model_cfg.replay_path)
+        if not self.store.records:
+            raise ValueError(f"No recorded responses to replay in {model_cfg.replay_path}")
+        logger.info(
+            f"Replaying responses for {self.model} from {self.store.path} "
+            f"({len(self.store.records)} recorded, match by {self.match}, "
+            f"latency {self.latency.spec})"
+        )
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        """Generate text from a prompt"""
+        return await self.generate_with_context(
+            system_message=self.system_message,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs,
+        )
+
+    async def generate_with_context(
+        self, system_message: str, messages: List[Dict[str, str]], **kwargs
+    ) -> str:
+        """Answer with the recorded response, after a simulated latency"""
+        key = prompt_hash(self.model, system_message, messages) if self.match == "hash" else None
+        record = self.store.lookup(key)
+        delay = self.latency.sample(record.get("latency"))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return record["response"]
+
+
+def create_llm(model_cfg: Any) -> LLMInterface:
+    """
+    Create the LLM for a model configuration, honouring its replay_mode
+
+    Args:
+        model_cfg: Model configuration
+
+    Returns:
+        An OpenAILLM, wrapped in a RecordingLLM when recording, or a ReplayLLM
+    """
+    mode = getattr(model_cfg, "replay_mode", None)
+    if mode == "replay":
+        return ReplayLLM(model_cfg)
+    if mode is None:
+        return OpenAILLM(model_cfg)
+    if mode == "record":
+        if not model_cfg.replay_path:
+            raise ValueError("replay_path must be set to record LLM responses")
+        return RecordingLLM(OpenAILLM(model_cfg), model_cfg.replay_path)
+    raise ValueError(f"Unknown replay_mode {mode!r}, expected one of {REPLAY_MODES}")
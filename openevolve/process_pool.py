@@ -0,0 +1,539 @@
+"""
+Process-based evaluation pool for OpenEvolve
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Keys of the resource usage a worker reports for each evaluation
+RESOURCE_USAGE_KEYS = ("wall_time_s", "cpu_time_s", "peak_rss_mb")
+
+
+def _address_space_bytes() -> Optional[int]:
+    """Current virtual address space size of this process, if it can be determined"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _apply_memory_limit(memory_limit_mb: int) -> None:
+    """
+    Limit the address space of the worker (and anything it spawns)
+
+    The limit is applied on top of the warm worker's baseline, because the
+    interpreter and imported libraries (e.g. NumPy thread arenas) already
+    reserve a large amount of virtual memory before any evaluation runs.
+    """
+    baseline = _address_space_bytes() or 0
+    limit = baseline + memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _set_cpu_deadline(cpu_limit: float) -> None:
+    """Allow the worker at most cpu_limit more seconds of CPU time (SIGXCPU afterwards)"""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(used + cpu_limit) + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _cpu_time() -> float:
+    """CPU seconds used so far by this process and its children"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset this process's peak RSS to its current RSS
+
+    ru_maxrss only ever grows over the life of the warm worker, so the peak of
+    a single evaluation is read from VmHWM after resetting it (Linux only).
+
+    Returns:
+        True if the peak was reset and _peak_rss_mb() measures from now on
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak RSS of this process since the last _reset_peak_rss(), in MB"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _load_evaluation_module(evaluation_file: str) -> Any:
+    """Import the evaluation module inside a worker process"""
+    # Add the evaluation file's directory to Python path so it can import local modules
+    eval_dir = os.path.dirname(os.path.abspath(evaluation_file))
+    if eval_dir not in sys.path:
+        sys.path.insert(0, eval_dir)
+
+    spec = importlib.util.spec_from_file_location("evaluation_module", evaluation_file)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Failed to load spec from {evaluation_file}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["evaluation_module"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _worker_main(
+    evaluation_file: str,
+    conn: Any,
+    memory_limit_mb: Optional[int] = None,
+    cpu_limit: Optional[float] = None,
+) -> None:
+    """
+    Entry point of an evaluation worker process
+
+    The evaluation module is imported once, then the worker serves
+    (function_name, program_path) requests until the pipe is closed.
+    """
+    # Lead a new process group so a timeout can kill everything the evaluation spawned
+    if hasattr(os, "setsid"):
+        os.setsid()
+
+    try:
+        module = _load_evaluation_module(evaluation_file)
+        if resource is not None and memory_limit_mb:
+            _apply_memory_limit(memory_limit_mb)
+    except Exception as e:
+        conn.send(("init_error", str(e), traceback.format_exc()))
+        return
+
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+
+        function_name, program_path = request
+        usage = {}
+        if resource is not None:
+            if cpu_limit:
+                _set_cpu_deadline(cpu_limit)
+            cpu_before = _cpu_time()
+        measure_peak = _reset_peak_rss()
+        start_time = time.time()
+
+        try:
+            function = getattr(module, function_name, None)
+            if function is None:
+                raise AttributeError(
+                    f"Evaluation file {evaluation_file} does not contain a '{function_name}' function"
+                )
+            result = function(program_path)
+            status, payload, error_traceback = "ok", result, None
+        except Exception as e:
+            status, payload, error_traceback = "error", e, traceback.format_exc()
+
+        usage["wall_time_s"] = time.time() - start_time
+        if resource is not None:
+            usage["cpu_time_s"] = _cpu_time() - cpu_before
+        peak_rss_mb = _peak_rss_mb() if measure_peak else None
+        if peak_rss_mb is not None:
+            usage["peak_rss_mb"] = peak_rss_mb
+
+        try:
+            conn.send((status, payload, error_traceback, usage))
+        except Exception as e:
+            # The result or exception is not picklable, send a plain description instead
+            description = payload if status == "error" else e
+            conn.send(
+                (
+                    "error",
+                    RuntimeError(f"{type(description).__name__}: {description}"),
+                    error_traceback or traceback.format_exc(),
+                    usage,
+                )
+            )
+
+
+class _Worker:
+    """Handle for a single evaluation worker process"""
+
+    def __init__(
+        self,
+        context: Any,
+        evaluation_file: str,
+        memory_limit_mb: Optional[int] = None,
+        cpu_limit: Optional[float] = None,
+    ):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(evaluation_file, child_conn, memory_limit_mb, cpu_limit),
+            daemon=True,
+            name="EvalProcess",
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.start_time = time.time()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def wait_ready(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until the worker has imported the evaluation module
+
+        Args:
+            timeout: Seconds since the worker was started to wait at most
+
+        Raises:
+            RuntimeError: If the worker failed or did not start in time
+            EOFError: If the worker died during startup
+        """
+        if self.ready:
+            return
+        if timeout is not None:
+            remaining = max(0.0, self.start_time + timeout - time.time())
+            if not self.conn.poll(remaining):
+                raise RuntimeError(f"Evaluation worker did not start within {timeout}s")
+        message = self.conn.recv()
+        if message[0] != "ready":
+            raise RuntimeError(f"Evaluation worker failed to start: {message[1]}\n{message[2]}")
+        self.ready = True
+
+    def kill(self) -> None:
+        """Terminate the worker and every process the evaluation spawned"""
+        try:
+            if self.ready and hasattr(os, "killpg"):
+                # The worker leads its own process group (see _worker_main)
+                try:
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(timeout=5)
+        finally:
+            self.conn.close()
+
+    def close(self) -> None:
+        """Ask the worker to exit and wait for it"""
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=5)
+        except (BrokenPipeError, OSError):
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ProcessEvaluationPool:
+    """
+    Pool of warm worker processes for running evaluation functions
+
+    Each worker imports the evaluation module once and then evaluates programs
+    sent to it over a pipe, so CPU-bound evaluators run in parallel instead of
+    serializing on the GIL. A worker that exceeds the timeout is killed together
+    with its whole process tree and replaced, which guarantees that timed-out
+    evaluations stop consuming CPU and memory.
+
+    Optionally each worker runs under resource limits: memory_limit_mb caps the
+    address space an evaluation may allocate (RLIMIT_AS) and cpu_limit caps the
+    CPU seconds of a single evaluation (RLIMIT_CPU). A worker that has not
+    imported the evaluation module within startup_timeout seconds is replaced.
+
+    Async callers wait for their worker on the pool's own threads, one per
+    worker, so queued evaluations never occupy the event loop's default
+    executor.
+    """
+
+    def __init__(
+        self,
+        evaluation_file: str,
+        num_workers: Optional[int] = None,
+        memory_limit_mb: Optional[int] = None,
+        cpu_limit: Optional[float] = None,
+        startup_timeout: float = 120.0,
+    ):
+        self.evaluation_file = os.path.abspath(evaluation_file)
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit = cpu_limit
+        self.startup_timeout = startup_timeout
+
+        if resource is None and (memory_limit_mb or cpu_limit):
+            logger.warning("Resource limits are not supported on this platform and are ignored")
+
+        self._context = multiprocessing.get_context("spawn")
+        self._idle_workers: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_workers, thread_name_prefix="EvalPool"
+        )
+
+        for _ in range(self.num_workers):
+            self._idle_workers.put(self._spawn_worker())
+
+        logger.info(
+            f"Started process evaluation pool with {self.num_workers} workers "
+            f"for {self.evaluation_file}"
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _spawn_worker(self) -> _Worker:
+        """Start a new worker process and track it"""
+        worker = _Worker(self._context, self.evaluation_file, self.memory_limit_mb, self.cpu_limit)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _replace_worker(self, worker: _Worker) -> _Worker:
+        """Kill a worker and start a fresh one in its place"""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.kill()
+        return self._spawn_worker()
+
+    def evaluate(self, function_name: str, program_path: str, timeout: float) -> Any:
+        """
+        Run an evaluation function in a worker process (blocking)
+
+        Args:
+            function_name: Name of the function in the evaluation module
+            program_path: Path to the program file
+            timeout: Maximum evaluation time in seconds
+
+        Returns:
+            Whatever the evaluation function returned
+
+        Raises:
+            asyncio.TimeoutError: If the evaluation exceeds the timeout
+            Exception: If the evaluation function raises an exception
+        """
+        return self.evaluate_with_usage(function_name, program_path, timeout)[0]
+
+    def evaluate_with_usage(
+        self, function_name: str, program_path: str, timeout: float
+    ) -> Tuple[Any, Dict[str, float]]:
+        """
+        Run an evaluation function in a worker process and measure its resource usage
+
+        Args:
+            function_name: Name of the function in the evaluation module
+            program_path: Path to the program file
+            timeout: Maximum evaluation time in seconds
+
+        Returns:
+            Tuple of (evaluation result, resource usage). Resource usage contains
+            wall_time_s, cpu_time_s and, on Linux, peak_rss_mb (the worker's peak
+            resident memory during this evaluation).
+
+        Raises:
+            asyncio.TimeoutError: If the evaluation exceeds the timeout, or no
+                worker becomes free within it
+            Exception: If the evaluation function raises an exception
+        """
+        if self._closed:
+            raise RuntimeError("Process evaluation pool is closed")
+
+        try:
+            worker = self._idle_workers.get(timeout=timeout)
+        except queue.Empty:
+            raise asyncio.TimeoutError(f"No evaluation worker became free within {timeout}s")
+        try:
+            try:
+                worker.wait_ready(self.startup_timeout)
+            except RuntimeError:
+                worker = self._replace_worker(worker)
+                raise
+            worker.conn.send((function_name, program_path))
+
+            # The deadline starts once the worker has the program
+            if not worker.conn.poll(timeout):
+                logger.warning(
+                    f"Evaluation worker {worker.pid} exceeded {timeout}s, killing and respawning"
+                )
+                worker = self._replace_worker(worker)
+                raise asyncio.TimeoutError(f"Evaluation timed out after {timeout}s")
+
+            message = worker.conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+            worker.process.join(timeout=5)
+            exitcode = worker.process.exitcode
+            worker = self._replace_worker(worker)
+            raise RuntimeError(self._describe_worker_exit(exitcode)) from e
+        finally:
+            if self._closed:
+                worker.close()
+            else:
+                self._idle_workers.put(worker)
+
+        status, payload, error_traceback, usage = message
+        if status == "ok":
+            return payload, usage
+
+        logger.debug(f"Evaluation worker traceback:\n{error_traceback}")
+        raise payload
+
+    def _describe_worker_exit(self, exitcode: Optional[int]) -> str:
+        """Explain why a worker died in the middle of an evaluation"""
+        if exitcode == -getattr(signal, "SIGXCPU", 0):
+            return f"Evaluation exceeded the CPU time limit of {self.cpu_limit}s"
+        if exitcode == -signal.SIGKILL and self.memory_limit_mb:
+            return (
+                f"Evaluation worker was killed (exit code {exitcode}), "
+                f"possibly for exceeding the memory limit of {self.memory_limit_mb}MB"
+            )
+        return f"Evaluation worker exited unexpectedly (exit code {exitcode})"
+
+    async def run_with_usage(
+        self, function_name: str, program_path: str, timeout: float
+    ) -> Tuple[Any, Dict[str, float]]:
+        """
+        Async variant of evaluate_with_usage that does not block the event loop
+
+        Args:
+            function_name: Name of the function in the evaluation module
+            program_path: Path to the program file
+            timeout: Maximum evaluation time in seconds
+
+        Returns:
+            Tuple of (evaluation result, resource usage)
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, self.evaluate_with_usage, function_name, program_path, timeout
+        )
+
+    async def run(self, function_name: str, program_path: str, timeout: float) -> Any:
+        """
+        Run an evaluation function in a worker process without blocking the event loop
+
+        Args:
+            function_name: Name of the function in the evaluation module
+            program_path: Path to the program file
+            timeout: Maximum evaluation time in seconds
+
+        Returns:
+            Whatever the evaluation function returned
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._executor, self.evaluate, function_name, program_path, timeout
+        )
+
+    def shutdown(self) -> None:
+        """Stop all worker processes"""
+        self._closed = True
+        with self._lock:
+            self._workers.clear()
+
+        # Busy workers are closed by their caller once the current evaluation finishes
+        while True:
+            try:
+                worker = self._idle_workers.get_nowait()
+            except queue.Empty:
+                break
+            worker.close()
+        self._executor.shutdown(wait=False)
+
+        logger.info(f"Stopped process evaluation pool for {self.evaluation_file}")
+
+
+# Pools are shared by all evaluators of the same file, so per-thread evaluators
+# do not each start their own set of worker processes
+_shared_pools: Dict[tuple, ProcessEvaluationPool] = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_pool(
+    evaluation_file: str,
+    num_workers: Optional[int] = None,
+    memory_limit_mb: Optional[int] = None,
+    cpu_limit: Optional[float] = None,
+) -> ProcessEvaluationPool:
+    """
+    Get (or start) the process pool for an evaluation file
+
+    Args:
+        evaluation_file: Path to the evaluation file
+        num_workers: Number of worker processes (defaults to the number of CPU cores)
+        memory_limit_mb: Memory an evaluation may allocate, in MB (None = unlimited)
+        cpu_limit: CPU seconds a single evaluation may use (None = unlimited)
+
+    Returns:
+        Shared ProcessEvaluationPool
+    """
+    key = (
+        os.path.abspath(evaluation_file),
+        num_workers or os.cpu_count() or 1,
+        memory_limit_mb,
+        cpu_limit,
+    )
+    with _shared_pools_lock:
+        pool = _shared_pools.get(key)
+        if pool is None or pool.closed:
+            pool = ProcessEvaluationPool(*key)
+            _shared_pools[key] = pool
+        return pool
+
+
+def shutdown_shared_pools() -> None:
+    """Stop all shared process pools"""
+    with _shared_pools_lock:
+        pools = list(_shared_pools.values())
+        _shared_pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_shared_pools)
@@ -2,7 +2,7 @@
 Prompt module initialization
 """
 
-from openevolve.prompt.sampler import PromptSampler
+from openevolve.prompt.sampler import ProgramView, PromptSampler
 from openevolve.prompt.templates import TemplateManager
 
-__all__ = ["PromptSampler", "TemplateManager"]
+__all__ = ["ProgramView", "PromptSampler", "TemplateManager"]
@@ -4,7 +4,8 @@ Prompt sampling for OpenEvolve
 
 import logging
 import random
-from typing import Any, Dict, List, Optional, Tuple, Union
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from openevolve.config import PromptConfig
 from openevolve.prompt.templates import TemplateManager
@@ -14,6 +15,74 @@ from openevolve.utils.metrics_utils import safe_numeric_average
 logger = logging.getLogger(__name__)
 
 
+class ProgramView(Mapping):
+    """
+    Read-only mapping view of a program for prompt construction
+
+    Wraps a Program (or a program dictionary) without copying it: keys are the
+    fields of Program.to_dict and values are read from the program on access,
+    so building a prompt no longer deep-copies metrics, metadata and artifacts.
+    The code is split into lines once and shared by all formatters.
+    """
+
+    __slots__ = ("_program", "_lines")
+
+    def __init__(self, program: Any):
+        self._program = program
+        self._lines: Optional[List[str]] = None
+
+    def __getitem__(self, key: str) -> Any:
+        program = self._program
+        if isinstance(program, Mapping):
+            return program[key]
+        if key in program.__dataclass_fields__:
+            return getattr(program, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        program = self._program
+        if isinstance(program, Mapping):
+            return iter(program)
+        return iter(program.__dataclass_fields__)
+
+    def __len__(self) -> int:
+        program = self._program
+        if isinstance(program, Mapping):
+            return len(program)
+        return len(program.__dataclass_fields__)
+
+    @property
+    def lines(self) -> List[str]:
+        """Lines of the program's code, split on first use"""
+        if self._lines is None:
+            self._lines = (self.get("code") or "").split("\n")
+        return self._lines
+
+    def snippet(self, max_lines: int, marker: str) -> str:
+        """
+        First lines of the program's code
+
+        Args:
+            max_lines: Number of lines to keep
+            marker: Line appended when the code was truncated
+
+        Returns:
+            The snippet
+        """
+        lines = self.lines
+        snippet = "\n".join(lines[:max_lines])
+        if len(lines) > max_lines:
+            snippet += "\n" + marker
+        return snippet
+
+
+def program_view(program: Any) -> ProgramView:
+    """Wrap a Program or program dictionary in a ProgramView, if it is not one already"""
+    if isinstance(program, ProgramView):
+        return program
+    return ProgramView(program)
+
+
 class PromptSampler:
     """Generates prompts for code evolution"""
 
@@ -49,9 +118,9 @@ class PromptSampler:
         current_program: str = "",
         parent_program: str = "",
         program_metrics: Dict[str, float] = {},
-        previous_programs: List[Dict[str, Any]] = [],
-        top_programs: List[Dict[str, Any]] = [],
-        inspirations: List[Dict[str, Any]] = [],  # Add inspirations parameter
+        previous_programs: Sequence[Any] = [],
+        top_programs: Sequence[Any] = [],
+        inspirations: Sequence[Any] = [],  # Add inspirations parameter
         language: str = "python",
         evolution_round: int = 0,
         diff_based_evolution: bool = True,
@@ -62,6 +131,9 @@ class PromptSampler:
         """
         Build a prompt for the LLM
 
+        Programs may be Program objects, ProgramViews or dictionaries as
+        returned by Program.to_dict; they are only read, never copied.
+
         Args:
             current_program: Current program code
             parent_program: Parent program from which current was derived
@@ -102,6 +174,10 @@ class PromptSampler:
             if system_message in self.template_manager.templates:
                 system_message = self.template_manager.get_template(system_message)
 
+        previous_programs = [program_view(p) for p in previous_programs]
+        top_programs = [program_view(p) for p in top_programs]
+        inspirations = [program_view(p) for p in inspirations]
+
         # Format metrics
         metrics_str = self._format_metrics(program_metrics)
 
@@ -159,7 +235,7 @@ class PromptSampler:
         current_program: str,
         parent_program: str,
         metrics: Dict[str, float],
-        previous_programs: List[Dict[str, Any]],
+        previous_programs: Sequence[Mapping],
     ) -> str:
         """Identify potential areas for improvement"""
         # This method could be expanded to include more sophisticated analysis
@@ -227,9 +303,9 @@ class PromptSampler:
 
     def _format_evolution_history(
         self,
-        previous_programs: List[Dict[str, Any]],
-        top_programs: List[Dict[str, Any]],
-        inspirations: List[Dict[str, Any]],
+        previous_programs: Sequence[ProgramView],
+        top_programs: Sequence[ProgramView],
+        inspirations: Sequence[ProgramView],
         language: str,
     ) -> str:
         """Format the evolution history for the prompt"""
@@ -307,10 +383,7 @@ class PromptSampler:
 
         for i, program in enumerate(selected_top):
             # Extract a snippet (first 10 lines) for display
-            program_code = program.get("code", "")
-            program_snippet = "\n".join(program_code.split("\n")[:10])
-            if len(program_code.split("\n")) > 10:
-                program_snippet += "\n# ... (truncated for brevity)"
+            program_snippet = program.snippet(10, "# ... (truncated for brevity)")
 
             # Calculate a composite score using safe numeric average
             score = safe_numeric_average(program.get("metrics", {}))
@@ -360,10 +433,7 @@ class PromptSampler:
 
                 for i, program in enumerate(diverse_programs):
                     # Extract a snippet (first 5 lines for diversity)
-                    program_code = program.get("code", "")
-                    program_snippet = "\n".join(program_code.split("\n")[:5])
-                    if len(program_code.split("\n")) > 5:
-                        program_snippet += "\n# ... (truncated)"
+                    program_snippet = program.snippet(5, "# ... (truncated)")
 
                     # Calculate a composite score using safe numeric average
                     score = safe_numeric_average(program.get("metrics", {}))
@@ -405,7 +475,7 @@ class PromptSampler:
         )
 
     def _format_inspirations_section(
-        self, inspirations: List[Dict[str, Any]], language: str
+        self, inspirations: Sequence[Any], language: str
     ) -> str:
         """
         Format the inspirations section for the prompt
@@ -428,10 +498,8 @@ class PromptSampler:
         
         for i, program in enumerate(inspirations):
             # Extract a snippet (first 8 lines) for display
-            program_code = program.get("code", "")
-            program_snippet = "\n".join(program_code.split("\n")[:8])
-            if len(program_code.split("\n")) > 8:
-                program_snippet += "\n# ... (truncated for brevity)"
+            program = program_view(program)
+            program_snippet = program.snippet(8, "# ... (truncated for brevity)")
             
             # Calculate a composite score using safe numeric average
             score = safe_numeric_average(program.get("metrics", {}))
@@ -458,12 +526,12 @@ class PromptSampler:
             inspiration_programs=inspiration_programs_str.strip()
         )
         
-    def _determine_program_type(self, program: Dict[str, Any]) -> str:
+    def _determine_program_type(self, program: Mapping) -> str:
         """
         Determine the type/category of an inspiration program
         
         Args:
-            program: Program dictionary
+            program: Program view or dictionary
             
         Returns:
             String describing the program type
@@ -489,16 +557,17 @@ class PromptSampler:
         else:
             return "Exploratory"
             
-    def _extract_unique_features(self, program: Dict[str, Any]) -> str:
+    def _extract_unique_features(self, program: Mapping) -> str:
         """
         Extract unique features of an inspiration program
         
         Args:
-            program: Program dictionary
+            program: Program view or dictionary
             
         Returns:
             String describing unique aspects of the program
         """
+        program = program_view(program)
         features = []
         
         # Extract from metadata if available
@@ -527,9 +596,10 @@ class PromptSampler:
                 features.append("NumPy-based implementation")
             if "for" in code_lower and "while" in code_lower:
                 features.append("Mixed iteration strategies")
-            if len(code.split("\n")) < 10:
+            num_lines = len(program.lines)
+            if num_lines < 10:
                 features.append("Concise implementation")
-            elif len(code.split("\n")) > 50:
+            elif num_lines > 50:
                 features.append("Comprehensive implementation")
         
         # Default if no specific features found
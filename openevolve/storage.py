@@ -0,0 +1,740 @@
+"""
+Storage backends for persisting the program database
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from openevolve.code_store import resolve_code_deltas
+from openevolve.utils.metrics_utils import safe_numeric_average
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install openevolve[fast]
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+logger = logging.getLogger(__name__)
+
+METADATA_FILE = "metadata.json"
+MANIFEST_FILE = "manifest.json"
+PROGRAMS_DIR = "programs"
+SQLITE_FILE = "programs.db"
+
+STORAGE_BACKENDS = ("json", "sqlite")
+
+# Record fields left out of program summaries (see ProgramStorage.iter_program_summaries)
+CONTENT_FIELDS = ("code", "artifacts_json", "prompts")
+
+# Program files read per task when loading JSON checkpoints in parallel
+_LOAD_BATCH_SIZE = 256
+
+# Files and directories the backends create inside a database directory
+_STORAGE_FILES = (
+    PROGRAMS_DIR,
+    METADATA_FILE,
+    SQLITE_FILE,
+    f"{SQLITE_FILE}-wal",
+    f"{SQLITE_FILE}-shm",
+)
+
+
+if orjson is not None:
+    JSON_DECODER = "orjson"
+elif ujson is not None:
+    JSON_DECODER = "ujson"
+else:
+    JSON_DECODER = "json"
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode JSON with orjson or ujson when installed, else the json module
+
+    Falls back to the json module for documents the fast decoders reject, such
+    as NaN and Infinity values written by json.dump.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Decoded value
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    elif ujson is not None:
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
+def default_load_workers() -> int:
+    """Threads used to read program files (reading is I/O bound, so more than CPUs)"""
+    return min(8, (os.cpu_count() or 1) + 4)
+
+
+class ProgramStorage(ABC):
+    """
+    Persists program records and database metadata under a directory
+
+    Program records are the dictionaries produced by Program.to_dict, optionally
+    with a "prompts" entry. Metadata is the JSON-serializable state of the
+    database (islands, archive, feature map, ...).
+    """
+
+    backend: str = ""
+
+    def __init__(self, path: str, load_workers: Optional[int] = None):
+        """
+        Args:
+            path: Database or checkpoint directory
+            load_workers: Threads reading records in iter_programs (default_load_workers()
+                if None; backends that read from a single file ignore it)
+        """
+        self.path = path
+        self.load_workers = load_workers or default_load_workers()
+
+    @abstractmethod
+    def write_programs(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace program records
+
+        Args:
+            records: Program records
+
+        Returns:
+            Number of records written
+        """
+
+    @abstractmethod
+    def delete_programs(self, program_ids: Iterable[str]) -> None:
+        """Delete program records, ignoring IDs that are not stored"""
+
+    @abstractmethod
+    def read_program(self, program_id: str) -> Optional[Dict[str, Any]]:
+        """Read one program record, or None if it is not stored"""
+
+    @abstractmethod
+    def iter_programs(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all stored program records"""
+
+    @abstractmethod
+    def program_ids(self) -> List[str]:
+        """IDs of all stored programs"""
+
+    def iter_program_summaries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over program records without their code, artifacts and prompts
+
+        Returns:
+            Records with all other Program fields (id, parent, generation, metrics, ...)
+        """
+        for record in self.iter_programs():
+            yield {k: v for k, v in record.items() if k not in CONTENT_FIELDS}
+
+    def read_content(self, program_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the bulky fields of one program
+
+        Args:
+            program_id: Program ID
+
+        Returns:
+            Dictionary with "code" and "artifacts_json", or None if it is not stored
+        """
+        record = self.read_program(program_id)
+        if record is None:
+            return None
+        return {"code": record.get("code", ""), "artifacts_json": record.get("artifacts_json")}
+
+    @abstractmethod
+    def write_metadata(self, metadata: Dict[str, Any]) -> None:
+        """Replace the database metadata"""
+
+    @abstractmethod
+    def read_metadata(self) -> Optional[Dict[str, Any]]:
+        """Read the database metadata, or None if none was written"""
+
+    def close(self) -> None:
+        """Release any resources held by the backend"""
+
+    def __enter__(self) -> "ProgramStorage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class JsonDirStorage(ProgramStorage):
+    """
+    One JSON file per program plus metadata.json
+
+    This is the original checkpoint layout:
+
+        <path>/metadata.json
+        <path>/programs/<program_id>.json
+    """
+
+    backend = "json"
+
+    def __init__(self, path: str, load_workers: Optional[int] = None):
+        super().__init__(path, load_workers)
+        self.programs_dir = os.path.join(path, PROGRAMS_DIR)
+
+    def write_programs(self, records: Iterable[Dict[str, Any]]) -> int:
+        os.makedirs(self.programs_dir, exist_ok=True)
+        count = 0
+        for record in records:
+            program_path = os.path.join(self.programs_dir, f"{record['id']}.json")
+            with open(program_path, "w") as f:
+                json.dump(record, f)
+            count += 1
+        return count
+
+    def delete_programs(self, program_ids: Iterable[str]) -> None:
+        for program_id in program_ids:
+            try:
+                os.remove(os.path.join(self.programs_dir, f"{program_id}.json"))
+            except FileNotFoundError:
+                pass
+
+    def read_program(self, program_id: str) -> Optional[Dict[str, Any]]:
+        program_path = os.path.join(self.programs_dir, f"{program_id}.json")
+        if not os.path.exists(program_path):
+            return None
+        with open(program_path, "rb") as f:
+            return json_loads(f.read())
+
+    def iter_programs(self) -> Iterator[Dict[str, Any]]:
+        """Read program files, in batches on load_workers threads for large directories"""
+        if not os.path.exists(self.programs_dir):
+            return
+        names = [name for name in os.listdir(self.programs_dir) if name.endswith(".json")]
+        if self.load_workers <= 1 or len(names) <= _LOAD_BATCH_SIZE:
+            yield from self._read_files(names)
+            return
+
+        batches = [names[i : i + _LOAD_BATCH_SIZE] for i in range(0, len(names), _LOAD_BATCH_SIZE)]
+        with ThreadPoolExecutor(
+            max_workers=self.load_workers, thread_name_prefix="checkpoint-load"
+        ) as executor:
+            for records in executor.map(self._read_files, batches):
+                yield from records
+
+    def _read_files(self, names: List[str]) -> List[Dict[str, Any]]:
+        """Read and decode program files, skipping unreadable ones"""
+        records = []
+        for name in names:
+            try:
+                with open(os.path.join(self.programs_dir, name), "rb") as f:
+                    records.append(json_loads(f.read()))
+            except Exception as e:
+                logger.warning(f"Error loading program {name}: {str(e)}")
+        return records
+
+    def program_ids(self) -> List[str]:
+        if not os.path.exists(self.programs_dir):
+            return []
+        return [
+            name[: -len(".json")]
+            for name in os.listdir(self.programs_dir)
+            if name.endswith(".json")
+        ]
+
+    def write_metadata(self, metadata: Dict[str, Any]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, METADATA_FILE), "w") as f:
+            json.dump(metadata, f)
+
+    def read_metadata(self) -> Optional[Dict[str, Any]]:
+        metadata_path = os.path.join(self.path, METADATA_FILE)
+        if not os.path.exists(metadata_path):
+            return None
+        with open(metadata_path, "rb") as f:
+            return json_loads(f.read())
+
+
+class SQLiteStorage(ProgramStorage):
+    """
+    All programs and metadata in a single SQLite database (<path>/programs.db)
+
+    The database runs in WAL mode, so readers such as the visualizer never
+    block checkpoint writes. Records are written in one transaction with
+    executemany. Island, generation and score are indexed columns so that
+    queries do not have to decode every record. Code, artifacts and prompts
+    live in their own columns, leaving the JSON record small.
+    """
+
+    backend = "sqlite"
+
+    # Record fields stored in dedicated columns rather than in the JSON blob
+    _COLUMN_FIELDS = ("id", "code", "artifacts_json", "prompts")
+
+    def __init__(self, path: str, load_workers: Optional[int] = None):
+        super().__init__(path, load_workers)
+        os.makedirs(path, exist_ok=True)
+        self.db_file = os.path.join(path, SQLITE_FILE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS programs (
+                    id TEXT PRIMARY KEY,
+                    island INTEGER,
+                    generation INTEGER,
+                    score REAL,
+                    parent_id TEXT,
+                    code TEXT NOT NULL,
+                    artifacts_json TEXT,
+                    prompts TEXT,
+                    record TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_programs_island ON programs (island);
+                CREATE INDEX IF NOT EXISTS idx_programs_generation ON programs (generation);
+                CREATE INDEX IF NOT EXISTS idx_programs_score ON programs (score);
+                CREATE TABLE IF NOT EXISTS metadata (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                """)
+
+    def _to_row(self, record: Dict[str, Any]) -> tuple:
+        rest = {k: v for k, v in record.items() if k not in self._COLUMN_FIELDS}
+        prompts = record.get("prompts")
+        return (
+            record["id"],
+            (record.get("metadata") or {}).get("island"),
+            record.get("generation"),
+            safe_numeric_average(record.get("metrics") or {}),
+            record.get("parent_id"),
+            record.get("code", ""),
+            record.get("artifacts_json"),
+            json.dumps(prompts) if prompts else None,
+            json.dumps(rest),
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> Dict[str, Any]:
+        program_id, code, artifacts_json, prompts, rest = row
+        record = json_loads(rest)
+        record["id"] = program_id
+        record["code"] = code
+        record["artifacts_json"] = artifacts_json
+        if prompts:
+            record["prompts"] = json_loads(prompts)
+        return record
+
+    _SELECT = "SELECT id, code, artifacts_json, prompts, record FROM programs"
+
+    def write_programs(self, records: Iterable[Dict[str, Any]]) -> int:
+        rows = [self._to_row(record) for record in records]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO programs "
+                "(id, island, generation, score, parent_id, code, artifacts_json, prompts, record) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def delete_programs(self, program_ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM programs WHERE id = ?", [(pid,) for pid in program_ids]
+            )
+
+    def read_program(self, program_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"{self._SELECT} WHERE id = ?", (program_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def iter_programs(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(self._SELECT).fetchall()
+        for row in rows:
+            yield self._from_row(row)
+
+    def program_ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM programs")]
+
+    def iter_program_summaries(self) -> Iterator[Dict[str, Any]]:
+        # Content lives in separate columns, so it is never read or decoded
+        with self._lock:
+            rows = self._conn.execute("SELECT id, record FROM programs").fetchall()
+        for program_id, rest in rows:
+            record = json_loads(rest)
+            record["id"] = program_id
+            yield record
+
+    def read_content(self, program_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT code, artifacts_json FROM programs WHERE id = ?", (program_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"code": row[0], "artifacts_json": row[1]}
+
+    def query_programs(
+        self,
+        island: Optional[int] = None,
+        min_generation: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read programs ordered by score (best first) using the column indexes
+
+        Args:
+            island: Only programs on this island
+            min_generation: Only programs of at least this generation
+            limit: Maximum number of programs to return
+
+        Returns:
+            Program records
+        """
+        conditions, params = [], []
+        if island is not None:
+            conditions.append("island = ?")
+            params.append(island)
+        if min_generation is not None:
+            conditions.append("generation >= ?")
+            params.append(min_generation)
+
+        query = self._SELECT
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY score DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def write_metadata(self, metadata: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in metadata.items()],
+            )
+
+    def read_metadata(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM metadata").fetchall()
+        if not rows:
+            return None
+        return {key: json_loads(value) for key, value in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def detect_backend(path: str) -> str:
+    """
+    Detect the storage backend of an existing database directory
+
+    Args:
+        path: Database or checkpoint directory
+
+    Returns:
+        "sqlite" if the directory contains a SQLite database, otherwise "json"
+    """
+    if os.path.exists(os.path.join(path, SQLITE_FILE)):
+        return "sqlite"
+    return "json"
+
+
+def open_storage(
+    path: str, backend: Optional[str] = None, load_workers: Optional[int] = None
+) -> ProgramStorage:
+    """
+    Open program storage in a directory
+
+    Args:
+        path: Database or checkpoint directory
+        backend: "json" or "sqlite" (detected from the directory contents if None)
+        load_workers: Threads reading program records (default_load_workers() if None)
+
+    Returns:
+        Storage backend instance
+    """
+    backend = backend or detect_backend(path)
+    if backend == "json":
+        return JsonDirStorage(path, load_workers)
+    if backend == "sqlite":
+        return SQLiteStorage(path, load_workers)
+    raise ValueError(f"Unknown storage backend: {backend} (expected one of {STORAGE_BACKENDS})")
+
+
+def import_checkpoint(source: str, destination: str, backend: str = "sqlite") -> int:
+    """
+    Copy a database or checkpoint directory into another storage backend
+
+    Files other than programs and metadata (best program, artifacts, ...) are
+    not copied.
+
+    Args:
+        source: Existing database or checkpoint directory (any backend)
+        destination: Directory to write to
+        backend: Backend to write with
+
+    Returns:
+        Number of programs imported
+    """
+    if (
+        os.path.abspath(source) == os.path.abspath(destination)
+        and detect_backend(source) == backend
+    ):
+        raise ValueError(f"{source} already uses the {backend} backend")
+
+    if read_manifest(source) is not None:
+        # Incremental checkpoints are imported with the segments they build on
+        programs, metadata = read_checkpoint(source)
+        with open_storage(destination, backend) as dst:
+            count = dst.write_programs(programs.values())
+            if metadata is not None:
+                dst.write_metadata(metadata)
+    else:
+        with open_storage(source) as src, open_storage(destination, backend) as dst:
+            metadata = src.read_metadata()
+            count = dst.write_programs(src.iter_programs())
+            if metadata is not None:
+                dst.write_metadata(metadata)
+
+    logger.info(f"Imported {count} programs from {source} into {backend} storage at {destination}")
+    return count
+
+
+def write_manifest(
+    path: str, segments: List[str], removed: Iterable[str], iteration: int = 0
+) -> None:
+    """
+    Mark a checkpoint directory as a delta on top of earlier checkpoints
+
+    Args:
+        path: Checkpoint directory holding the delta
+        segments: Earlier checkpoint directories, oldest (a full checkpoint) first
+        removed: IDs of programs removed since the previous segment
+        iteration: Iteration the checkpoint was taken at
+    """
+    manifest = {
+        "format_version": 1,
+        "iteration": iteration,
+        # Relative, so the checkpoints directory can be moved as a whole
+        "segments": [os.path.relpath(segment, path) for segment in segments],
+        "removed": sorted(removed),
+    }
+    with open(os.path.join(path, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f)
+
+
+@contextmanager
+def staging_directory(path: str) -> Iterator[str]:
+    """
+    Directory to write a checkpoint into before it atomically replaces path
+
+    The staging directory is a sibling of path, so relative paths (as in
+    manifests) are the same from both. On success it is renamed to path,
+    replacing any existing directory there; readers never see a partially
+    written checkpoint. On error it is removed and path is left untouched.
+
+    Args:
+        path: Final checkpoint directory
+
+    Yields:
+        Staging directory to write into
+    """
+    path = os.path.normpath(path)
+    staging = f"{path}.tmp"
+    if os.path.exists(staging):
+        shutil.rmtree(staging)
+    os.makedirs(staging)
+    try:
+        yield staging
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if os.path.exists(path):
+        previous = f"{path}.previous"
+        if os.path.exists(previous):
+            shutil.rmtree(previous)
+        os.rename(path, previous)
+        os.rename(staging, path)
+        shutil.rmtree(previous)
+    else:
+        os.rename(staging, path)
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """Manifest of a delta checkpoint, or None for a full checkpoint"""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def checkpoint_segments(path: str) -> List[Tuple[str, Optional[List[str]]]]:
+    """
+    Directories that make up a checkpoint, in the order they must be applied
+
+    A segment that was compacted after later deltas were written on top of it
+    is a full checkpoint: it replaces all programs of the segments before it,
+    which are then only kept as bases of code deltas.
+
+    Args:
+        path: Checkpoint directory
+
+    Returns:
+        (directory, IDs removed before that directory's programs) pairs, starting
+        with the full checkpoint the chain is based on and ending with path itself.
+        The IDs are None for a full checkpoint replacing all earlier programs.
+    """
+    manifest = read_manifest(path)
+    if manifest is None:
+        return [(path, [])]
+
+    segments = []
+    for relative in manifest.get("segments", []):
+        segment = os.path.normpath(os.path.join(path, relative))
+        if not os.path.isdir(segment):
+            raise FileNotFoundError(
+                f"Checkpoint {path} depends on {segment}, which no longer exists"
+            )
+        segment_manifest = read_manifest(segment)
+        if segment_manifest is not None:
+            segments.append((segment, segment_manifest.get("removed", [])))
+        else:
+            segments.append((segment, None if segments else []))
+    segments.append((path, manifest.get("removed", [])))
+    return segments
+
+
+def read_checkpoint(path: str) -> Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Read all programs and the metadata of a full or incremental checkpoint
+
+    Args:
+        path: Checkpoint (or database) directory
+
+    Returns:
+        Program records by ID, and the checkpoint's metadata
+    """
+    start_time = time.perf_counter()
+    programs: Dict[str, Dict[str, Any]] = {}
+    retired: Dict[str, Dict[str, Any]] = {}
+    for segment, removed in checkpoint_segments(path):
+        for program_id in list(programs) if removed is None else removed:
+            if program_id in programs:
+                retired[program_id] = programs.pop(program_id)
+        with open_storage(segment) as storage:
+            for record in storage.iter_programs():
+                programs[record["id"]] = record
+    with open_storage(path) as storage:
+        metadata = storage.read_metadata()
+
+    # Decode code stored as deltas against other programs (code_delta_compression)
+    code_deltas = {
+        record["id"]: record["code_delta"]
+        for records in (retired, programs)
+        for record in records.values()
+        if record.get("code_delta")
+    }
+    if code_deltas:
+
+        def get_code(program_id: str) -> Optional[str]:
+            record = programs.get(program_id) or retired.get(program_id)
+            return record.get("code") if record is not None else None
+
+        decoded = resolve_code_deltas(code_deltas, get_code)
+        for program_id, record in programs.items():
+            if program_id in code_deltas:
+                record["code"] = decoded.get(program_id, "")
+                del record["code_delta"]
+
+    elapsed = time.perf_counter() - start_time
+    logger.info(
+        f"Read {len(programs)} programs from {path} in {elapsed:.2f}s "
+        f"({len(programs) / max(elapsed, 1e-9):.0f} programs/s, {JSON_DECODER} decoder)"
+    )
+    return programs, metadata
+
+
+def compact_checkpoint(
+    path: str, destination: Optional[str] = None, backend: Optional[str] = None
+) -> int:
+    """
+    Merge a delta checkpoint and the segments it depends on into a full checkpoint
+
+    Args:
+        path: Checkpoint directory
+        destination: Directory for the full checkpoint (path itself if None)
+        backend: Storage backend to write (backend of path if None)
+
+    Returns:
+        Number of programs in the compacted checkpoint
+    """
+    backend = backend or detect_backend(path)
+    destination = destination or path
+    in_place = os.path.abspath(destination) == os.path.abspath(path)
+    if in_place and read_manifest(path) is None and backend == detect_backend(path):
+        with open_storage(path) as storage:
+            return len(storage.program_ids())
+
+    programs, metadata = read_checkpoint(path)
+
+    target = f"{os.path.normpath(path)}.compacting" if in_place else destination
+    if in_place and os.path.exists(target):
+        shutil.rmtree(target)
+    with open_storage(target, backend) as storage:
+        storage.write_programs(programs.values())
+        if metadata is not None:
+            storage.write_metadata(metadata)
+
+    if in_place:
+        # Swap the storage files, keeping the old ones until the manifest is gone
+        # so an interrupted compaction loses nothing
+        previous = f"{os.path.normpath(path)}.previous"
+        os.makedirs(previous, exist_ok=True)
+        for name in _STORAGE_FILES:
+            if os.path.exists(os.path.join(path, name)):
+                os.replace(os.path.join(path, name), os.path.join(previous, name))
+        for name in os.listdir(target):
+            os.replace(os.path.join(target, name), os.path.join(path, name))
+        os.rmdir(target)
+
+    manifest_path = os.path.join(destination, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    if in_place:
+        shutil.rmtree(previous)
+
+    logger.info(f"Compacted checkpoint {path} into {destination} ({len(programs)} programs)")
+    return len(programs)
@@ -12,10 +12,12 @@ from typing import Any, Dict, List, Optional
 
 from openevolve.config import Config
 from openevolve.database import ProgramDatabase
+from openevolve.evaluation_cache import EvaluationCache
 from openevolve.evaluator import Evaluator
 from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.llm.openai import close_async_clients
 from openevolve.prompt.sampler import PromptSampler
-from openevolve.iteration import run_iteration_with_shared_db
+from openevolve.iteration import StageTimings, run_iteration_with_shared_db
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +30,33 @@ class ThreadedEvaluationPool:
     still providing parallelism for I/O-bound LLM calls.
     """
     
-    def __init__(self, config: Config, evaluation_file: str, database: ProgramDatabase):
+    def __init__(
+        self,
+        config: Config,
+        evaluation_file: str,
+        database: ProgramDatabase,
+        evaluation_cache: Optional[EvaluationCache] = None,
+    ):
         self.config = config
         self.evaluation_file = evaluation_file
         self.database = database
+        self.evaluation_cache = evaluation_cache
         
         self.num_workers = config.evaluator.parallel_evaluations
         self.executor = None
         
+        # Worker threads evaluate all children of their prompt concurrently, so the
+        # evaluations running at once are bounded across threads
+        self.evaluation_slots = threading.BoundedSemaphore(self.num_workers)
+        
         # Pre-initialize components for each thread
         self.thread_local = threading.local()
         
+        # Persistent event loops of the worker threads, so LLM connections are
+        # reused across iterations
+        self._thread_loops: List[asyncio.AbstractEventLoop] = []
+        self._thread_loops_lock = threading.Lock()
+        
         logger.info(f"Initializing threaded evaluation pool with {self.num_workers} workers")
     
     def start(self) -> None:
@@ -54,8 +72,32 @@ class ThreadedEvaluationPool:
         if self.executor:
             self.executor.shutdown(wait=True)
             self.executor = None
+        
+        # Worker threads are gone, so their loops can be finished elsewhere. stop() is
+        # usually called from a running event loop, which cannot run another loop,
+        # so they are finished on a separate thread.
+        with self._thread_loops_lock:
+            loops, self._thread_loops = self._thread_loops, []
+        if loops:
+            closer = threading.Thread(
+                target=self._close_loops, args=(loops,), name="EvalWorker-close"
+            )
+            closer.start()
+            closer.join()
         logger.info("Stopped thread pool")
     
+    @staticmethod
+    def _close_loops(loops: List[asyncio.AbstractEventLoop]) -> None:
+        """Close the pooled clients of finished worker event loops, then the loops"""
+        for loop in loops:
+            try:
+                loop.run_until_complete(close_async_clients())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            except Exception as e:
+                logger.warning(f"Error closing worker event loop: {e}")
+            finally:
+                loop.close()
+    
     def submit_evaluation(self, iteration: int) -> Future:
         """
         Submit an evaluation task to the thread pool
@@ -79,20 +121,21 @@ class ThreadedEvaluationPool:
         
         try:
             # Run the iteration
-            result = asyncio.run(run_iteration_with_shared_db(
+            result = self.thread_local.loop.run_until_complete(run_iteration_with_shared_db(
                 iteration,
                 self.config,
                 self.database,  # Shared database (thread-safe reads)
                 self.thread_local.evaluator,
                 self.thread_local.llm_ensemble,
-                self.thread_local.prompt_sampler
+                self.thread_local.prompt_sampler,
+                self.evaluation_slots,
             ))
             
             return result
             
         except Exception as e:
             logger.error(f"Error in thread evaluation {iteration}: {e}")
-            return None
+            return []
     
     def _initialize_thread_components(self) -> None:
         """Initialize components for this thread"""
@@ -100,6 +143,12 @@ class ThreadedEvaluationPool:
         logger.debug(f"Initializing components for thread {thread_id}")
         
         try:
+            # Event loop reused by every iteration run on this thread
+            self.thread_local.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.thread_local.loop)
+            with self._thread_loops_lock:
+                self._thread_loops.append(self.thread_local.loop)
+            
             # Initialize LLM components
             self.thread_local.llm_ensemble = LLMEnsemble(self.config.llm.models)
             self.thread_local.llm_evaluator_ensemble = LLMEnsemble(self.config.llm.evaluator_models)
@@ -116,6 +165,7 @@ class ThreadedEvaluationPool:
                 self.thread_local.llm_evaluator_ensemble,
                 self.thread_local.evaluator_prompt_sampler,
                 database=self.database,
+                cache=self.evaluation_cache,
             )
             
             self.thread_local.initialized = True
@@ -131,19 +181,38 @@ class ImprovedParallelController:
     Controller for improved parallel processing using shared memory and threads
     """
     
-    def __init__(self, config: Config, evaluation_file: str, database: ProgramDatabase):
+    def __init__(
+        self,
+        config: Config,
+        evaluation_file: str,
+        database: ProgramDatabase,
+        evaluation_cache: Optional[EvaluationCache] = None,
+    ):
         self.config = config
         self.evaluation_file = evaluation_file
         self.database = database
+        self.evaluation_cache = evaluation_cache
         
         self.thread_pool = None
         self.database_lock = threading.RLock()  # For database writes
         self.shutdown_flag = threading.Event()  # For graceful shutdown
         
+        # Completion queue of the running evolution loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._completion_queue: Optional[asyncio.Queue] = None
+        
+        # Per-stage durations of completed iterations
+        self.stage_timings = StageTimings()
+        
+        # Island management state
+        self._start_iteration = 0
+        self._programs_per_island = 1
+        self._island_counter = 0
+        
     def start(self) -> None:
         """Start the improved parallel system"""
         self.thread_pool = ThreadedEvaluationPool(
-            self.config, self.evaluation_file, self.database
+            self.config, self.evaluation_file, self.database, self.evaluation_cache
         )
         self.thread_pool.start()
         
@@ -163,7 +232,33 @@ class ImprovedParallelController:
         """Request graceful shutdown (for signal handlers)"""
         logger.info("Graceful shutdown requested...")
         self.shutdown_flag.set()
-    
+
+        # Wake up run_evolution if it is waiting for completions
+        loop, completion_queue = self._loop, self._completion_queue
+        if loop is not None and completion_queue is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(completion_queue.put_nowait, None)
+
+    def _submit_iteration(self, iteration: int, pending_futures: Dict[int, Future]) -> None:
+        """Submit an iteration and report its completion to the completion queue"""
+        loop, completion_queue = self._loop, self._completion_queue
+
+        def on_done(future: Future) -> None:
+            # Called from the worker thread; hand the result over to the event loop
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(completion_queue.put_nowait, (iteration, future))
+
+        future = self._submit(iteration)
+        pending_futures[iteration] = future
+        future.add_done_callback(on_done)
+
+    def _submit(self, iteration: int) -> Future:
+        """Start running an iteration and return a future for its result"""
+        return self.thread_pool.submit_evaluation(iteration)
+
+    def _max_in_flight(self) -> int:
+        """Number of iterations kept running at the same time"""
+        return self.config.evaluator.parallel_evaluations * 2
+
     async def run_evolution(
         self, start_iteration: int, max_iterations: int, target_score: Optional[float] = None,
         checkpoint_callback=None
@@ -186,49 +281,124 @@ class ImprovedParallelController:
             f"for {max_iterations} iterations (total: {total_iterations})"
         )
         
+        # Worker threads report finished iterations through this queue, so results
+        # are handled in completion order without polling
+        self._loop = asyncio.get_running_loop()
+        self._completion_queue = asyncio.Queue()
+        
         # Submit initial batch of evaluations
         pending_futures = {}
-        batch_size = min(self.config.evaluator.parallel_evaluations * 2, max_iterations)
+        batch_size = min(self._max_in_flight(), max_iterations)
         
         for i in range(start_iteration, min(start_iteration + batch_size, total_iterations)):
-            future = self.thread_pool.submit_evaluation(i)
-            pending_futures[i] = future
+            self._submit_iteration(i, pending_futures)
         
         next_iteration_to_submit = start_iteration + batch_size
         completed_iterations = 0
         
         # Island management
-        programs_per_island = max(1, max_iterations // (self.config.database.num_islands * 10))
-        current_island_counter = 0
+        self._start_iteration = start_iteration
+        self._programs_per_island = max(
+            1, max_iterations // (self.config.database.num_islands * 10)
+        )
+        self._island_counter = 0
         
         # Process results as they complete
-        while pending_futures and completed_iterations < max_iterations and not self.shutdown_flag.is_set():
-            # Find completed futures
-            completed_iteration = None
-            for iteration, future in list(pending_futures.items()):
-                if future.done():
-                    completed_iteration = iteration
-                    break
+        target_reached = False
+        while (
+            pending_futures
+            and completed_iterations < max_iterations
+            and not target_reached
+            and not self.shutdown_flag.is_set()
+        ):
+            # Wait for the next completion, then take every other result that is ready
+            ready = [await self._completion_queue.get()]
+            while not self._completion_queue.empty():
+                ready.append(self._completion_queue.get_nowait())
             
-            if completed_iteration is None:
-                # No results ready, wait a bit
-                await asyncio.sleep(0.01)
-                continue
+            for item in ready:
+                if item is None or self.shutdown_flag.is_set():
+                    # Shutdown wake-up
+                    break
+                
+                completed_iteration, future = item
+                pending_futures.pop(completed_iteration, None)
+                
+                target_reached = self._process_result(
+                    completed_iteration, future, target_score, checkpoint_callback
+                )
+                completed_iterations += 1
+                
+                if target_reached or completed_iterations >= max_iterations:
+                    break
+                
+                # Submit next iteration if available
+                if next_iteration_to_submit < total_iterations:
+                    self._submit_iteration(next_iteration_to_submit, pending_futures)
+                    next_iteration_to_submit += 1
+        
+        self._loop = None
+        self._completion_queue = None
+        
+        # Handle shutdown or completion
+        await self._finish_pending(pending_futures)
+        
+        if self.shutdown_flag.is_set():
+            logger.info("Evolution interrupted by shutdown")
+        else:
+            logger.info("Evolution completed")
+
+    async def _finish_pending(self, pending_futures: Dict[int, Future]) -> None:
+        """Cancel or wait for iterations still running when evolution stops"""
+        if self.shutdown_flag.is_set():
+            logger.info("Shutdown requested, canceling remaining evaluations...")
+            # Cancel remaining futures
+            for iteration, future in pending_futures.items():
+                future.cancel()
+                logger.debug(f"Canceled iteration {iteration}")
+        else:
+            # Wait for any remaining futures if not shutting down
+            for iteration, future in pending_futures.items():
+                try:
+                    future.result(timeout=10.0)
+                except Exception as e:
+                    logger.warning(f"Error waiting for iteration {iteration}: {e}")
+
+    def _process_result(
+        self,
+        completed_iteration: int,
+        future: Future,
+        target_score: Optional[float] = None,
+        checkpoint_callback=None,
+    ) -> bool:
+        """
+        Add the result of a completed iteration to the database
+        
+        Args:
+            completed_iteration: Iteration number of the result
+            future: Completed future holding the iteration result
+            target_score: Target score to achieve
+            checkpoint_callback: Called with the iteration number at checkpoint intervals
             
-            # Process completed result
-            future = pending_futures.pop(completed_iteration)
+        Returns:
+            True if the target score was reached
+        """
+        try:
+            # One result per child; several when prompts are sampled more than once
+            results = [r for r in future.result() if r.child_program]
             
-            try:
-                result = future.result()
-                
-                if result and hasattr(result, 'child_program') and result.child_program:
-                    # Thread-safe database update
-                    with self.database_lock:
+            if results:
+                # Thread-safe database update
+                database_start = time.perf_counter()
+                with self.database_lock:
+                    for result in results:
                         self.database.add(result.child_program, iteration=completed_iteration)
                         
                         # Store artifacts if they exist
                         if result.artifacts:
-                            self.database.store_artifacts(result.child_program.id, result.artifacts)
+                            self.database.store_artifacts(
+                                result.child_program.id, result.artifacts
+                            )
                         
                         # Log prompts
                         if hasattr(result, 'prompt') and result.prompt:
@@ -239,25 +409,38 @@ class ImprovedParallelController:
                                 ),
                                 program_id=result.child_program.id,
                                 prompt=result.prompt,
-                                responses=[result.llm_response] if hasattr(result, 'llm_response') else [],
+                                responses=(
+                                    [result.llm_response] if hasattr(result, 'llm_response') else []
+                                ),
                             )
-                        
-                        # Manage island evolution
-                        if completed_iteration > start_iteration and current_island_counter >= programs_per_island:
-                            self.database.next_island()
-                            current_island_counter = 0
-                            logger.debug(f"Switched to island {self.database.current_island}")
-                        
-                        current_island_counter += 1
-                        
-                        # Increment generation for current island
-                        self.database.increment_island_generation()
-                        
-                        # Check migration
-                        if self.database.should_migrate():
-                            logger.info(f"Performing migration at iteration {completed_iteration}")
-                            self.database.migrate_programs()
-                            self.database.log_island_status()
+                    
+                    # Manage island evolution
+                    if (
+                        completed_iteration > self._start_iteration
+                        and self._island_counter >= self._programs_per_island
+                    ):
+                        self.database.next_island()
+                        self._island_counter = 0
+                        logger.debug(f"Switched to island {self.database.current_island}")
+                    
+                    self._island_counter += 1
+                    
+                    # Increment generation for current island
+                    self.database.increment_island_generation()
+                    
+                    # Check migration
+                    if self.database.should_migrate():
+                        logger.info(f"Performing migration at iteration {completed_iteration}")
+                        self.database.migrate_programs()
+                        self.database.log_island_status()
+                
+                database_time = (time.perf_counter() - database_start) / len(results)
+                target_reached = False
+                for result in results:
+                    stage_times = result.stage_times
+                    stage_times["database"] = database_time
+                    stage_times["total"] = sum(stage_times.values())
+                    self.stage_timings.record(stage_times)
                     
                     # Log progress (outside lock)
                     logger.info(
@@ -281,13 +464,6 @@ class ImprovedParallelController:
                             f"{result.child_program.id}"
                         )
                     
-                    # Save checkpoints at intervals
-                    if completed_iteration % self.config.checkpoint_interval == 0:
-                        logger.info(f"Checkpoint interval reached at iteration {completed_iteration}")
-                        self.database.log_island_status()
-                        if checkpoint_callback:
-                            checkpoint_callback(completed_iteration)
-                    
                     # Check target score
                     if target_score is not None and result.child_program.metrics:
                         numeric_metrics = [
@@ -297,40 +473,24 @@ class ImprovedParallelController:
                         if numeric_metrics:
                             avg_score = sum(numeric_metrics) / len(numeric_metrics)
                             if avg_score >= target_score:
-                                logger.info(
-                                    f"Target score {target_score} reached after {completed_iteration} iterations"
-                                )
-                                break
-                else:
-                    logger.warning(f"No valid result from iteration {completed_iteration}")
+                                target_reached = True
                 
-            except Exception as e:
-                logger.error(f"Error processing result from iteration {completed_iteration}: {e}")
-            
-            completed_iterations += 1
+                # Save checkpoints at intervals
+                if completed_iteration % self.config.checkpoint_interval == 0:
+                    logger.info(f"Checkpoint interval reached at iteration {completed_iteration}")
+                    self.database.log_island_status()
+                    if checkpoint_callback:
+                        checkpoint_callback(completed_iteration)
+                
+                if target_reached:
+                    logger.info(
+                        f"Target score {target_score} reached after {completed_iteration} iterations"
+                    )
+                    return True
+            else:
+                logger.warning(f"No valid result from iteration {completed_iteration}")
             
-            # Submit next iteration if available
-            if next_iteration_to_submit < total_iterations:
-                future = self.thread_pool.submit_evaluation(next_iteration_to_submit)
-                pending_futures[next_iteration_to_submit] = future
-                next_iteration_to_submit += 1
-        
-        # Handle shutdown or completion
-        if self.shutdown_flag.is_set():
-            logger.info("Shutdown requested, canceling remaining evaluations...")
-            # Cancel remaining futures
-            for iteration, future in pending_futures.items():
-                future.cancel()
-                logger.debug(f"Canceled iteration {iteration}")
-        else:
-            # Wait for any remaining futures if not shutting down
-            for iteration, future in pending_futures.items():
-                try:
-                    future.result(timeout=10.0)
-                except Exception as e:
-                    logger.warning(f"Error waiting for iteration {iteration}: {e}")
+        except Exception as e:
+            logger.error(f"Error processing result from iteration {completed_iteration}: {e}")
         
-        if self.shutdown_flag.is_set():
-            logger.info("Evolution interrupted by shutdown")
-        else:
-            logger.info("Evolution completed")
\ No newline at end of file
+        return False
@@ -10,12 +10,16 @@ from openevolve.utils.async_utils import (
 )
 from openevolve.utils.code_utils import (
     apply_diff,
+    bounded_edit_distance,
     calculate_edit_distance,
     extract_code_language,
     extract_diffs,
     format_diff_summary,
+    line_edit_distance,
     parse_evolve_blocks,
     parse_full_rewrite,
+    token_edit_distance,
+    tokenize_code,
 )
 from openevolve.utils.format_utils import (
     format_metrics_safe,
@@ -25,6 +29,12 @@ from openevolve.utils.metrics_utils import (
     safe_numeric_average,
     safe_numeric_sum,
 )
+from openevolve.utils.sketch_utils import (
+    MinHasher,
+    SketchIndex,
+    code_shingles,
+    sketch_distance,
+)
 
 __all__ = [
     "TaskPool",
@@ -32,14 +42,22 @@ __all__ = [
     "retry_async",
     "run_in_executor",
     "apply_diff",
+    "bounded_edit_distance",
     "calculate_edit_distance",
     "extract_code_language",
     "extract_diffs",
     "format_diff_summary",
+    "line_edit_distance",
     "parse_evolve_blocks",
     "parse_full_rewrite",
+    "token_edit_distance",
+    "tokenize_code",
     "format_metrics_safe",
     "format_improvement_safe",
     "safe_numeric_average",
     "safe_numeric_sum",
+    "MinHasher",
+    "SketchIndex",
+    "code_shingles",
+    "sketch_distance",
 ]
@@ -3,7 +3,9 @@ Utilities for code parsing, diffing, and manipulation
 """
 
 import re
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 
 def parse_evolve_blocks(code: str) -> List[Tuple[int, int, str]]:
@@ -144,40 +146,180 @@ def format_diff_summary(diff_blocks: List[Tuple[str, str]]) -> str:
     return "\n".join(summary)
 
 
-def calculate_edit_distance(code1: str, code2: str) -> int:
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize_code(code: str) -> List[str]:
+    """
+    Split code into identifier/number tokens and single punctuation characters
+
+    Args:
+        code: Code snippet
+
+    Returns:
+        List of tokens (whitespace is dropped)
+    """
+    return _TOKEN_PATTERN.findall(code)
+
+
+# Columns between checks of the full-column lower bound in bounded_edit_distance
+_BAND_CHECK_INTERVAL = 256
+
+
+def _column_lower_bound(pv: int, mv: int, m: int, top: int, remaining: int) -> int:
+    """
+    Lower bound on the final edit distance from one column of the DP matrix
+
+    Args:
+        pv: Vertical +1 deltas of the column
+        mv: Vertical -1 deltas of the column
+        m: Pattern length (column height minus one)
+        top: Value of the column's first cell
+        remaining: Number of columns still to process
+
+    Returns:
+        Minimum over the column of cell value plus the cost of reaching the
+        bottom-right corner from that cell
+    """
+    num_bytes = (m + 7) // 8
+    plus = np.unpackbits(
+        np.frombuffer(pv.to_bytes(num_bytes, "little"), dtype=np.uint8), bitorder="little"
+    )[:m]
+    minus = np.unpackbits(
+        np.frombuffer(mv.to_bytes(num_bytes, "little"), dtype=np.uint8), bitorder="little"
+    )[:m]
+    column = top + np.concatenate(([0], np.cumsum(plus.astype(np.int64) - minus)))
+    rows_left = m - np.arange(m + 1)
+    return int(np.min(column + np.abs(rows_left - remaining)))
+
+
+def bounded_edit_distance(
+    seq1: Sequence[Hashable], seq2: Sequence[Hashable], max_distance: Optional[int] = None
+) -> int:
+    """
+    Calculate the Levenshtein distance between two sequences
+
+    Uses the bit-parallel algorithm of Myers (1999) in Hyyro's formulation:
+    one column of the DP matrix is held as bit vectors, so each element of the
+    longer sequence costs a handful of integer operations instead of a row of
+    Python-level cell updates. Python integers serve as arbitrary-length words,
+    so sequences longer than 64 elements need no manual blocking.
+
+    Args:
+        seq1: First sequence (string, or list of hashable elements)
+        seq2: Second sequence
+        max_distance: Stop as soon as the distance is known to exceed this cap,
+            i.e. once no cell of the current column can still lead to a
+            distance within the cap
+
+    Returns:
+        Edit distance, or max_distance + 1 if it exceeds max_distance
+    """
+    # The shorter sequence is the pattern, so the bit vectors stay small
+    if len(seq1) > len(seq2):
+        seq1, seq2 = seq2, seq1
+    m, n = len(seq1), len(seq2)
+
+    if max_distance is not None and n - m > max_distance:
+        return max_distance + 1
+    if m == 0:
+        return n
+
+    # Bit i of peq[c] is set where seq1[i] == c
+    peq: Dict[Hashable, int] = {}
+    for i, element in enumerate(seq1):
+        peq[element] = peq.get(element, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    last_bit = 1 << (m - 1)
+    pv = mask  # Vertical +1 deltas
+    mv = 0  # Vertical -1 deltas
+    score = m  # Distance between seq1 and the prefix of seq2 seen so far
+
+    for j, element in enumerate(seq2):
+        eq = peq.get(element, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+
+        if ph & last_bit:
+            score += 1
+        elif mh & last_bit:
+            score -= 1
+
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+
+        if max_distance is not None:
+            remaining = n - j - 1
+            # Each remaining element lowers the score by at most one
+            if score - remaining > max_distance:
+                return max_distance + 1
+            # Every alignment crosses this column, so its cheapest cell bounds the distance
+            if (j + 1) % _BAND_CHECK_INTERVAL == 0 and remaining:
+                if _column_lower_bound(pv, mv, m, j + 1, remaining) > max_distance:
+                    return max_distance + 1
+
+    if max_distance is not None and score > max_distance:
+        return max_distance + 1
+    return score
+
+
+def calculate_edit_distance(code1: str, code2: str, max_distance: Optional[int] = None) -> int:
     """
     Calculate the Levenshtein edit distance between two code snippets
 
     Args:
         code1: First code snippet
         code2: Second code snippet
+        max_distance: Stop early once the distance exceeds this cap
 
     Returns:
-        Edit distance (number of operations needed to transform code1 into code2)
+        Edit distance (number of operations needed to transform code1 into code2),
+        or max_distance + 1 if it exceeds max_distance
     """
     if code1 == code2:
         return 0
+    return bounded_edit_distance(code1, code2, max_distance)
 
-    # Simple implementation of Levenshtein distance
-    m, n = len(code1), len(code2)
-    dp = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
 
-    for i in range(m + 1):
-        dp[i][0] = i
+def line_edit_distance(code1: str, code2: str, max_distance: Optional[int] = None) -> int:
+    """
+    Calculate the number of lines inserted, deleted or replaced between two snippets
 
-    for j in range(n + 1):
-        dp[0][j] = j
+    Trailing whitespace is ignored.
 
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            cost = 0 if code1[i - 1] == code2[j - 1] else 1
-            dp[i][j] = min(
-                dp[i - 1][j] + 1,  # deletion
-                dp[i][j - 1] + 1,  # insertion
-                dp[i - 1][j - 1] + cost,  # substitution
-            )
+    Args:
+        code1: First code snippet
+        code2: Second code snippet
+        max_distance: Stop early once the distance exceeds this cap
+
+    Returns:
+        Line-level edit distance, or max_distance + 1 if it exceeds max_distance
+    """
+    lines1 = [line.rstrip() for line in code1.splitlines()]
+    lines2 = [line.rstrip() for line in code2.splitlines()]
+    return bounded_edit_distance(lines1, lines2, max_distance)
+
+
+def token_edit_distance(code1: str, code2: str, max_distance: Optional[int] = None) -> int:
+    """
+    Calculate the number of tokens inserted, deleted or replaced between two snippets
+
+    Whitespace and formatting are ignored (see tokenize_code).
 
-    return dp[m][n]
+    Args:
+        code1: First code snippet
+        code2: Second code snippet
+        max_distance: Stop early once the distance exceeds this cap
+
+    Returns:
+        Token-level edit distance, or max_distance + 1 if it exceeds max_distance
+    """
+    return bounded_edit_distance(tokenize_code(code1), tokenize_code(code2), max_distance)
 
 
 def extract_code_language(code: str) -> str:
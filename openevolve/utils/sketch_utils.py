@@ -0,0 +1,219 @@
+"""
+MinHash sketches for fast approximate code similarity
+"""
+
+import zlib
+from itertools import islice
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from openevolve.utils.code_utils import tokenize_code
+
+
+def code_shingles(code: str, shingle_size: int = 3) -> np.ndarray:
+    """
+    Hash the token shingles of a code snippet
+
+    Code is split into identifier/number tokens and single punctuation characters,
+    so whitespace and formatting changes do not affect the shingles.
+
+    Args:
+        code: Code snippet
+        shingle_size: Number of consecutive tokens per shingle
+
+    Returns:
+        Array of distinct 32-bit shingle hashes
+    """
+    tokens = tokenize_code(code)
+    if len(tokens) <= shingle_size:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {
+            " ".join(tokens[i : i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)
+        }
+    return np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+class MinHasher:
+    """
+    Computes MinHash sketches of code
+
+    The fraction of equal positions in two sketches estimates the Jaccard
+    similarity of the programs' shingle sets. Hash functions are seeded, so
+    sketches are identical across runs and processes.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+        # Multiply-shift hash functions h(x) = (a * x + b) >> 32 modulo 2**64, a odd
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def sketch(self, code: str) -> np.ndarray:
+        """
+        Compute the sketch of a code snippet
+
+        Args:
+            code: Code snippet
+
+        Returns:
+            Array of num_perm minimum hash values
+        """
+        hashes = code_shingles(code, self.shingle_size)
+        if len(hashes) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        values = (np.outer(self._a, hashes) + self._b[:, None]) >> np.uint64(32)
+        return values.min(axis=1)
+
+
+def sketch_distance(sketch1: np.ndarray, sketch2: np.ndarray) -> float:
+    """
+    Estimate the Jaccard distance between two programs from their sketches
+
+    Args:
+        sketch1: First sketch
+        sketch2: Second sketch
+
+    Returns:
+        Distance between 0.0 (identical) and 1.0 (nothing in common)
+    """
+    return 1.0 - float(np.mean(sketch1 == sketch2))
+
+
+class SketchIndex:
+    """
+    Sketches of a population, stored as rows of one matrix
+
+    Removal swaps the last row into the freed slot, so both insertion and
+    removal are O(1) amortized. Sketches are also bucketed by locality-sensitive
+    hashing: each band of band_size consecutive values is a bucket key, so
+    similar programs are likely to share a bucket in at least one band.
+
+    Nearest-neighbour queries compare against every stored sketch while the
+    population is small. Beyond max_candidates programs they compare only
+    against programs sharing a bucket, topped up with a random sample when
+    fewer than k are found, so a query costs the same at any population size.
+    """
+
+    def __init__(self, num_perm: int, band_size: int = 8, max_candidates: int = 512, seed: int = 0):
+        self.num_perm = num_perm
+        self.band_size = max(1, min(band_size, num_perm))
+        self.max_candidates = max_candidates
+        self._matrix = np.empty((16, num_perm), dtype=np.uint64)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(num_perm // self.band_size)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, program_id: str) -> bool:
+        return program_id in self._rows
+
+    def get(self, program_id: str) -> Optional[np.ndarray]:
+        """Sketch of a program, or None if it is not indexed"""
+        row = self._rows.get(program_id)
+        return None if row is None else self._matrix[row]
+
+    def _band_keys(self, sketch: np.ndarray) -> List[bytes]:
+        """Bucket key of each band of a sketch"""
+        size = self.band_size
+        return [sketch[i * size : (i + 1) * size].tobytes() for i in range(len(self._buckets))]
+
+    def add(self, program_id: str, sketch: np.ndarray) -> None:
+        """Insert or replace the sketch of a program"""
+        row = self._rows.get(program_id)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._matrix):
+                grown = np.empty((2 * len(self._matrix), self.num_perm), dtype=np.uint64)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            self._ids.append(program_id)
+            self._rows[program_id] = row
+        else:
+            self._unbucket(program_id, self._matrix[row])
+        self._matrix[row] = sketch
+        for buckets, key in zip(self._buckets, self._band_keys(sketch)):
+            buckets.setdefault(key, set()).add(program_id)
+
+    def remove(self, program_id: str) -> None:
+        """Remove a program if it is indexed"""
+        row = self._rows.pop(program_id, None)
+        if row is None:
+            return
+        self._unbucket(program_id, self._matrix[row])
+        last_id = self._ids.pop()
+        if last_id != program_id:
+            self._matrix[row] = self._matrix[len(self._ids)]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+
+    def _unbucket(self, program_id: str, sketch: np.ndarray) -> None:
+        """Remove a program from the buckets of its sketch"""
+        for buckets, key in zip(self._buckets, self._band_keys(sketch)):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.discard(program_id)
+                if not bucket:
+                    del buckets[key]
+
+    def _candidate_rows(self, sketch: np.ndarray, k: int, exclude: Optional[str]) -> np.ndarray:
+        """Rows of at most max_candidates programs likely to be nearest to a sketch"""
+        candidates: Set[str] = set()
+        for buckets, key in zip(self._buckets, self._band_keys(sketch)):
+            bucket = buckets.get(key)
+            if bucket:
+                room = self.max_candidates - len(candidates)
+                candidates.update(islice(bucket, room + 1))
+                if len(candidates) > self.max_candidates:
+                    break
+        candidates.discard(exclude)
+        rows = np.fromiter(
+            (self._rows[program_id] for program_id in islice(candidates, self.max_candidates)),
+            dtype=np.intp,
+        )
+        if len(rows) < k:
+            # Too few similar programs: the rest of the neighbours come from a sample
+            sample = self._rng.integers(0, len(self._ids), self.max_candidates - len(rows))
+            excluded_row = self._rows.get(exclude, -1)
+            rows = np.unique(np.concatenate([rows, sample[sample != excluded_row]]))
+        return rows
+
+    def nearest_distance(
+        self, sketch: np.ndarray, k: int = 5, exclude: Optional[str] = None
+    ) -> float:
+        """
+        Average estimated distance to the k most similar stored programs
+
+        Args:
+            sketch: Sketch to compare
+            k: Number of nearest neighbours to average over
+            exclude: Program ID to leave out (usually the program itself)
+
+        Returns:
+            Average distance, or 0.0 if there is nothing to compare against
+        """
+        n = len(self._ids)
+        if n > self.max_candidates:
+            rows = self._candidate_rows(sketch, k, exclude)
+        else:
+            rows = np.arange(n)
+            if exclude in self._rows:
+                rows = np.delete(rows, self._rows[exclude])
+        similarities = (self._matrix[rows] == sketch).mean(axis=1)
+        if len(similarities) == 0:
+            return 0.0
+
+        k = min(k, len(similarities))
+        nearest = np.partition(similarities, len(similarities) - k)[-k:]
+        return 1.0 - float(nearest.mean())
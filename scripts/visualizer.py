@@ -6,6 +6,8 @@ import shutil
 import re as _re
 from flask import Flask, render_template, render_template_string, jsonify
 
+from openevolve.storage import detect_backend, read_checkpoint
+
 
 logger = logging.getLogger("openevolve.visualizer")
 app = Flask(__name__, template_folder="templates")
@@ -27,20 +29,24 @@ def find_latest_checkpoint(base_folder):
 
 
 def load_evolution_data(checkpoint_folder):
-    meta_path = os.path.join(checkpoint_folder, "metadata.json")
-    programs_dir = os.path.join(checkpoint_folder, "programs")
-    if not os.path.exists(meta_path) or not os.path.exists(programs_dir):
+    if detect_backend(checkpoint_folder) == "json" and (
+        not os.path.exists(os.path.join(checkpoint_folder, "metadata.json"))
+        or not os.path.exists(os.path.join(checkpoint_folder, "programs"))
+    ):
         logger.info(f"Missing metadata.json or programs dir in {checkpoint_folder}")
         return {"archive": [], "nodes": [], "edges": [], "checkpoint_dir": checkpoint_folder}
-    with open(meta_path) as f:
-        meta = json.load(f)
+
+    programs, meta = read_checkpoint(checkpoint_folder)
+    meta = meta or {}
 
     nodes = []
     id_to_program = {}
     pids = set()
     for island_idx, id_list in enumerate(meta.get("islands", [])):
         for pid in id_list:
-            prog_path = os.path.join(programs_dir, f"{pid}.json")
+            prog = programs.get(pid)
+            if prog is not None:
+                prog = dict(prog)
 
             # Keep track of PIDs and if one is double, append "-copyN" to the PID
             if pid in pids:
@@ -57,15 +63,13 @@ def load_evolution_data(checkpoint_folder):
                 pid = f"{base_pid}-copy{copy_num}"
             pids.add(pid)
 
-            if os.path.exists(prog_path):
-                with open(prog_path) as pf:
-                    prog = json.load(pf)
+            if prog is not None:
                 prog["id"] = pid
                 prog["island"] = island_idx
                 nodes.append(prog)
                 id_to_program[pid] = prog
             else:
-                logger.debug(f"Program file not found: {prog_path}")
+                logger.debug(f"Program {pid} not found in {checkpoint_folder}")
 
     edges = []
     for prog in nodes:
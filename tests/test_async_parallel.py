@@ -0,0 +1,141 @@
+"""
+Tests for AsyncParallelController in openevolve.async_parallel
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from openevolve.async_parallel import AsyncParallelController
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+
+
+class ConcurrencyTracker:
+    """Records the peak number of concurrent calls"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self.threads = set()
+
+    def enter(self):
+        self.active += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.active)
+        self.threads.add(threading.get_ident())
+
+    def exit(self):
+        self.active -= 1
+
+
+class FakeLLMEnsemble:
+    """LLM returning a valid diff after a delay"""
+
+    def __init__(self, tracker, delay):
+        self.tracker = tracker
+        self.delay = delay
+
+    async def generate_with_context(self, system_message, messages, **kwargs):
+        self.tracker.enter()
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.tracker.exit()
+        return "<<<<<<< SEARCH\nx = 0\n=======\nx = 1\n>>>>>>> REPLACE"
+
+
+class FakeEvaluator:
+    """Evaluator returning fixed metrics after a delay"""
+
+    def __init__(self, tracker, delay):
+        self.tracker = tracker
+        self.delay = delay
+
+    async def evaluate_program(self, program_code, program_id=""):
+        self.tracker.enter()
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.tracker.exit()
+        return {"score": 0.5}
+
+    def get_pending_artifacts(self, program_id):
+        return None
+
+
+class TestAsyncParallelController(unittest.TestCase):
+    """Tests for the asyncio-native controller"""
+
+    def setUp(self):
+        self.eval_file = tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False)
+        self.eval_file.write("def evaluate(program_path):\n    return {'score': 0.5}\n")
+        self.eval_file.close()
+
+        self.config = Config()
+        self.config.database.in_memory = True
+        self.config.database.num_islands = 1
+        self.config.checkpoint_interval = 1000
+        self.config.llm.max_concurrency = 20
+        self.config.evaluator.parallel_evaluations = 2
+
+        self.database = ProgramDatabase(self.config.database)
+        self.database.add(Program(id="root", code="x = 0", metrics={"score": 0.1}))
+
+        self.controller = AsyncParallelController(self.config, self.eval_file.name, self.database)
+        self.controller.start()
+
+        self.llm_tracker = ConcurrencyTracker()
+        self.eval_tracker = ConcurrencyTracker()
+        self.controller.llm_ensemble = FakeLLMEnsemble(self.llm_tracker, 0.05)
+        self.controller.evaluator = FakeEvaluator(self.eval_tracker, 0.01)
+
+    def tearDown(self):
+        self.controller.stop()
+        os.unlink(self.eval_file.name)
+
+    def test_separate_concurrency_limits(self):
+        """Generation and evaluation worker counts are independent"""
+        asyncio.run(self.controller.run_evolution(1, 60))
+
+        self.assertEqual(self.llm_tracker.calls, 60)
+        self.assertEqual(self.eval_tracker.calls, 60)
+        self.assertEqual(self.llm_tracker.peak, 20)
+        self.assertLessEqual(self.eval_tracker.peak, 2)
+        self.assertEqual(len(self.database.programs), 61)
+
+    def test_single_thread(self):
+        """All iterations run on the event loop thread"""
+        asyncio.run(self.controller.run_evolution(1, 10))
+
+        self.assertEqual(self.llm_tracker.threads, {threading.get_ident()})
+        self.assertEqual(self.eval_tracker.threads, {threading.get_ident()})
+
+    def test_target_score_cancels_remaining(self):
+        """Iterations still running when the target is reached are cancelled"""
+        asyncio.run(self.controller.run_evolution(1, 200, target_score=0.5))
+
+        self.assertEqual(len(self.database.programs), 2)
+        self.assertLess(self.llm_tracker.calls, 200)
+        self.assertEqual(self.llm_tracker.active, 0)
+
+    def test_backpressure_bounds_candidate_queue(self):
+        """Slow evaluation fills the candidate queue and blocks the generators"""
+        self.config.candidate_queue_size = 4
+        self.controller.llm_ensemble = FakeLLMEnsemble(self.llm_tracker, 0.001)
+        self.controller.evaluator = FakeEvaluator(self.eval_tracker, 0.02)
+
+        asyncio.run(self.controller.run_evolution(1, 40))
+
+        metrics = self.controller.get_pipeline_metrics()
+        self.assertEqual(metrics["evaluation"]["processed"], 40)
+        self.assertLessEqual(metrics["evaluation"]["max_queue_depth"], 4)
+        self.assertGreater(metrics["generation"]["blocked"], 0.0)
+        self.assertGreater(metrics["evaluation"]["utilisation"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
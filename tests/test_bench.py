@@ -0,0 +1,114 @@
+"""
+Tests for the evolution loop benchmark in openevolve.bench
+"""
+
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from benchmarks.bench_database import COMPLEXITY_BOUNDS, check_complexity, time_operations
+from openevolve.bench import BenchmarkCase, main, run_case
+from openevolve.iteration import StageTimings
+
+
+class TestStageTimings(unittest.TestCase):
+    """Tests for per-stage duration percentiles"""
+
+    def test_percentiles(self):
+        timings = StageTimings(max_samples=100)
+        for i in range(1, 201):
+            timings.record({"evaluate": i / 1000, "llm": 1.0, "sample": 0.5})
+
+        stats = timings.percentiles()
+        self.assertEqual(list(stats), ["sample", "llm", "evaluate"])
+        # Only the latest 100 samples are kept
+        self.assertEqual(stats["evaluate"]["count"], 100)
+        self.assertAlmostEqual(stats["evaluate"]["p50"], 0.150)
+        self.assertAlmostEqual(stats["evaluate"]["p99"], 0.199)
+        self.assertEqual(stats["llm"]["p95"], 1.0)
+        self.assertEqual(timings.count, 200)
+
+
+class TestBench(unittest.TestCase):
+    """Tests for `openevolve-run bench`"""
+
+    def test_bench_writes_results(self):
+        """A short benchmark reports per-stage timings and saves them as JSON"""
+        with tempfile.TemporaryDirectory() as output:
+            with redirect_stdout(io.StringIO()) as stdout:
+                exit_code = main(
+                    [
+                        "--iterations",
+                        "6",
+                        "--parallel-evaluations",
+                        "2",
+                        "--population-size",
+                        "50",
+                        "--controller",
+                        "async",
+                        "--output",
+                        output,
+                    ]
+                )
+            self.assertEqual(exit_code, 0)
+            self.assertIn("async-trivial-p2-pop50-isl5", stdout.getvalue())
+
+            (name,) = os.listdir(output)
+            with open(os.path.join(output, name)) as f:
+                report = json.load(f)
+
+        (case,) = report["cases"]
+        self.assertEqual(case["params"]["parallel_evaluations"], 2)
+        self.assertGreater(case["completed"], 0)
+        self.assertGreater(case["iterations_per_second"], 0)
+        for stage in ("sample", "prompt", "llm", "apply", "evaluate", "database", "total"):
+            self.assertIn("p99", case["stages"][stage])
+        self.assertGreater(case["peak_rss"], 0)
+        self.assertGreater(case["llm_requests"]["completed"], 0)
+
+    def test_samples_per_prompt(self):
+        """Each completion of a multi-sample prompt is evaluated and added as a child"""
+        for controller in ("threaded", "async"):
+            case = BenchmarkCase(
+                iterations=4,
+                parallel_evaluations=2,
+                population_size=50,
+                controller=controller,
+                samples_per_prompt=3,
+            )
+            result = asyncio.run(run_case(case))
+            self.assertEqual(result["completed"], 12, controller)
+            self.assertGreaterEqual(result["llm_requests"]["completed"], 4)
+            self.assertLess(result["llm_requests"]["completed"], 12)
+
+
+class TestDatabaseBenchmark(unittest.TestCase):
+    """Tests for the ProgramDatabase scaling checks in benchmarks/bench_database.py"""
+
+    def test_check_complexity(self):
+        """Operations growing faster than their bound are reported"""
+        timings = {
+            1000: {"add": 1e-4, "sample": 1e-4, "save": 0.1, "get_top_programs": 1e-6},
+            100000: {"add": 1e-2, "sample": 1e-2, "save": 1000.0, "get_top_programs": 1e-6},
+        }
+        failures = check_complexity(timings)
+        # add is linear instead of constant and save quadratic instead of linear
+        self.assertEqual(len(failures), 2)
+        self.assertTrue(failures[0].startswith("add grows as N^1.00"))
+        self.assertTrue(failures[1].startswith("save grows as N^2.00"))
+        # MinHash diversity lookups are bounded, so adding stays sublinear
+        self.assertEqual(len(check_complexity(timings, "diversity-minhash")), 2)
+
+    def test_time_operations(self):
+        """Every checked operation is timed on a small database"""
+        results = time_operations(100)
+        self.assertEqual(set(results), set(COMPLEXITY_BOUNDS))
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for background checkpoint writing in openevolve.checkpoint_writer
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from openevolve.checkpoint_writer import CheckpointWriter
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.storage import open_storage, read_manifest
+
+
+class TestCheckpointWriter(unittest.TestCase):
+    """Tests for snapshots written by CheckpointWriter"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = Config()
+        self.db = ProgramDatabase(self.config.database)
+        self.next_id = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def add_programs(self, count):
+        for _ in range(count):
+            i = self.next_id
+            self.next_id += 1
+            self.db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 100}))
+
+    def path(self, iteration):
+        return os.path.join(self.tmpdir.name, f"checkpoint_{iteration}")
+
+    def load(self, path):
+        loaded = ProgramDatabase(Config().database)
+        loaded.load(path)
+        return loaded
+
+    def test_snapshot_is_isolated(self):
+        """Changes after the snapshot do not leak into the written checkpoint"""
+        self.add_programs(3)
+        self.db.get("p1").metrics["score"] = 0.5
+        snapshot = self.db.snapshot(self.path(1), 1, files={"best_program.py": "x = 1"})
+
+        self.add_programs(2)
+        self.db.get("p1").metrics["score"] = 0.9
+        self.assertFalse(os.path.exists(self.path(1)))
+
+        writer = CheckpointWriter(self.db)
+        writer.submit(snapshot)
+        writer.close()
+
+        loaded = self.load(self.path(1))
+        self.assertEqual(set(loaded.programs), {"p0", "p1", "p2"})
+        self.assertEqual(loaded.get("p1").metrics, {"score": 0.5})
+        with open(os.path.join(self.path(1), "best_program.py")) as f:
+            self.assertEqual(f.read(), "x = 1")
+        self.assertEqual(writer.metrics.summary()["written"], 1)
+        self.assertEqual(writer.pending, 0)
+
+    def test_queued_delta_checkpoints(self):
+        """Delta checkpoints can be snapshotted before the one they build on is written"""
+        self.config.database.incremental_checkpoints = True
+        writer = CheckpointWriter(self.db)
+        for iteration in range(1, 4):
+            self.add_programs(2)
+            writer.submit(self.db.snapshot(self.path(iteration), iteration))
+        writer.close()
+
+        self.assertIsNone(read_manifest(self.path(1)))
+        self.assertEqual(len(read_manifest(self.path(3))["segments"]), 2)
+        with open_storage(self.path(3)) as storage:
+            self.assertEqual(set(storage.program_ids()), {"p4", "p5"})
+        self.assertEqual(set(self.load(self.path(3)).programs), set(self.db.programs))
+
+    def test_failed_write_is_not_visible(self):
+        """A failed write leaves no checkpoint and makes the next checkpoint full"""
+        self.config.database.incremental_checkpoints = True
+        self.add_programs(2)
+        self.db.save(self.path(1), 1)
+        self.add_programs(1)
+
+        writer = CheckpointWriter(self.db, background=False)
+        with patch("openevolve.database.write_manifest", side_effect=OSError("disk full")):
+            writer.submit(self.db.snapshot(self.path(2), 2))
+        self.assertEqual(writer.metrics.failed, 1)
+        self.assertEqual(os.listdir(self.tmpdir.name), ["checkpoint_1"])
+
+        writer.submit(self.db.snapshot(self.path(3), 3))
+        self.assertIsNone(read_manifest(self.path(3)))
+        self.assertEqual(set(self.load(self.path(3)).programs), {"p0", "p1", "p2"})
+
+    def test_queued_delta_on_failed_checkpoint(self):
+        """A delta queued on top of a checkpoint that failed to write is written in full"""
+        self.config.database.incremental_checkpoints = True
+        self.add_programs(2)
+        self.db.save(self.path(1), 1)
+        self.add_programs(1)
+        failing = self.db.snapshot(self.path(2), 2)
+        self.add_programs(1)
+        queued = self.db.snapshot(self.path(3), 3)
+        self.assertEqual(len(queued.segments), 2)
+
+        writer = CheckpointWriter(self.db, background=False)
+        with patch("openevolve.database.write_manifest", side_effect=OSError("disk full")):
+            writer.submit(failing)
+        writer.submit(queued)
+        self.assertEqual(writer.metrics.failed, 1)
+
+        self.assertIsNone(read_manifest(self.path(3)))
+        self.assertEqual(set(self.load(self.path(3)).programs), {"p0", "p1", "p2", "p3"})
+
+
+if __name__ == "__main__":
+    unittest.main()
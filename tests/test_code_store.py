@@ -0,0 +1,121 @@
+"""
+Tests for parent-delta code storage in openevolve.code_store
+"""
+
+import unittest
+
+from openevolve.code_store import (
+    DeltaCodeStore,
+    apply_delta,
+    encode_delta,
+    resolve_code_deltas,
+)
+
+
+def make_code(i: int, lines: int = 40) -> str:
+    return "".join(
+        f"    value_{n} = compute({n}, {i if n == i % lines else 0})\n" for n in range(lines)
+    )
+
+
+class TestDeltas(unittest.TestCase):
+    """Tests for line-level deltas"""
+
+    def test_round_trip(self):
+        """Applying a delta to its base reproduces the code"""
+        base = "def f(x):\n    y = x + 1\n    return y\n"
+        cases = [
+            base,
+            base.replace("x + 1", "x * 2"),
+            "import math\n" + base + "\nprint(f(2))",
+            "",
+            base[:-1],  # No trailing newline
+        ]
+        for code in cases:
+            self.assertEqual(apply_delta(base, encode_delta(base, code)), code)
+            self.assertEqual(apply_delta(code, encode_delta(code, base)), base)
+
+    def test_resolve_chain(self):
+        """Checkpoint deltas resolve through chains of other deltas"""
+        codes = [make_code(i) for i in range(4)]
+        deltas = {
+            f"p{i}": {"base": f"p{i - 1}", "ops": encode_delta(codes[i - 1], codes[i])}
+            for i in range(1, 4)
+        }
+        deltas["orphan"] = {"base": "missing", "ops": []}
+        resolved = resolve_code_deltas(deltas, {"p0": codes[0]}.get)
+        self.assertEqual(resolved, {f"p{i}": codes[i] for i in range(1, 4)})
+
+
+class TestDeltaCodeStore(unittest.TestCase):
+    """Tests for the in-memory delta code store"""
+
+    def test_lineage_is_stored_as_deltas(self):
+        """Children are deltas against their parent and decode to their code"""
+        store = DeltaCodeStore(keyframe_interval=4, cache_size=0)
+        store.put("p0", make_code(0))
+        for i in range(1, 10):
+            store.put(f"p{i}", make_code(i), f"p{i - 1}")
+
+        for i in range(10):
+            self.assertEqual(store.get(f"p{i}"), make_code(i))
+
+        # Depth is bounded: every fourth program is a keyframe
+        self.assertEqual(
+            [store.delta(f"p{i}") is None for i in range(10)], [i % 4 == 0 for i in range(10)]
+        )
+        stats = store.stats()
+        self.assertEqual(stats["keyframes"], 3)
+        self.assertLess(stats["stored_size"], stats["code_size"] / 2)
+
+    def test_unrelated_code_is_a_keyframe(self):
+        """A delta larger than half the code is not used"""
+        store = DeltaCodeStore()
+        store.put("a", make_code(0))
+        self.assertFalse(store.put("b", "completely\ndifferent\n", "a"))
+        self.assertFalse(store.put("c", make_code(1), "missing"))
+        self.assertTrue(store.put("d", make_code(1), "a"))
+
+    def test_discard_keeps_bases(self):
+        """Removed programs stay stored while other programs depend on them"""
+        store = DeltaCodeStore(cache_size=0)
+        store.put("p0", make_code(0))
+        store.put("p1", make_code(1), "p0")
+        store.put("p2", make_code(2), "p1")
+
+        store.discard("p1")
+        self.assertNotIn("p1", store)
+        self.assertEqual(store.get("p2"), make_code(2))
+        self.assertEqual(store.stats()["retained"], 1)
+
+        store.discard("p2")
+        self.assertEqual((store.stats()["programs"], store.stats()["retained"]), (1, 0))
+        store.discard("p0")
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.stats()["stored_size"], 0)
+
+    def test_replace_base(self):
+        """Overwriting a program's code keeps its children decodable"""
+        store = DeltaCodeStore(cache_size=0)
+        store.put("p0", make_code(0))
+        store.put("p1", make_code(1), "p0")
+        store.put("p2", make_code(2), "p1")
+        store.put("p1", "rewritten\n")
+
+        self.assertEqual(store.get("p1"), "rewritten\n")
+        self.assertEqual(store.get("p2"), make_code(2))
+        self.assertIsNone(store.delta("p2"))
+
+    def test_cache_is_bounded(self):
+        """Only the most recently decoded programs are cached"""
+        store = DeltaCodeStore(cache_size=2)
+        store.put("p0", make_code(0))
+        for i in range(1, 5):
+            store.put(f"p{i}", make_code(i), "p0")
+        store.get("p1")
+        self.assertEqual(list(store._cache), ["p4", "p1"])
+        self.assertEqual(store.stats()["cached"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
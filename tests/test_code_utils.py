@@ -2,8 +2,27 @@
 Tests for code utilities in openevolve.utils.code_utils
 """
 
+import random
 import unittest
-from openevolve.utils.code_utils import apply_diff, extract_diffs
+from openevolve.utils.code_utils import (
+    apply_diff,
+    bounded_edit_distance,
+    calculate_edit_distance,
+    extract_diffs,
+    line_edit_distance,
+    token_edit_distance,
+)
+
+
+def reference_edit_distance(a, b):
+    """Textbook dynamic-programming Levenshtein distance"""
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
 
 
 class TestCodeUtils(unittest.TestCase):
@@ -88,6 +107,48 @@ class TestCodeUtils(unittest.TestCase):
             expected_code,
         )
 
+    def test_edit_distance_matches_reference(self):
+        """Bit-parallel edit distance agrees with the DP definition"""
+        rng = random.Random(0)
+        cases = [("", ""), ("", "abc"), ("kitten", "sitting"), ("flaw", "lawn")]
+        for _ in range(200):
+            # Lengths straddle the 64-bit word boundary
+            a = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 140)))
+            b = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 140)))
+            cases.append((a, b))
+
+        for a, b in cases:
+            expected = reference_edit_distance(a, b)
+            self.assertEqual(calculate_edit_distance(a, b), expected)
+            self.assertEqual(calculate_edit_distance(b, a), expected)
+
+    def test_bounded_edit_distance(self):
+        """Distances above the cap are reported as cap + 1"""
+        rng = random.Random(1)
+        for _ in range(100):
+            a = "".join(rng.choice("ab") for _ in range(rng.randint(0, 80)))
+            b = "".join(rng.choice("ab") for _ in range(rng.randint(0, 80)))
+            cap = rng.randint(0, 30)
+            expected = reference_edit_distance(a, b)
+            self.assertEqual(bounded_edit_distance(a, b, cap), min(expected, cap + 1))
+
+        # Long enough for the periodic column check to run
+        for _ in range(20):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(500, 700)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(500, 700)))
+            expected = reference_edit_distance(a, b)
+            for cap in (expected - 1, expected, expected // 2):
+                self.assertEqual(bounded_edit_distance(a, b, cap), min(expected, cap + 1))
+
+    def test_line_and_token_edit_distance(self):
+        """Line and token distances count whole lines and tokens"""
+        code1 = "def f(x):\n    y = x + 1\n    return y\n"
+        code2 = "def f(x):  \n    y = x * 2\n    return y\n    # done\n"
+        self.assertEqual(line_edit_distance(code1, code2), 2)
+        self.assertEqual(token_edit_distance(code1, code2), 4)
+        self.assertEqual(token_edit_distance(code1, code1.replace("    ", "\t")), 0)
+        self.assertEqual(bounded_edit_distance([1, 2, 3], [1, 3]), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
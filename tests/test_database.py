@@ -2,9 +2,14 @@
 Tests for ProgramDatabase in openevolve.database
 """
 
+import random
+import threading
 import unittest
+from types import MappingProxyType
+from unittest.mock import patch
 from openevolve.config import Config
-from openevolve.database import Program, ProgramDatabase
+from openevolve.database import Program, ProgramDatabase, rank_programs, selection_score
+from openevolve.utils.metrics_utils import safe_numeric_average
 
 
 class TestProgramDatabase(unittest.TestCase):
@@ -80,6 +85,283 @@ class TestProgramDatabase(unittest.TestCase):
         self.assertIsNotNone(parent)
         self.assertIn(parent.id, ["test1", "test2"])
 
+    def test_top_programs_match_full_sort(self):
+        """The fitness index orders programs like a stable sort, ties included"""
+        rng = random.Random(0)
+        for i in range(200):
+            self.db.add(
+                Program(
+                    id=f"p{i}",
+                    code=f"x = {i}",
+                    metrics={"score": rng.choice([0.1, 0.2, 0.3, 0.4]), "speed": rng.random()},
+                )
+            )
+
+        programs = list(self.db.programs.values())
+        expected = sorted(programs, key=lambda p: safe_numeric_average(p.metrics), reverse=True)
+        self.assertEqual(
+            [p.id for p in self.db.get_top_programs(20)], [p.id for p in expected[:20]]
+        )
+
+        expected = sorted(programs, key=lambda p: p.metrics["score"], reverse=True)
+        self.assertEqual(
+            [p.id for p in self.db.get_top_programs(20, metric="score")],
+            [p.id for p in expected[:20]],
+        )
+        self.assertEqual(
+            self.db.get_best_program(metric="speed").id,
+            max(programs, key=lambda p: p.metrics["speed"]).id,
+        )
+
+    def test_fitness_index_tracks_removals(self):
+        """Programs removed by the population limit leave the index"""
+        self.db.config.population_size = 10
+        for i in range(30):
+            self.db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 30}))
+
+        top = self.db.get_top_programs(100)
+        self.assertEqual(len(top), len(self.db.programs))
+        self.assertTrue(all(p.id in self.db.programs for p in top))
+        self.assertEqual(top[0].id, "p29")
+
+        # Direct changes to the programs dict are picked up as well
+        del self.db.programs["p29"]
+        self.assertEqual(self.db.get_top_programs(1)[0].id, "p28")
+
+    def test_program_fitness_cache(self):
+        """Fitness is cached and recomputed when metrics are reassigned"""
+        program = Program(id="p", code="", metrics={"a": 0.2, "b": 0.4, "name": "x"})
+        self.assertAlmostEqual(program.fitness, 0.3)
+
+        program.metrics = {"a": 1.0}
+        self.assertEqual(program.fitness, 1.0)
+
+        program.metrics["a"] = 0.0
+        self.assertEqual(program.fitness, 1.0)
+        program.invalidate_fitness()
+        self.assertEqual(program.fitness, 0.0)
+
+        # The cache is not part of the serialized program
+        self.assertNotIn("_fitness", program.to_dict())
+
+    def test_rank_programs(self):
+        """Bulk ranking matches a stable sort by fitness"""
+        rng = random.Random(1)
+        programs = [
+            Program(id=f"p{i}", code="", metrics={"score": rng.choice([0.0, 0.5, 1.0])})
+            for i in range(100)
+        ]
+
+        for reverse in (True, False):
+            expected = sorted(programs, key=lambda p: p.fitness, reverse=reverse)
+            self.assertEqual(
+                [p.id for p in rank_programs(programs, reverse=reverse)],
+                [p.id for p in expected],
+            )
+
+        # Ranking by combined_score where present, as migration does
+        for program in programs[::3]:
+            program.metrics["combined_score"] = rng.random()
+            program.invalidate_fitness()
+        expected = sorted(programs, key=selection_score, reverse=True)
+        self.assertEqual(
+            [p.id for p in rank_programs(programs, key=selection_score)],
+            [p.id for p in expected],
+        )
+
+    def test_population_watermarks(self):
+        """Eviction waits for the high watermark, then shrinks to population_size"""
+        self.db.config.population_size = 10
+        self.db.config.population_high_watermark = 15
+        for i in range(15):
+            self.db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 20}))
+        self.assertEqual(len(self.db.programs), 15)
+
+        self.db.add(Program(id="p15", code="x = 15", metrics={"score": 15 / 20}))
+        self.assertEqual(len(self.db.programs), 10)
+        self.assertEqual(set(self.db.programs), {f"p{i}" for i in range(6, 16)})
+
+        # Evicted programs are gone from the feature map, islands and archive
+        remaining = set(self.db.programs)
+        self.assertTrue(set(self.db.feature_map.values()) <= remaining)
+        self.assertTrue(set().union(*self.db.islands) <= remaining)
+        self.assertTrue(self.db.archive <= remaining)
+
+    def test_eviction_keeps_best_program(self):
+        """The tracked best program survives eviction even with the worst score"""
+        self.db.config.population_size = 3
+        self.db.add(Program(id="best", code="", metrics={"combined_score": 1.0, "penalty": -10}))
+        for i in range(5):
+            self.db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"combined_score": 0.1}))
+
+        self.assertEqual(self.db.best_program_id, "best")
+        self.assertIn("best", self.db.programs)
+        self.assertEqual(len(self.db.programs), 3)
+
+    def test_minhash_diversity(self):
+        """Test the sketch-based diversity feature dimension"""
+        config = Config()
+        config.database.diversity_metric = "minhash"
+        config.database.feature_dimensions = ["diversity"]
+        db = ProgramDatabase(config.database)
+
+        base = "def f(x):\n    return x + 1\n"
+        for i in range(6):
+            db.add(Program(id=f"p{i}", code=base + f"# variant {i}\n", metrics={"score": 0.1}))
+        outlier = Program(
+            id="outlier",
+            code="class Solver:\n    def solve(self, grid):\n        return sorted(grid)[::-1]\n",
+            metrics={"score": 0.1},
+        )
+        db.add(outlier)
+
+        self.assertEqual(len(db._sketch_index), 7)
+        similar_bin = db._calculate_feature_coords(db.get("p0"))[0]
+        outlier_bin = db._calculate_feature_coords(outlier)[0]
+        self.assertLess(similar_bin, outlier_bin)
+
+        # Removed programs leave the sketch index
+        db._remove_program("outlier")
+        self.assertNotIn("outlier", db._sketch_index)
+
+    def test_minhash_diversity_in_read_view(self):
+        """Read views measure diversity without taking the database lock"""
+        config = Config()
+        config.database.diversity_metric = "minhash"
+        config.database.feature_dimensions = ["diversity"]
+        db = ProgramDatabase(config.database)
+        for i in range(8):
+            db.add(Program(id=f"p{i}", code=f"def f(x):\n    return x + {i}\n"))
+        view = db.read_view()
+        expected = db._calculate_feature_coords(db.get("p0"))
+        # Distances the database has not measured are estimated from the view
+        view._sketch_distances.clear()
+
+        results = []
+        with db._index_lock:
+            reader = threading.Thread(
+                target=lambda: results.extend(
+                    view._calculate_feature_coords(view.get(pid)) for pid in ("p0", "p7")
+                )
+            )
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], expected)
+
+    def test_read_view_ignores_unsampled_writes(self):
+        """Artifacts, prompts and generation counters do not make a view stale"""
+        self.db.config.read_view_max_staleness = 0
+        self.db.add(Program(id="p0", code="x = 0", metrics={"score": 0.1}))
+        view = self.db.read_view()
+
+        self.db.store_artifacts("p0", {"stdout": "ok"})
+        self.db.log_prompt("p0", "diff_user", {"system": "s", "user": "u"}, ["r"])
+        self.db.increment_island_generation()
+        self.assertIs(self.db.read_view(), view)
+
+    def test_read_view_is_a_snapshot(self):
+        """Writes after a view is taken do not change it"""
+        self.db.config.read_view_max_staleness = 0
+        for i in range(5):
+            self.db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 10}))
+        view = self.db.read_view()
+        self.assertIs(self.db.read_view(), view)
+
+        self.db.add(Program(id="new", code="y = 1", metrics={"score": 0.9}))
+        self.db._remove_program("p0")
+
+        self.assertEqual(set(view.programs), {f"p{i}" for i in range(5)})
+        self.assertEqual([p.id for p in view.get_top_programs(2)], ["p4", "p3"])
+        self.assertEqual(view.get_best_program().id, "p4")
+        parent, inspirations = view.sample()
+        self.assertIn(parent.id, view.programs)
+        self.assertTrue(all(p.id in view.programs for p in inspirations))
+        with self.assertRaises(TypeError):
+            view.programs["p9"] = parent
+
+        current = self.db.read_view()
+        self.assertEqual(current.version, self.db.version)
+        self.assertIn("new", current.programs)
+        self.assertEqual([p.id for p in current.get_top_programs(1)], ["new"])
+
+    def test_read_view_staleness(self):
+        """Views are reused until they fall more than the configured writes behind"""
+        config = Config()
+        config.database.read_view_max_staleness = 2
+        db = ProgramDatabase(config.database)
+        db.add(Program(id="p0", code="x = 0", metrics={"score": 0.1}))
+        view = db.read_view()
+
+        db.add(Program(id="p1", code="x = 1", metrics={"score": 0.2}))
+        db.next_island()
+        self.assertIs(db.read_view(), view)
+        db.add(Program(id="p2", code="x = 2", metrics={"score": 0.3}))
+        self.assertIsNot(db.read_view(), view)
+        self.assertEqual(len(db.read_view().programs), 3)
+
+    def test_read_view_built_outside_write_lock(self):
+        """Writers only wait while a view copies the index structures"""
+        for i in range(5):
+            self.db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 10}))
+        writer = threading.Thread(
+            target=self.db.add, args=(Program(id="new", code="y = 1", metrics={"score": 0.9}),)
+        )
+
+        def build_mapping(mapping):
+            # Runs after the copies are taken, while the view is still being built
+            if not writer.is_alive() and "new" not in self.db.programs:
+                writer.start()
+                writer.join(timeout=5)
+            return MappingProxyType(mapping)
+
+        with patch("openevolve.database.MappingProxyType", side_effect=build_mapping):
+            view = self.db.read_view()
+
+        self.assertFalse(writer.is_alive())
+        self.assertIn("new", self.db.programs)
+        self.assertNotIn("new", view.programs)
+        self.assertEqual(view.get_best_program().id, "p4")
+
+    def test_sampling_during_writes(self):
+        """Threads sample from views while the population changes"""
+        config = Config()
+        config.database.population_size = 50
+        config.database.num_islands = 3
+        db = ProgramDatabase(config.database)
+        for i in range(20):
+            db.add(Program(id=f"seed{i}", code=f"x = {i}", metrics={"score": random.random()}))
+
+        errors = []
+        stop = threading.Event()
+
+        def sample():
+            try:
+                while not stop.is_set():
+                    view = db.read_view()
+                    parent, inspirations = view.sample()
+                    view.get_top_programs(5)
+                    view.get_artifacts(parent.id)
+                    self.assertIn(parent.id, view.programs)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=sample) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for i in range(500):
+                db.add(Program(id=f"p{i}", code=f"y = {i}", metrics={"score": random.random()}))
+                if i % 50 == 0:
+                    db.migrate_programs()
+                    db.next_island()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(errors, [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,165 @@
+"""
+Tests for the evaluation result cache in openevolve.evaluation_cache
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import EvaluatorConfig
+from openevolve.evaluation_cache import EvaluationCache, normalize_code
+from openevolve.evaluator import Evaluator
+
+
+class TestEvaluationCache(unittest.TestCase):
+    """Tests for the content-addressed evaluation cache"""
+
+    def setUp(self):
+        """Create a test evaluation file"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.eval_file = os.path.join(self.temp_dir, "evaluator.py")
+        self.counter_file = os.path.join(self.temp_dir, "calls.txt")
+        with open(self.eval_file, "w") as f:
+            f.write(f"""
+from openevolve.evaluation_result import EvaluationResult
+
+def evaluate(program_path):
+    with open({self.counter_file!r}, "a") as f:
+        f.write("x")
+    with open(program_path, "r") as f:
+        code = f.read()
+    return EvaluationResult(
+        metrics={{"score": len(code.strip()) / 100.0}},
+        artifacts={{"stdout": "ran", "raw": b"\\x00\\x01"}},
+    )
+""")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _calls(self):
+        if not os.path.exists(self.counter_file):
+            return 0
+        with open(self.counter_file, "r") as f:
+            return len(f.read())
+
+    def _make_evaluator(self, **cache_options):
+        config = EvaluatorConfig()
+        config.cascade_evaluation = False
+        config.max_retries = 0
+        config.cache_evaluations = True
+        for name, value in cache_options.items():
+            setattr(config, name, value)
+        return Evaluator(config=config, evaluation_file=self.eval_file)
+
+    def test_normalize_code(self):
+        """Trailing whitespace and line endings do not change the key"""
+        self.assertEqual(normalize_code("a = 1  \r\nb = 2\n\n"), "a = 1\nb = 2")
+
+        cache = EvaluationCache(self.eval_file)
+        self.assertEqual(cache.key("x = 1\n"), cache.key("x = 1   \n\n"))
+        self.assertNotEqual(cache.key("x = 1"), cache.key("x = 2"))
+
+    def test_identical_program_not_reevaluated(self):
+        """A byte-identical program reuses the cached metrics and artifacts"""
+        evaluator = self._make_evaluator()
+
+        first = asyncio.run(evaluator.evaluate_program("x = 1\n", "p1"))
+        second = asyncio.run(evaluator.evaluate_program("x = 1   \n", "p2"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self._calls(), 1)
+        self.assertEqual(evaluator.get_pending_artifacts("p2")["stdout"], "ran")
+
+        stats = evaluator.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_cached_metrics_are_copies(self):
+        """Mutating returned metrics does not corrupt the cache"""
+        evaluator = self._make_evaluator()
+
+        first = asyncio.run(evaluator.evaluate_program("x = 1", "p1"))
+        first["score"] = -1.0
+        second = asyncio.run(evaluator.evaluate_program("x = 1", "p2"))
+        self.assertNotEqual(second["score"], -1.0)
+
+    def test_memory_lru_bound(self):
+        """The memory tier evicts the least recently used entry"""
+        cache = EvaluationCache(self.eval_file, max_entries=2)
+        cache.put("a", {"score": 1.0})
+        cache.put("b", {"score": 2.0})
+        cache.get("a")
+        cache.put("c", {"score": 3.0})
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+
+    def test_disk_tier_survives_restart(self):
+        """Entries persisted to cache_dir are found by a new evaluator"""
+        cache_dir = os.path.join(self.temp_dir, "cache")
+
+        evaluator = self._make_evaluator(cache_dir=cache_dir)
+        expected = asyncio.run(evaluator.evaluate_program("x = 1", "p1"))
+
+        evaluator = self._make_evaluator(cache_dir=cache_dir)
+        result = asyncio.run(evaluator.evaluate_program("x = 1", "p2"))
+
+        self.assertEqual(result, expected)
+        self.assertEqual(self._calls(), 1)
+        self.assertEqual(evaluator.get_pending_artifacts("p2")["raw"], b"\x00\x01")
+        self.assertEqual(evaluator.cache.stats()["disk_hits"], 1)
+
+    def test_disk_tier_bound(self):
+        """The disk tier keeps at most max_disk_entries entries"""
+        cache_dir = os.path.join(self.temp_dir, "cache")
+        cache = EvaluationCache(
+            self.eval_file, max_entries=1, cache_dir=cache_dir, max_disk_entries=2
+        )
+        for i in range(4):
+            cache.put(f"x = {i}", {"score": float(i)})
+
+        files = [name for _, _, names in os.walk(cache_dir) for name in names]
+        self.assertEqual(len(files), 2)
+        self.assertIsNone(cache.get("x = 0"))
+        self.assertEqual(cache.get("x = 3")[0]["score"], 3.0)
+
+    def test_evaluator_change_invalidates(self):
+        """Editing the evaluation file produces different keys"""
+        key = EvaluationCache(self.eval_file).key("x = 1")
+        with open(self.eval_file, "a") as f:
+            f.write("\n# changed\n")
+        self.assertNotEqual(EvaluationCache(self.eval_file).key("x = 1"), key)
+
+    def test_failures_not_cached(self):
+        """A failed evaluation is not reused for the same code"""
+        with open(self.eval_file, "w") as f:
+            f.write(f"""
+import os
+
+def evaluate_stage1(program_path):
+    if not os.path.exists({self.counter_file!r}):
+        with open({self.counter_file!r}, "w") as f:
+            f.write("x")
+        raise OSError("worker crashed")
+    return {{"score": 0.5}}
+
+def evaluate(program_path):
+    return {{"score": 0.5}}
+""")
+        evaluator = self._make_evaluator(cascade_evaluation=True)
+
+        failed = asyncio.run(evaluator.evaluate_program("x = 1", "p1"))
+        self.assertIn("error", failed)
+        self.assertIsNone(evaluator.cache.get("x = 1"))
+
+        retried = asyncio.run(evaluator.evaluate_program("x = 1", "p2"))
+        self.assertNotIn("error", retried)
+        self.assertEqual(evaluator.cache.get("x = 1")[0], retried)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Tests for OpenAILLM in openevolve.llm.openai
+"""
+
+import asyncio
+import json
+import unittest
+
+from openevolve.config import LLMModelConfig
+from openevolve.llm.openai import OpenAILLM, close_async_clients, get_async_client
+
+
+class FakeOpenAIServer:
+    """Minimal keep-alive HTTP server answering chat completion requests"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self.disconnects = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/v1"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                headers = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in headers.decode("latin-1").split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                await reader.readexactly(length)
+                self.requests += 1
+
+                if self.delay:
+                    # Respond after the delay unless the client hangs up first
+                    try:
+                        if not await asyncio.wait_for(reader.read(1), timeout=self.delay):
+                            self.disconnects += 1
+                            return
+                    except asyncio.TimeoutError:
+                        pass
+                body = json.dumps(
+                    {
+                        "id": "chatcmpl-test",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": "test-model",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": "hello"},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                    }
+                ).encode("utf-8")
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1")
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.disconnects += 1
+        finally:
+            writer.close()
+
+
+class TestOpenAILLM(unittest.TestCase):
+    """Tests for the pooled async OpenAI client"""
+
+    def _make_llm(self, api_base, **overrides):
+        params = dict(
+            name="test-model",
+            api_base=api_base,
+            api_key="test-key",
+            system_message="system",
+            temperature=0.7,
+            top_p=0.95,
+            max_tokens=16,
+            timeout=5,
+            retries=0,
+            retry_delay=0,
+            max_connections=10,
+            max_keepalive_connections=5,
+            keepalive_expiry=30.0,
+        )
+        params.update(overrides)
+        return OpenAILLM(LLMModelConfig(**params))
+
+    def test_connections_are_reused(self):
+        """Sequential requests share one keep-alive connection"""
+
+        async def run():
+            server = FakeOpenAIServer()
+            api_base = await server.start()
+            llm = self._make_llm(api_base)
+            try:
+                for _ in range(5):
+                    self.assertEqual(await llm.generate("hi"), "hello")
+            finally:
+                await close_async_clients()
+                await server.stop()
+            return server
+
+        server = asyncio.run(run())
+        self.assertEqual(server.requests, 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_client_shared_per_loop(self):
+        """Models on the same endpoint share a client within an event loop"""
+
+        async def get_clients():
+            first = self._make_llm("http://localhost:1/v1").client
+            second = self._make_llm("http://localhost:1/v1", name="other-model").client
+            other = self._make_llm("http://localhost:2/v1").client
+            await close_async_clients()
+            return first, second, other
+
+        first, second, other = asyncio.run(get_clients())
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+        first_again, _, _ = asyncio.run(get_clients())
+        self.assertIsNot(first, first_again)
+
+    def test_timeout_cancels_request(self):
+        """A timed-out request is aborted instead of left running"""
+
+        async def run():
+            server = FakeOpenAIServer(delay=10.0)
+            api_base = await server.start()
+            llm = self._make_llm(api_base, timeout=0.5)
+            try:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await llm.generate("hi")
+                # Give the server a moment to notice the closed connection
+                for _ in range(20):
+                    if server.disconnects:
+                        break
+                    await asyncio.sleep(0.05)
+            finally:
+                await close_async_clients()
+                await server.stop()
+            return server
+
+        server = asyncio.run(run())
+        self.assertEqual(server.requests, 1)
+        self.assertEqual(server.disconnects, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for recording and replaying LLM responses in openevolve.llm.replay
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from openevolve.config import LLMConfig, LLMModelConfig
+from openevolve.llm.base import LLMInterface
+from openevolve.llm.ensemble import LLMEnsemble
+from openevolve.llm.replay import (
+    LatencyDistribution,
+    RecordingLLM,
+    ReplayLLM,
+    close_replay_stores,
+)
+
+
+class EchoLLM(LLMInterface):
+    """Answers with the number of calls so far and the last message"""
+
+    def __init__(self):
+        self.model = "echo"
+        self.system_message = "system"
+        self.calls = 0
+
+    async def generate(self, prompt, **kwargs):
+        return await self.generate_with_context(
+            self.system_message, [{"role": "user", "content": prompt}]
+        )
+
+    async def generate_with_context(self, system_message, messages, **kwargs):
+        self.calls += 1
+        return f"{self.calls}: {messages[-1]['content']}"
+
+
+class TestReplay(unittest.TestCase):
+    """Tests for RecordingLLM and ReplayLLM"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "responses.jsonl")
+
+    def tearDown(self):
+        close_replay_stores()
+        self.tmpdir.cleanup()
+
+    def record(self, prompts):
+        llm = RecordingLLM(EchoLLM(), self.path)
+        responses = [asyncio.run(llm.generate(prompt)) for prompt in prompts]
+        close_replay_stores()
+        return responses
+
+    def replay_llm(self, **params):
+        params.setdefault("replay_path", self.path)
+        return ReplayLLM(LLMModelConfig(name="echo", system_message="system", **params))
+
+    def test_replay_by_hash(self):
+        """Prompts get the responses recorded for them, repeated prompts in turn"""
+        recorded = self.record(["a", "b", "a"])
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        llm = self.replay_llm()
+        replayed = [asyncio.run(llm.generate(prompt)) for prompt in ["b", "a", "a", "a"]]
+        self.assertEqual(replayed, [recorded[1], recorded[0], recorded[2], recorded[0]])
+        self.assertEqual(llm.store.hits, 4)
+
+        # Unknown prompts fall back to recording order
+        self.assertEqual(asyncio.run(llm.generate("c")), recorded[0])
+        self.assertEqual(llm.store.misses, 1)
+
+    def test_replay_multiple_completions(self):
+        """Every completion of a multi-sample request is recorded and replayed"""
+        llm = RecordingLLM(EchoLLM(), self.path)
+        messages = [{"role": "user", "content": "a"}]
+        recorded = asyncio.run(llm.generate_multiple_with_context("system", messages, n=3))
+        close_replay_stores()
+        self.assertEqual(len(set(recorded)), 3)
+
+        replayed = asyncio.run(
+            self.replay_llm().generate_multiple_with_context("system", messages, n=3)
+        )
+        self.assertEqual(sorted(replayed), sorted(recorded))
+
+    def test_replay_in_sequence(self):
+        """Sequence mode replays in recording order and starts over at the end"""
+        recorded = self.record(["a", "b"])
+        llm = self.replay_llm(replay_match="sequence")
+        replayed = [asyncio.run(llm.generate("x")) for _ in range(3)]
+        self.assertEqual(replayed, [recorded[0], recorded[1], recorded[0]])
+
+    def test_replay_latency(self):
+        """Replayed responses wait for the configured latency"""
+        self.record(["a"])
+        llm = self.replay_llm(replay_latency="constant:0.05")
+        start = time.perf_counter()
+        asyncio.run(llm.generate("a"))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+        uniform = LatencyDistribution("uniform:0.1,0.2", seed=1)
+        samples = [uniform.sample() for _ in range(100)]
+        self.assertTrue(all(0.1 <= s <= 0.2 for s in samples))
+        same_seed = LatencyDistribution("uniform:0.1,0.2", seed=1)
+        self.assertEqual(samples, [same_seed.sample() for _ in range(100)])
+        self.assertEqual(LatencyDistribution("recorded").sample(0.3), 0.3)
+        self.assertEqual(LatencyDistribution(None).sample(0.3), 0.0)
+        with self.assertRaises(ValueError):
+            LatencyDistribution("uniform:1")
+        with self.assertRaises(ValueError):
+            LatencyDistribution("gamma:1,2")
+
+    def test_ensemble_replays_from_config(self):
+        """Setting replay_mode in the LLM config makes the ensemble replay offline"""
+        with open(self.path, "w") as f:
+            f.write(json.dumps({"hash": "0", "model": "m", "response": "hi", "latency": 1.0}))
+            f.write("\n{truncated")
+
+        config = LLMConfig(replay_mode="replay", replay_path=self.path)
+        ensemble = LLMEnsemble(config.models)
+        self.assertTrue(all(isinstance(model, ReplayLLM) for model in ensemble.models))
+        self.assertEqual(asyncio.run(ensemble.generate_with_context("s", [])), "hi")
+
+        with self.assertRaises(ValueError):
+            LLMEnsemble(LLMConfig(replay_mode="record").models)
+
+
+if __name__ == "__main__":
+    unittest.main()
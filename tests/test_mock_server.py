@@ -0,0 +1,159 @@
+"""
+Tests for the mock OpenAI-compatible server in openevolve.llm.mock_server
+"""
+
+import asyncio
+import random
+import unittest
+
+from openevolve.config import Config, LLMModelConfig
+from openevolve.llm.mock_server import MockOpenAIServer, synthetic_response
+from openevolve.llm.openai import OpenAILLM, close_async_clients
+from openevolve.prompt.sampler import PromptSampler
+from openevolve.utils.code_utils import apply_diff, extract_diffs, parse_full_rewrite
+
+PROGRAM = """import math
+
+# EVOLVE-BLOCK-START
+def evolve(x):
+    step = 0.25
+    return math.sin(x) * step
+# EVOLVE-BLOCK-END
+
+def run():
+    return evolve(3)
+"""
+
+
+class TestMockServer(unittest.TestCase):
+    """Tests for MockOpenAIServer"""
+
+    def setUp(self):
+        config = Config()
+        config.prompt.use_template_stochasticity = False
+        self.sampler = PromptSampler(config.prompt)
+
+    def prompt(self, diff_based=True):
+        return self.sampler.build_prompt(
+            current_program=PROGRAM,
+            program_metrics={"score": 0.5},
+            diff_based_evolution=diff_based,
+        )
+
+    def make_llm(self, api_base, retries=0):
+        return OpenAILLM(
+            LLMModelConfig(
+                name="mock",
+                api_base=api_base,
+                api_key="test-key",
+                system_message="system",
+                temperature=0.7,
+                top_p=0.95,
+                max_tokens=16,
+                timeout=5,
+                retries=retries,
+                retry_delay=0,
+            )
+        )
+
+    def test_synthetic_responses(self):
+        """Responses change only the EVOLVE-BLOCK and parse as diffs or rewrites"""
+        rng = random.Random(0)
+        for _ in range(10):
+            response = synthetic_response(self.prompt()["user"], rng, edits=2)
+            diffs = extract_diffs(response)
+            self.assertEqual(len(diffs), 2)
+            child = apply_diff(PROGRAM, response)
+            self.assertNotEqual(child, PROGRAM)
+            self.assertTrue(child.endswith("def run():\n    return evolve(3)\n"))
+
+        response = synthetic_response(
+            self.prompt(diff_based=False)["user"], rng, response_size=2000
+        )
+        self.assertGreaterEqual(len(response), 2000)
+        rewrite = parse_full_rewrite(response)
+        self.assertNotEqual(rewrite, PROGRAM.strip())
+        self.assertTrue(rewrite.startswith("import math"))
+
+    def test_chat_completions(self):
+        """OpenAILLM gets synthetic diffs over keep-alive connections"""
+
+        async def run():
+            server = MockOpenAIServer(latency="constant:0.01", seed=0)
+            llm = self.make_llm(await server.start())
+            prompt = self.prompt()
+            try:
+                responses = await asyncio.gather(
+                    *[
+                        llm.generate_with_context(
+                            prompt["system"], [{"role": "user", "content": prompt["user"]}]
+                        )
+                        for _ in range(20)
+                    ]
+                )
+            finally:
+                await close_async_clients()
+                await server.stop()
+            return server, responses
+
+        server, responses = asyncio.run(run())
+        self.assertTrue(all(extract_diffs(response) for response in responses))
+        stats = server.stats.summary()
+        self.assertEqual(stats["completed"], 20)
+        self.assertEqual(stats["status_counts"], {200: 20})
+        self.assertGreater(stats["max_in_flight"], 1)
+
+    def test_multiple_completions(self):
+        """Several completions come from one request with `n`, else from concurrent requests"""
+
+        async def run(supports_n):
+            server = MockOpenAIServer(seed=0)
+            llm = self.make_llm(await server.start())
+            llm.supports_n = supports_n
+            prompt = self.prompt()
+            try:
+                responses = await llm.generate_multiple_with_context(
+                    prompt["system"], [{"role": "user", "content": prompt["user"]}], n=3
+                )
+            finally:
+                await close_async_clients()
+                await server.stop()
+            return server, responses
+
+        for supports_n, requests in ((True, 1), (False, 3)):
+            server, responses = asyncio.run(run(supports_n))
+            self.assertEqual(len(responses), 3)
+            self.assertEqual(len(set(responses)), 3)
+            self.assertTrue(all(extract_diffs(response) for response in responses))
+            self.assertEqual(server.stats.completed, requests)
+
+    def test_injected_failures(self):
+        """Errors and rate limiting are retried by the client; stalls hit its timeout"""
+        with MockOpenAIServer(error_rate=0.5, rate_limit_rate=0.3, seed=1) as server:
+            llm = self.make_llm(server.api_base, retries=10)
+            for _ in range(5):
+                self.assertTrue(extract_diffs(asyncio.run(llm.generate(self.prompt()["user"]))))
+        stats = server.stats.summary()
+        self.assertEqual(stats["completed"], 5)
+        self.assertGreater(stats["errors"] + stats["rate_limited"], 0)
+
+        async def stalled():
+            server = MockOpenAIServer(stall_rate=1.0, stall_time=30)
+            llm = self.make_llm(await server.start())
+            llm.timeout = 0.2
+            try:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await llm.generate("hi")
+                await close_async_clients()
+                await asyncio.sleep(0.1)
+            finally:
+                await server.stop()
+            return server
+
+        server = asyncio.run(stalled())
+        self.assertEqual(server.stats.stalled, 1)
+        self.assertEqual(server.stats.disconnects, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
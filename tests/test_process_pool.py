@@ -0,0 +1,288 @@
+"""
+Tests for the process-based evaluation backend in openevolve.process_pool
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from openevolve.config import EvaluatorConfig
+from openevolve.evaluator import Evaluator
+from openevolve.process_pool import ProcessEvaluationPool, shutdown_shared_pools
+
+
+class TestProcessEvaluationPool(unittest.TestCase):
+    """Tests for the warm worker process pool"""
+
+    def setUp(self):
+        """Create a test evaluation file"""
+        self.test_eval_file = tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False)
+        self.test_eval_file.write("""
+import os
+import time
+
+def evaluate(program_path):
+    with open(program_path, 'r') as f:
+        code = f.read()
+
+    if 'SLEEP_LONG' in code:
+        time.sleep(30)
+    elif 'RAISE_ERROR' in code:
+        raise ValueError("Evaluation failed")
+    return {"score": 0.5, "pid": os.getpid()}
+
+def evaluate_stage1(program_path):
+    return {"stage1_score": 0.7, "pid": os.getpid()}
+
+def evaluate_memory_hog(program_path):
+    data = bytearray(512 * 1024 * 1024)
+    return {"score": len(data)}
+
+def evaluate_touch_memory(program_path):
+    data = b"x" * (200 * 1024 * 1024)
+    return {"score": len(data)}
+
+def evaluate_cpu_hog(program_path):
+    while True:
+        pass
+
+def evaluate_spawn_child(program_path):
+    import subprocess
+    child = subprocess.Popen(["sleep", "60"])
+    with open(program_path, 'w') as f:
+        f.write(str(child.pid))
+    time.sleep(60)
+""")
+        self.test_eval_file.close()
+
+        self.program_file = tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False)
+        self.program_file.write("def test(): return 'fast'")
+        self.program_file.close()
+
+        self.pool = None
+
+    def tearDown(self):
+        """Stop workers and clean up test files"""
+        if self.pool:
+            self.pool.shutdown()
+        shutdown_shared_pools()
+        for path in (self.test_eval_file.name, self.program_file.name):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _write_program(self, code):
+        with open(self.program_file.name, "w") as f:
+            f.write(code)
+        return self.program_file.name
+
+    def test_evaluates_in_worker_process(self):
+        """Evaluation functions run outside the controller process"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1)
+
+        result = self.pool.evaluate("evaluate", self.program_file.name, timeout=30)
+        self.assertEqual(result["score"], 0.5)
+        self.assertNotEqual(result["pid"], os.getpid())
+
+        # The same warm worker serves the next request
+        stage1 = self.pool.evaluate("evaluate_stage1", self.program_file.name, timeout=30)
+        self.assertEqual(stage1["pid"], result["pid"])
+
+    def test_exception_is_propagated(self):
+        """Exceptions raised by the evaluation function reach the caller"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1)
+        program_path = self._write_program("# RAISE_ERROR")
+
+        with self.assertRaises(ValueError):
+            self.pool.evaluate("evaluate", program_path, timeout=30)
+
+        # The worker survives ordinary exceptions
+        program_path = self._write_program("def test(): return 'fast'")
+        self.assertEqual(self.pool.evaluate("evaluate", program_path, timeout=30)["score"], 0.5)
+
+    def test_timeout_kills_and_respawns_worker(self):
+        """A worker that exceeds the timeout is killed and replaced"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1)
+        first_pid = self.pool.evaluate("evaluate", self.program_file.name, timeout=30)["pid"]
+
+        program_path = self._write_program("# SLEEP_LONG")
+        start_time = time.time()
+        with self.assertRaises(asyncio.TimeoutError):
+            self.pool.evaluate("evaluate", program_path, timeout=1)
+        self.assertLess(time.time() - start_time, 10)
+
+        program_path = self._write_program("def test(): return 'fast'")
+        result = self.pool.evaluate("evaluate", program_path, timeout=30)
+        self.assertEqual(result["score"], 0.5)
+        self.assertNotEqual(result["pid"], first_pid)
+
+    def test_evaluator_process_backend(self):
+        """Evaluator uses the process pool when configured"""
+        config = EvaluatorConfig()
+        config.backend = "process"
+        config.process_workers = 1
+        config.timeout = 30
+        config.max_retries = 0
+        config.cascade_evaluation = False
+
+        evaluator = Evaluator(config=config, evaluation_file=self.test_eval_file.name)
+        self.pool = evaluator.process_pool
+
+        result = asyncio.run(evaluator.evaluate_program("def test(): return 'fast'", "p1"))
+        self.assertEqual(result["score"], 0.5)
+        self.assertNotEqual(result["pid"], os.getpid())
+
+    def test_usage_reported_as_artifacts(self):
+        """The process backend reports resource usage as artifacts"""
+        config = EvaluatorConfig()
+        config.backend = "process"
+        config.process_workers = 1
+        config.timeout = 30
+        config.max_retries = 0
+        config.cascade_evaluation = False
+        config.cache_evaluations = True
+
+        evaluator = Evaluator(config=config, evaluation_file=self.test_eval_file.name)
+        self.pool = evaluator.process_pool
+
+        asyncio.run(evaluator.evaluate_program("def test(): return 'fast'", "p1"))
+        artifacts = evaluator.get_pending_artifacts("p1")
+        self.assertIn("cpu_time_s", artifacts)
+        if os.path.exists("/proc/self/clear_refs"):
+            self.assertGreater(artifacts["peak_rss_mb"], 0)
+
+        # Usage belongs to one run, so it is not cached with the program's results
+        _, cached_artifacts = evaluator.cache.get("def test(): return 'fast'")
+        self.assertNotIn("cpu_time_s", cached_artifacts)
+
+    @unittest.skipUnless(os.path.exists("/proc/self/clear_refs"), "requires Linux")
+    def test_peak_rss_per_evaluation(self):
+        """The peak memory of an evaluation is not inflated by earlier evaluations"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1)
+
+        _, heavy = self.pool.evaluate_with_usage(
+            "evaluate_touch_memory", self.program_file.name, timeout=30
+        )
+        _, light = self.pool.evaluate_with_usage("evaluate", self.program_file.name, timeout=30)
+        self.assertGreater(heavy["peak_rss_mb"], 200)
+        self.assertLess(light["peak_rss_mb"], heavy["peak_rss_mb"] - 150)
+
+    def test_worker_startup_timeout(self):
+        """A worker that hangs while importing the evaluation module is not waited on forever"""
+        with open(self.test_eval_file.name, "w") as f:
+            f.write("import time\ntime.sleep(60)\n")
+        self.pool = ProcessEvaluationPool(
+            self.test_eval_file.name, num_workers=1, startup_timeout=2
+        )
+
+        start_time = time.time()
+        with self.assertRaises(RuntimeError) as context:
+            self.pool.evaluate("evaluate", self.program_file.name, timeout=30)
+        self.assertIn("did not start", str(context.exception))
+        self.assertLess(time.time() - start_time, 10)
+
+    @unittest.skipUnless(os.path.exists("/proc/self/statm"), "requires Linux")
+    def test_memory_limit(self):
+        """Allocations beyond memory_limit_mb fail inside the worker"""
+        self.pool = ProcessEvaluationPool(
+            self.test_eval_file.name, num_workers=1, memory_limit_mb=64
+        )
+
+        with self.assertRaises(MemoryError):
+            self.pool.evaluate("evaluate_memory_hog", self.program_file.name, timeout=30)
+
+        # The worker stays usable after a failed allocation
+        self.assertEqual(
+            self.pool.evaluate("evaluate", self.program_file.name, timeout=30)["score"], 0.5
+        )
+
+    @unittest.skipUnless(hasattr(os, "setsid"), "requires POSIX")
+    def test_cpu_limit(self):
+        """An evaluation exceeding cpu_limit is stopped before the timeout"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1, cpu_limit=1)
+
+        start_time = time.time()
+        with self.assertRaises(RuntimeError) as context:
+            self.pool.evaluate("evaluate_cpu_hog", self.program_file.name, timeout=30)
+        self.assertIn("CPU time limit", str(context.exception))
+        self.assertLess(time.time() - start_time, 10)
+
+        # A fresh worker takes over
+        self.assertEqual(
+            self.pool.evaluate("evaluate", self.program_file.name, timeout=30)["score"], 0.5
+        )
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "requires POSIX")
+    def test_timeout_kills_process_tree(self):
+        """Processes spawned by a timed-out evaluation are killed as well"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.pool.evaluate("evaluate_spawn_child", self.program_file.name, timeout=2)
+
+        with open(self.program_file.name, "r") as f:
+            child_pid = int(f.read())
+
+        # The child is gone (or at most a zombie about to be reaped by init)
+        deadline = time.time() + 5
+        alive = True
+        while alive and time.time() < deadline:
+            try:
+                with open(f"/proc/{child_pid}/status", "r") as f:
+                    alive = "zombie" not in f.read()
+            except FileNotFoundError:
+                alive = False
+            time.sleep(0.1)
+        self.assertFalse(alive)
+
+    def test_queued_evaluations_use_pool_threads(self):
+        """Evaluations waiting for a worker do not occupy the default executor"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1)
+        release = threading.Event()
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+            blocked = loop.run_in_executor(None, release.wait)
+            try:
+                return await asyncio.wait_for(
+                    asyncio.gather(
+                        *[
+                            self.pool.run("evaluate", self.program_file.name, timeout=30)
+                            for _ in range(3)
+                        ]
+                    ),
+                    timeout=30,
+                )
+            finally:
+                release.set()
+                await blocked
+
+        results = asyncio.run(run())
+        self.assertEqual([result["score"] for result in results], [0.5] * 3)
+
+    def test_wait_for_worker_times_out(self):
+        """Waiting for a free worker is bounded by the evaluation timeout"""
+        self.pool = ProcessEvaluationPool(self.test_eval_file.name, num_workers=1)
+        worker = self.pool._idle_workers.get()
+        try:
+            with self.assertRaises(asyncio.TimeoutError) as context:
+                self.pool.evaluate("evaluate", self.program_file.name, timeout=0.5)
+            self.assertIn("No evaluation worker became free", str(context.exception))
+        finally:
+            self.pool._idle_workers.put(worker)
+
+    def test_unknown_backend_rejected(self):
+        """An unknown backend name raises a clear error"""
+        config = EvaluatorConfig()
+        config.backend = "gpu"
+
+        with self.assertRaises(ValueError):
+            Evaluator(config=config, evaluation_file=self.test_eval_file.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,11 @@
 Tests for PromptSampler in openevolve.prompt.sampler
 """
 
+import random
 import unittest
 from openevolve.config import Config
-from openevolve.prompt.sampler import PromptSampler
+from openevolve.database import Program
+from openevolve.prompt.sampler import ProgramView, PromptSampler
 
 
 class TestPromptSampler(unittest.TestCase):
@@ -48,6 +50,45 @@ class TestPromptSampler(unittest.TestCase):
         self.assertIn("def test(): pass", prompt["user"])
         self.assertIn("score: 0.5", prompt["user"])
 
+    def test_build_prompt_from_programs(self):
+        """Programs passed directly give the same prompt as their dictionaries"""
+        programs = [
+            Program(
+                id=f"p{i}",
+                code="\n".join(f"x{n} = {i}" for n in range(i * 4)),
+                metrics={"score": i / 10, "valid": i % 2 == 0},
+                metadata={"changes": "tweak", "diverse": i == 3},
+            )
+            for i in range(8)
+        ]
+
+        prompts = []
+        for as_dicts in (True, False):
+            random.seed(0)
+            entries = [p.to_dict() for p in programs] if as_dicts else programs
+            prompts.append(
+                self.prompt_sampler.build_prompt(
+                    current_program="def test(): pass",
+                    program_metrics={"score": 0.5},
+                    previous_programs=entries[:3],
+                    top_programs=entries,
+                    inspirations=entries[3:],
+                )
+            )
+        self.assertEqual(prompts[0], prompts[1])
+
+    def test_program_view(self):
+        """Views read the program in place and split its code once"""
+        program = Program(id="p1", code="a = 1\nb = 2\nc = 3", metrics={"score": 0.5})
+        view = ProgramView(program)
+
+        self.assertIs(view["metrics"], program.metrics)
+        self.assertEqual(view.get("changes", "Unknown changes"), "Unknown changes")
+        self.assertEqual(set(view), set(program.to_dict()))
+        self.assertIs(view.lines, view.lines)
+        self.assertEqual(view.snippet(2, "..."), "a = 1\nb = 2\n...")
+        self.assertEqual(view.snippet(3, "..."), program.code)
+
 
 if __name__ == "__main__":
     unittest.main()
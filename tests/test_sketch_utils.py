@@ -0,0 +1,91 @@
+"""
+Tests for MinHash sketches in openevolve.utils.sketch_utils
+"""
+
+import unittest
+
+import numpy as np
+
+from openevolve.utils.sketch_utils import MinHasher, SketchIndex, code_shingles, sketch_distance
+
+
+class TestSketchUtils(unittest.TestCase):
+    """Tests for code sketches and the sketch index"""
+
+    def setUp(self):
+        self.hasher = MinHasher(num_perm=128)
+        self.code = "def add(a, b):\n    total = a + b\n    return total\n"
+
+    def test_shingles_ignore_formatting(self):
+        """Whitespace changes do not change the shingles"""
+        reformatted = "def add(a,b):\n\n    total=a+b\n    return   total"
+        np.testing.assert_array_equal(
+            np.sort(code_shingles(self.code)), np.sort(code_shingles(reformatted))
+        )
+
+    def test_sketch_distance(self):
+        """Identical code has distance 0, unrelated code is far apart"""
+        sketch = self.hasher.sketch(self.code)
+        self.assertEqual(sketch_distance(sketch, self.hasher.sketch(self.code)), 0.0)
+
+        similar = self.hasher.sketch(self.code + "\nprint(add(1, 2))\n")
+        unrelated = self.hasher.sketch("for item in items:\n    yield item ** 2\n")
+        self.assertLess(sketch_distance(sketch, similar), sketch_distance(sketch, unrelated))
+        self.assertGreater(sketch_distance(sketch, unrelated), 0.9)
+
+    def test_sketches_are_deterministic(self):
+        """Sketches with the same seed match across hasher instances"""
+        other = MinHasher(num_perm=128)
+        np.testing.assert_array_equal(self.hasher.sketch(self.code), other.sketch(self.code))
+
+    def test_index_add_remove(self):
+        """Removal keeps the remaining sketches addressable"""
+        index = SketchIndex(self.hasher.num_perm)
+        sketches = {f"p{i}": self.hasher.sketch(f"x = {i} * y + {i}") for i in range(40)}
+        for program_id, sketch in sketches.items():
+            index.add(program_id, sketch)
+
+        for i in range(0, 40, 3):
+            index.remove(f"p{i}")
+        index.remove("missing")
+
+        self.assertEqual(len(index), 40 - len(range(0, 40, 3)))
+        for program_id, sketch in sketches.items():
+            if program_id in index:
+                np.testing.assert_array_equal(index.get(program_id), sketch)
+            else:
+                self.assertIsNone(index.get(program_id))
+
+    def test_nearest_distance(self):
+        """Nearest-neighbour distance excludes the program itself"""
+        index = SketchIndex(self.hasher.num_perm)
+        sketch = self.hasher.sketch(self.code)
+        index.add("self", sketch)
+        self.assertEqual(index.nearest_distance(sketch, k=3, exclude="self"), 0.0)
+
+        index.add("copy", self.hasher.sketch(self.code))
+        index.add("other", self.hasher.sketch("while True:\n    break\n"))
+        self.assertEqual(index.nearest_distance(sketch, k=1, exclude="self"), 0.0)
+        self.assertGreater(index.nearest_distance(sketch, k=2, exclude="self"), 0.4)
+
+    def test_nearest_distance_in_large_index(self):
+        """Beyond max_candidates programs, similar ones are found through their buckets"""
+        index = SketchIndex(self.hasher.num_perm, max_candidates=32)
+        for i in range(300):
+            index.add(f"p{i}", self.hasher.sketch(f"value_{i} = compute_{i}(arg_{i}) + {i}"))
+        sketch = self.hasher.sketch(self.code)
+        index.add("self", sketch)
+        self.assertGreater(index.nearest_distance(sketch, k=1, exclude="self"), 0.9)
+
+        index.add("copy", self.hasher.sketch(self.code))
+        self.assertEqual(index.nearest_distance(sketch, k=1, exclude="self"), 0.0)
+        self.assertGreater(index.nearest_distance(sketch, k=2, exclude="self"), 0.4)
+
+        # Removed programs leave their buckets
+        index.remove("copy")
+        self.assertGreater(index.nearest_distance(sketch, k=1, exclude="self"), 0.9)
+        self.assertEqual(sum(map(len, index._buckets[0].values())), len(index))
+
+
+if __name__ == "__main__":
+    unittest.main()
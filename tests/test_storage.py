@@ -0,0 +1,422 @@
+"""
+Tests for storage backends in openevolve.storage
+"""
+
+import math
+import os
+import shutil
+import tempfile
+import unittest
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.storage import (
+    JsonDirStorage,
+    SQLiteStorage,
+    compact_checkpoint,
+    detect_backend,
+    import_checkpoint,
+    open_storage,
+    read_checkpoint,
+    read_manifest,
+)
+
+
+def make_record(i: int, island: int = 0) -> dict:
+    program = Program(
+        id=f"p{i}",
+        code=f"def f():\n    return {i}\n",
+        generation=i % 3,
+        metrics={"score": i / 10},
+        artifacts_json='{"stderr": "warning"}' if i % 2 else None,
+        metadata={"island": island},
+    )
+    record = program.to_dict()
+    if i == 0:
+        record["prompts"] = {"diff_user": {"system": "s", "user": "u", "responses": ["r"]}}
+    return record
+
+
+class TestStorage(unittest.TestCase):
+    """Tests for JSON-directory and SQLite program storage"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_backends_round_trip(self):
+        """Both backends return the records they were given"""
+        records = [make_record(i, island=i % 2) for i in range(5)]
+        metadata = {"islands": [["p0", "p2", "p4"], ["p1", "p3"]], "best_program_id": "p4"}
+
+        for storage_cls in (JsonDirStorage, SQLiteStorage):
+            path = os.path.join(self.path, storage_cls.backend)
+            with storage_cls(path) as storage:
+                self.assertIsNone(storage.read_metadata())
+                self.assertEqual(storage.write_programs(records), 5)
+                storage.write_metadata(metadata)
+
+            with open_storage(path) as storage:
+                self.assertIsInstance(storage, storage_cls)
+                self.assertEqual(storage.read_metadata(), metadata)
+                self.assertEqual(sorted(storage.program_ids()), [f"p{i}" for i in range(5)])
+                stored = {record["id"]: record for record in storage.iter_programs()}
+                for record in records:
+                    self.assertEqual(stored[record["id"]], record)
+                self.assertEqual(storage.read_program("p0"), records[0])
+                self.assertIsNone(storage.read_program("missing"))
+
+                storage.delete_programs(["p1", "missing"])
+                self.assertIsNone(storage.read_program("p1"))
+
+    def test_parallel_json_read(self):
+        """Reading a large JSON checkpoint on several threads returns every record"""
+        records = [make_record(i) for i in range(600)]
+        records[5]["metrics"]["score"] = float("nan")
+        with JsonDirStorage(self.path) as storage:
+            storage.write_programs(records)
+        with open(os.path.join(self.path, "programs", "broken.json"), "w") as f:
+            f.write("{")
+
+        for workers in (1, 4):
+            with open_storage(self.path, load_workers=workers) as storage:
+                stored = {record["id"]: record for record in storage.iter_programs()}
+            self.assertEqual(len(stored), 600)
+            self.assertEqual(stored["p599"], records[599])
+            self.assertTrue(math.isnan(stored["p5"]["metrics"]["score"]))
+
+    def test_sqlite_query_uses_indexed_columns(self):
+        """Programs can be filtered by island and generation and ranked by score"""
+        with SQLiteStorage(self.path) as storage:
+            storage.write_programs(make_record(i, island=i % 2) for i in range(10))
+
+            island_1 = storage.query_programs(island=1)
+            self.assertEqual([r["id"] for r in island_1], ["p9", "p7", "p5", "p3", "p1"])
+
+            top = storage.query_programs(min_generation=2, limit=2)
+            self.assertEqual([r["id"] for r in top], ["p8", "p5"])
+
+        with open_storage(self.path) as storage:
+            journal_mode = storage._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+
+    def test_import_checkpoint(self):
+        """A JSON checkpoint converts to SQLite and back"""
+        source = os.path.join(self.path, "json")
+        records = [make_record(i) for i in range(4)]
+        with JsonDirStorage(source) as storage:
+            storage.write_programs(records)
+            storage.write_metadata({"last_iteration": 7})
+
+        destination = os.path.join(self.path, "sqlite")
+        self.assertEqual(import_checkpoint(source, destination), 4)
+        self.assertEqual(detect_backend(destination), "sqlite")
+
+        round_trip = os.path.join(self.path, "json_again")
+        self.assertEqual(import_checkpoint(destination, round_trip, backend="json"), 4)
+        with open_storage(round_trip) as storage:
+            self.assertEqual(storage.read_metadata(), {"last_iteration": 7})
+            self.assertEqual(storage.read_program("p3"), records[3])
+
+        with self.assertRaises(ValueError):
+            import_checkpoint(destination, destination, backend="sqlite")
+
+    def test_database_save_and_load_sqlite(self):
+        """ProgramDatabase checkpoints through SQLite and loads without configuration"""
+        config = Config()
+        config.database.storage_backend = "sqlite"
+        db = ProgramDatabase(config.database)
+        for i in range(6):
+            db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 10}))
+        db.log_prompt("p5", "diff_user", {"system": "s", "user": "u"}, ["r"])
+        db.save(self.path, iteration=12)
+
+        self.assertTrue(os.path.exists(os.path.join(self.path, "programs.db")))
+        self.assertFalse(os.path.exists(os.path.join(self.path, "programs")))
+
+        loaded = ProgramDatabase(Config().database)
+        loaded.load(self.path)
+        self.assertEqual(set(loaded.programs), set(db.programs))
+        self.assertEqual(loaded.last_iteration, 12)
+        self.assertEqual(loaded.get_best_program().id, "p5")
+        self.assertEqual(loaded.get("p3").code, "x = 3")
+        self.assertEqual(
+            [set(island) for island in loaded.islands], [set(island) for island in db.islands]
+        )
+        with open_storage(self.path) as storage:
+            self.assertEqual(storage.read_program("p5")["prompts"]["diff_user"]["user"], "u")
+
+
+class TestLazyLoading(unittest.TestCase):
+    """Tests for loading program summaries and fetching code on demand"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lazy_load(self):
+        """Code and artifacts are read on access and only a bounded number is cached"""
+        for backend in ("json", "sqlite"):
+            path = os.path.join(self.tmpdir.name, backend)
+            config = Config()
+            config.database.storage_backend = backend
+            db = ProgramDatabase(config.database)
+            for i in range(10):
+                db.add(
+                    Program(
+                        id=f"p{i}",
+                        code=f"x = {i}\n" * 20,
+                        metrics={"score": i / 10},
+                        artifacts_json='{"log": "ok"}',
+                    )
+                )
+            db.save(path, iteration=3)
+
+            config.database.lazy_load = True
+            config.database.lazy_cache_size = 3
+            lazy = ProgramDatabase(config.database)
+            lazy.load(path)
+
+            self.assertEqual(len(lazy.programs), 10)
+            self.assertFalse(any(p.is_loaded for p in lazy.programs.values()))
+            self.assertEqual(lazy.get_best_program().id, "p9")
+            self.assertEqual(lazy.get("p4").metrics, {"score": 0.4})
+
+            for i in range(10):
+                self.assertEqual(lazy.get(f"p{i}").code, f"x = {i}\n" * 20)
+            self.assertEqual(lazy.get("p2").artifacts_json, '{"log": "ok"}')
+            loader = lazy.get("p0")._loader
+            self.assertEqual(len(loader), 3)
+
+            # Saving reads the content through the loader
+            copy_path = os.path.join(self.tmpdir.name, f"{backend}_copy")
+            lazy.save(copy_path)
+            with open_storage(copy_path) as storage:
+                self.assertEqual(storage.read_program("p7")["code"], "x = 7\n" * 20)
+
+            # Assigning code materializes it on the program
+            program = lazy.get("p1")
+            program.code = "y = 1"
+            self.assertTrue(program.is_loaded)
+            self.assertEqual(program.code, "y = 1")
+
+    def test_lazy_load_with_minhash_diversity(self):
+        """Programs are sketched on the first diversity query, not while loading"""
+        path = os.path.join(self.tmpdir.name, "minhash")
+        config = Config()
+        config.database.diversity_metric = "minhash"
+        config.database.feature_dimensions = ["diversity"]
+        db = ProgramDatabase(config.database)
+        for i in range(10):
+            db.add(Program(id=f"p{i}", code=f"x = {i}\n" * 20, metrics={"score": i / 10}))
+        db.save(path, iteration=3)
+
+        config.database.lazy_load = True
+        lazy = ProgramDatabase(config.database)
+        lazy.load(path)
+        self.assertFalse(any(p.is_loaded for p in lazy.programs.values()))
+        self.assertEqual(len(lazy._sketch_index), 0)
+
+        self.assertEqual(
+            lazy._calculate_feature_coords(lazy.get("p0")),
+            db._calculate_feature_coords(db.get("p0")),
+        )
+        self.assertEqual(len(lazy._sketch_index), 10)
+
+
+class TestIncrementalCheckpoints(unittest.TestCase):
+    """Tests for delta checkpoints written by ProgramDatabase.save"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = Config()
+        self.config.database.incremental_checkpoints = True
+        self.config.database.full_checkpoint_interval = 3
+        self.db = ProgramDatabase(self.config.database)
+        self.next_id = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def add_programs(self, count):
+        for _ in range(count):
+            i = self.next_id
+            self.next_id += 1
+            self.db.add(Program(id=f"p{i}", code=f"x = {i}", metrics={"score": i / 100}))
+
+    def checkpoint(self, iteration):
+        path = os.path.join(self.tmpdir.name, f"checkpoint_{iteration}")
+        self.db.save(path, iteration)
+        return path
+
+    def stored_ids(self, path):
+        with open_storage(path) as storage:
+            return set(storage.program_ids())
+
+    def load(self, path):
+        loaded = ProgramDatabase(Config().database)
+        loaded.load(path)
+        return loaded
+
+    def test_delta_checkpoints(self):
+        """Deltas contain only changes and load to the full population"""
+        self.add_programs(5)
+        full = self.checkpoint(10)
+        self.assertIsNone(read_manifest(full))
+
+        self.add_programs(2)
+        self.db._remove_program("p1")
+        delta = self.checkpoint(20)
+        self.assertEqual(self.stored_ids(delta), {"p5", "p6"})
+        self.assertEqual(read_manifest(delta)["removed"], ["p1"])
+        self.assertEqual(read_manifest(delta)["segments"], ["../checkpoint_10"])
+
+        # Nothing changed: the delta is empty
+        empty = self.checkpoint(30)
+        self.assertEqual(self.stored_ids(empty), set())
+
+        loaded = self.load(empty)
+        self.assertEqual(set(loaded.programs), set(self.db.programs))
+        self.assertEqual(loaded.last_iteration, 30)
+        self.assertNotIn("p1", loaded.programs)
+
+        # The chain is full (3 segments), so the next checkpoint is a full one
+        self.add_programs(1)
+        next_full = self.checkpoint(40)
+        self.assertIsNone(read_manifest(next_full))
+        self.assertEqual(self.stored_ids(next_full), set(self.db.programs))
+
+    def test_resume_continues_chain(self):
+        """Checkpoints after loading a delta build on the loaded chain"""
+        self.add_programs(3)
+        self.checkpoint(10)
+        self.add_programs(1)
+        delta = self.checkpoint(20)
+
+        resumed = ProgramDatabase(self.config.database)
+        resumed.load(delta)
+        resumed.add(Program(id="new", code="y = 1", metrics={"score": 0.5}))
+        path = os.path.join(self.tmpdir.name, "checkpoint_30")
+        resumed.save(path, 30)
+
+        self.assertEqual(self.stored_ids(path), {"new"})
+        self.assertEqual(set(self.load(path).programs), set(resumed.programs))
+
+    def test_compact_checkpoint(self):
+        """Compaction makes a delta checkpoint standalone"""
+        self.add_programs(4)
+        full = self.checkpoint(10)
+        self.db._remove_program("p0")
+        self.add_programs(2)
+        delta = self.checkpoint(20)
+        expected = set(self.db.programs)
+
+        self.assertEqual(compact_checkpoint(delta), len(expected))
+        self.assertIsNone(read_manifest(delta))
+        self.assertEqual(self.stored_ids(delta), expected)
+
+        # No longer depends on the earlier checkpoint
+        shutil.rmtree(full)
+        self.assertEqual(set(self.load(delta).programs), expected)
+
+    def test_compact_middle_checkpoint(self):
+        """Programs removed by a compacted segment stay removed in later deltas"""
+        self.add_programs(2)
+        self.checkpoint(10)
+        self.db._remove_program("p0")
+        self.add_programs(1)
+        middle = self.checkpoint(20)
+        self.add_programs(1)
+        newest = self.checkpoint(30)
+        expected = set(self.db.programs)
+        self.assertNotIn("p0", expected)
+
+        compact_checkpoint(middle)
+        self.assertEqual(set(self.load(newest).programs), expected)
+        programs, _ = read_checkpoint(newest)
+        self.assertEqual(set(programs), expected)
+
+
+class TestCodeDeltaCompression(unittest.TestCase):
+    """Tests for ProgramDatabase with code_delta_compression"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = Config()
+        self.config.database.code_delta_compression = True
+        self.config.database.code_keyframe_interval = 3
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_code(self, i):
+        return "".join(f"y_{n} = {i if n == i else 0}\n" for n in range(30))
+
+    def populate(self, db, start, count):
+        for i in range(start, start + count):
+            parent_id = f"p{i - 1}" if i > 0 else None
+            db.add(
+                Program(
+                    id=f"p{i}",
+                    code=self.make_code(i),
+                    parent_id=parent_id,
+                    generation=i,
+                    metrics={"score": i / 100},
+                )
+            )
+
+    def test_compressed_round_trip(self):
+        """Code is stored as parent deltas and restored on load by both backends"""
+        for backend in ("json", "sqlite"):
+            path = os.path.join(self.tmpdir.name, backend)
+            self.config.database.storage_backend = backend
+            db = ProgramDatabase(self.config.database)
+            self.populate(db, 0, 8)
+
+            self.assertFalse(any(p.is_loaded for p in db.programs.values()))
+            self.assertEqual(db.get("p5").code, self.make_code(5))
+            db.save(path, iteration=8)
+
+            with open_storage(path) as storage:
+                record = storage.read_program("p4")
+            self.assertEqual(record["code"], "")
+            self.assertEqual(record["code_delta"]["base"], "p3")
+
+            for config in (Config().database, self.config.database):
+                loaded = ProgramDatabase(config)
+                loaded.load(path)
+                for i in range(8):
+                    self.assertEqual(loaded.get(f"p{i}").code, self.make_code(i))
+
+    def test_removed_base_in_delta_checkpoint(self):
+        """Delta checkpoints decode children of programs removed since the base"""
+        self.config.database.incremental_checkpoints = True
+        db = ProgramDatabase(self.config.database)
+        self.populate(db, 0, 3)
+        db.save(os.path.join(self.tmpdir.name, "checkpoint_1"), iteration=1)
+
+        self.populate(db, 3, 2)
+        removed = db.get("p2")
+        db._remove_program("p2")
+        self.assertEqual(removed.code, self.make_code(2))
+        path = os.path.join(self.tmpdir.name, "checkpoint_2")
+        db.save(path, iteration=2)
+
+        loaded = ProgramDatabase(Config().database)
+        loaded.load(path)
+        self.assertNotIn("p2", loaded.programs)
+        for i in (0, 1, 3, 4):
+            self.assertEqual(loaded.get(f"p{i}").code, self.make_code(i))
+
+        self.assertEqual(compact_checkpoint(path), 4)
+        with open_storage(path) as storage:
+            self.assertEqual(storage.read_program("p3")["code"], self.make_code(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
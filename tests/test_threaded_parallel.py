@@ -0,0 +1,172 @@
+"""
+Tests for ImprovedParallelController in openevolve.threaded_parallel
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from openevolve.config import Config
+from openevolve.database import Program, ProgramDatabase
+from openevolve.iteration import Candidate, Result, evaluate_with_slot
+from openevolve.threaded_parallel import ImprovedParallelController
+
+
+class FakeEvaluationPool:
+    """Thread pool returning synthetic iteration results after a delay"""
+
+    def __init__(self, delays, num_workers):
+        self.delays = delays
+        self.executor = ThreadPoolExecutor(max_workers=num_workers)
+
+    def submit_evaluation(self, iteration):
+        return self.executor.submit(self._run, iteration)
+
+    def _run(self, iteration):
+        time.sleep(self.delays.get(iteration, 0.0))
+        child = Program(
+            id=f"child_{iteration}",
+            code=f"x = {iteration}",
+            metrics={"score": iteration / 100.0},
+        )
+        return [Result(child_program=child, iteration_time=0.0, artifacts=None)]
+
+    def stop(self):
+        self.executor.shutdown(wait=True)
+
+
+class TestImprovedParallelController(unittest.TestCase):
+    """Tests for result handling in the parallel controller"""
+
+    def setUp(self):
+        self.config = Config()
+        self.config.database.in_memory = True
+        self.config.database.num_islands = 1
+        self.config.evaluator.parallel_evaluations = 4
+        self.config.checkpoint_interval = 1000
+        self.database = ProgramDatabase(self.config.database)
+
+        self.controller = ImprovedParallelController(self.config, "unused.py", self.database)
+        self.added = []
+        original_add = self.database.add
+
+        def recording_add(program, iteration=None, **kwargs):
+            self.added.append(iteration)
+            return original_add(program, iteration=iteration, **kwargs)
+
+        self.database.add = recording_add
+
+    def tearDown(self):
+        if self.controller.thread_pool:
+            self.controller.thread_pool.stop()
+
+    def test_results_processed_in_completion_order(self):
+        """Fast iterations are not held back by slower earlier ones"""
+        self.controller.thread_pool = FakeEvaluationPool({1: 0.3, 2: 0.2, 3: 0.1}, 8)
+
+        asyncio.run(self.controller.run_evolution(1, 4))
+
+        self.assertEqual(self.added, [4, 3, 2, 1])
+
+    def test_all_iterations_processed(self):
+        """Every submitted iteration is added exactly once"""
+        self.controller.thread_pool = FakeEvaluationPool({}, 4)
+
+        asyncio.run(self.controller.run_evolution(1, 50))
+
+        self.assertEqual(sorted(self.added), list(range(1, 51)))
+
+    def test_target_score_stops_evolution(self):
+        """Reaching the target score stops processing further results"""
+        self.controller.thread_pool = FakeEvaluationPool({}, 1)
+
+        asyncio.run(self.controller.run_evolution(1, 50, target_score=0.05))
+
+        self.assertEqual(self.added[-1], 5)
+
+    def test_shutdown_wakes_waiting_loop(self):
+        """request_shutdown interrupts a loop waiting for slow iterations"""
+        self.controller.thread_pool = FakeEvaluationPool({1: 2.0, 2: 2.0}, 2)
+
+        async def run():
+            asyncio.get_running_loop().call_later(0.1, self.controller.request_shutdown)
+            await self.controller.run_evolution(1, 2)
+
+        start_time = time.time()
+        asyncio.run(run())
+        self.assertLess(time.time() - start_time, 1.5)
+        self.assertEqual(self.added, [])
+
+
+class CountingEvaluator:
+    """Evaluator recording how many evaluations run at once"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    async def evaluate_program(self, code, program_id):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        # Evaluations run on the loop's executor, as with the thread backend
+        await asyncio.get_running_loop().run_in_executor(None, time.sleep, 0.05)
+        with self.lock:
+            self.running -= 1
+        return {"score": 0.5}
+
+    def get_pending_artifacts(self, program_id):
+        return None
+
+
+class TestEvaluationSlots(unittest.TestCase):
+    """Tests for bounding the children evaluated at once across worker threads"""
+
+    def test_children_share_evaluation_slots(self):
+        """Children of several prompts never exceed the shared slots"""
+        config = Config()
+        evaluator = CountingEvaluator()
+        slots = threading.BoundedSemaphore(2)
+        parent = Program(id="parent", code="x = 0")
+
+        async def evaluate_children(iteration):
+            candidates = [
+                Candidate(iteration, parent, f"x = {i}", "", None, "", time.time())
+                for i in range(3)
+            ]
+            return await asyncio.gather(
+                *[evaluate_with_slot(c, config, evaluator, slots) for c in candidates]
+            )
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda i: asyncio.run(evaluate_children(i)), range(3)))
+
+        self.assertEqual(sum(len(children) for children in results), 9)
+        self.assertEqual(evaluator.max_running, 2)
+
+    def test_waiting_children_leave_executor_free(self):
+        """Children waiting for a slot do not take the threads evaluations run on"""
+        config = Config()
+        evaluator = CountingEvaluator()
+        slots = threading.BoundedSemaphore(2)
+        parent = Program(id="parent", code="x = 0")
+        candidates = [Candidate(0, parent, f"x = {i}", "", None, "", time.time()) for i in range(8)]
+
+        async def evaluate_children():
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=4))
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    *[evaluate_with_slot(c, config, evaluator, slots) for c in candidates]
+                ),
+                timeout=10,
+            )
+
+        self.assertEqual(len(asyncio.run(evaluate_children())), 8)
+        self.assertEqual(evaluator.max_running, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()